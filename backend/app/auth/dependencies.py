@@ -4,7 +4,7 @@ Authentication dependencies for FastAPI route protection and role-based access c
 from typing import Dict, Any
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from .jwt_handler import decode_access_token, JWTError
+from .jwt_handler import decode_access_token_cached, JWTError
 
 
 # HTTP Bearer token security scheme
@@ -15,6 +15,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     """
     Extract and validate current user from JWT token.
     
+    Verified payloads are cached per token, so repeated requests with the
+    same token skip signature verification.
+    
     Args:
         credentials: HTTP Bearer token credentials
         
@@ -26,7 +29,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     """
     try:
         token = credentials.credentials
-        payload = decode_access_token(token)
+        payload = decode_access_token_cached(token)
         return payload
     except JWTError as e:
         raise HTTPException(
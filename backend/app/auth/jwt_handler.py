@@ -1,8 +1,11 @@
 """
 JWT token creation, validation, and decoding utilities.
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import hashlib
+import time
 import jwt
 from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
 from ..config import settings
@@ -91,6 +94,121 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         raise JWTError(f"Token decode error: {str(e)}")
 
 
+class TokenCache:
+    """
+    Bounded LRU cache of verified access token payloads.
+    
+    Entries are keyed by a SHA-256 digest of the token so raw tokens are never
+    kept in memory, and expire after the configured TTL or at the token's own
+    ``exp`` claim, whichever comes first.
+    """
+    
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+    
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached payload for a token if present and not expired.
+        
+        Args:
+            token: JWT token to look up
+            
+        Returns:
+            Cached payload or None on a miss
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            payload, expires_at = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            del self._entries[key]
+        self.misses += 1
+        return None
+    
+    def put(self, token: str, payload: Dict[str, Any]):
+        """
+        Cache a verified payload, evicting the least recently used entry when full.
+        
+        Args:
+            token: JWT token that was verified
+            payload: Verified token payload
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = payload.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        
+        key = self._key(token)
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached entries."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache size and hit/miss counters.
+        
+        Returns:
+            Dict with size, capacity, hits, misses and hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global verified-token cache instance
+token_cache = TokenCache(
+    max_size=settings.token_cache_max_size,
+    ttl_seconds=settings.token_cache_ttl_seconds
+)
+
+
+def decode_access_token_cached(token: str) -> Dict[str, Any]:
+    """
+    Decode an access token, reusing a previous verification when possible.
+    
+    Repeated requests with the same bearer token skip signature verification
+    until the cache entry expires.
+    
+    Args:
+        token: JWT token to decode
+        
+    Returns:
+        Dictionary containing token payload
+        
+    Raises:
+        JWTError: If token is invalid, expired, or malformed
+    """
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_access_token(token)
+        token_cache.put(token, payload)
+    return payload
+
+
 def validate_token(token: str) -> bool:
     """
     Validate if a JWT token is valid without decoding.
@@ -1,9 +1,21 @@
 """
 Password hashing and validation utilities using bcrypt.
+
+bcrypt is deliberately slow, so request handlers must use the async variants
+(``hash_password_async`` / ``verify_password_async``), which run the work on a
+bounded worker pool instead of the event loop thread.
 """
+import asyncio
+import logging
+import os
 import re
-from typing import Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
 import bcrypt
+from ..config import settings
+
+logger = logging.getLogger(__name__)
 
 
 def hash_password(password: str) -> str:
@@ -39,6 +51,137 @@ def verify_password(password: str, hashed_password: str) -> bool:
         return False
 
 
+class PasswordHashingPool:
+    """
+    Bounded worker pool for bcrypt hashing and verification.
+    
+    At most ``max_concurrency`` operations run at once; further callers wait
+    on a semaphore without blocking the event loop. Queue depth and throughput
+    counters are kept for monitoring.
+    """
+    
+    def __init__(self, max_workers: int, max_concurrency: int, use_processes: bool = False):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._active = 0
+        self._completed = 0
+        self._peak_waiting = 0
+    
+    @property
+    def executor(self) -> Executor:
+        """Get the underlying executor, creating it on first use."""
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hashing"
+                )
+            logger.info(
+                f"Password hashing pool started "
+                f"({'process' if self.use_processes else 'thread'}, "
+                f"workers={self.max_workers}, max_concurrency={self.max_concurrency})"
+            )
+        return self._executor
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking function on the pool, waiting for a free slot first.
+        
+        Args:
+            func: Picklable function to execute
+            *args: Arguments for the function
+            
+        Returns:
+            The function's return value
+        """
+        self._waiting += 1
+        self._peak_waiting = max(self._peak_waiting, self._waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        
+        self._active += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args))
+        finally:
+            self._active -= 1
+            self._completed += 1
+            self._semaphore.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and throughput counters.
+        
+        Returns:
+            Dict with worker configuration, waiting/active counts and totals
+        """
+        return {
+            "executor": "process" if self.use_processes else "thread",
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self._waiting,
+            "peak_queue_depth": self._peak_waiting,
+            "active": self._active,
+            "completed": self._completed
+        }
+    
+    def shutdown(self):
+        """Shut down the executor, waiting for running operations to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _create_password_pool() -> PasswordHashingPool:
+    """Create the password hashing pool from application settings."""
+    max_workers = settings.password_hash_workers or os.cpu_count() or 1
+    max_concurrency = settings.password_hash_max_concurrency or max_workers
+    return PasswordHashingPool(
+        max_workers=max_workers,
+        max_concurrency=max_concurrency,
+        use_processes=settings.password_hash_executor == "process"
+    )
+
+
+# Global password hashing pool instance
+password_pool = _create_password_pool()
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the password hashing pool.
+    
+    Args:
+        password: Plain text password to hash
+        
+    Returns:
+        Hashed password as string
+    """
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash on the password hashing pool.
+    
+    Args:
+        password: Plain text password to verify
+        hashed_password: Stored hashed password
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await password_pool.run(verify_password, password, hashed_password)
+
+
 def validate_password_complexity(password: str) -> tuple[bool, Optional[str]]:
     """
     Validate password meets complexity requirements.
@@ -0,0 +1,120 @@
+"""
+In-process response caching for hot read endpoints.
+
+Caches hold pre-serialized response bodies so a hit is served without a
+database round trip or any model validation/serialization. Writers call
+``invalidate()`` after a successful change; each process has its own cache,
+so the TTL bounds how stale a read can be after a write handled by another
+worker process.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+import time
+
+from .config import settings
+
+
+class CachedResponse(NamedTuple):
+    """A pre-serialized response body with its extra headers."""
+    body: bytes
+    headers: Dict[str, str]
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized responses with a TTL.
+
+    A generation counter guards against caching stale data: readers capture
+    the generation before querying the database and ``put`` ignores results
+    fetched before the most recent invalidation.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is enabled by configuration."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @property
+    def generation(self) -> int:
+        """Current invalidation generation."""
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Get a cached response if present and not expired.
+
+        Args:
+            key: Cache key describing the request
+
+        Returns:
+            CachedResponse or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, body: bytes, headers: Dict[str, str], generation: int):
+        """
+        Store a serialized response.
+
+        Args:
+            key: Cache key describing the request
+            body: Serialized response body
+            headers: Extra response headers to replay on a hit
+            generation: Generation captured before the data was read
+        """
+        if not self.enabled or generation != self._generation:
+            return
+        self._entries[key] = CachedResponse(body, headers, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop every cached response after a write."""
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache size and hit/miss counters.
+
+        Returns:
+            Dict with size, capacity, TTL and counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global cache for inventory_items reads
+inventory_cache = ResponseCache(
+    name="inventory",
+    max_entries=settings.inventory_cache_max_entries,
+    ttl_seconds=settings.inventory_cache_ttl_seconds
+)
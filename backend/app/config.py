@@ -4,23 +4,97 @@ Handles environment variables and application settings.
 """
 
 import os
-from typing import List
-from pydantic import field_validator
+from typing import List, Optional
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
-    # Supabase Configuration
-    supabase_url: str
-    supabase_service_key: str
+    # Data backend: "supabase" (default), "postgres", "memory" or "sqlite"
+    # The local backends need no network and are meant for load tests and CI
+    data_backend: str = "supabase"
+    sqlite_path: str = "inventory.db"
+    
+    # Direct Postgres connection (required when data_backend is "postgres")
+    database_url: Optional[str] = None
+    db_pool_min_connections: int = 1
+    # Set to 0 behind a transaction-mode pooler such as PgBouncer
+    db_statement_cache_size: int = 100
+    
+    # Supabase Configuration (required when data_backend is "supabase")
+    supabase_url: Optional[str] = None
+    supabase_service_key: Optional[str] = None
+    
+    # Database connection pool configuration (PostgREST HTTP pool or asyncpg pool)
+    db_pool_max_connections: int = 20
+    db_pool_max_keepalive: int = 10
+    db_pool_keepalive_expiry: float = 30.0
+    db_request_timeout: float = 10.0
+    
+    # Inventory listing configuration
+    inventory_page_size_default: int = 100
+    inventory_page_size_max: int = 1000
+    inventory_stream_batch_size: int = 500
+    inventory_search_limit_default: int = 20
+    inventory_search_limit_max: int = 100
+    
+    # Order listing configuration
+    order_page_size_default: int = 100
+    order_page_size_max: int = 500
+    
+    # Bulk order import: orders validated and written per batch
+    order_import_batch_size: int = 500
+    
+    # Bulk order status updates: maximum order IDs per request
+    order_bulk_status_max_ids: int = 1000
+    
+    # Picking list: maximum order IDs per request
+    order_picking_list_max_ids: int = 1000
+    
+    # Asynchronous order intake (POST /orders/intake); 0 workers disables it
+    order_intake_workers: int = 0
+    order_intake_batch_size: int = 200
+    order_intake_poll_interval_seconds: float = 1.0
+    order_intake_claim_timeout_seconds: int = 300
+    order_intake_max_attempts: int = 5
+    order_intake_retention_seconds: int = 86400
+    
+    # Bulk inventory import: items upserted per batch
+    inventory_import_batch_size: int = 1000
+    
+    # Batch stock adjustments: maximum items per request
+    inventory_adjust_max_items: int = 1000
+    
+    # Stock ledger reconciliation (an interval of 0 disables periodic runs)
+    inventory_reconcile_interval_seconds: float = 0
+    inventory_reconcile_batch_size: int = 500
+    inventory_reconcile_apply: bool = False
+    
+    # Inventory snapshot cache configuration (TTL of 0 disables the cache)
+    inventory_cache_ttl_seconds: float = 5.0
+    inventory_cache_max_entries: int = 256
+    
+    # Idempotency-Key handling for POST /orders
+    idempotency_ttl_seconds: int = 86400
+    idempotency_cache_max_entries: int = 10000
     
     # JWT Configuration
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
     
+    # Verified token cache configuration
+    token_cache_max_size: int = 10000
+    token_cache_ttl_seconds: int = 300
+    
+    # Password hashing pool configuration
+    # Workers and concurrency default to the number of CPU cores when unset
+    password_hash_executor: str = "thread"
+    password_hash_workers: Optional[int] = None
+    password_hash_max_concurrency: Optional[int] = None
+    
     # CORS Configuration
     cors_origins_str: str = "http://localhost:5173"
     
@@ -28,17 +102,28 @@ class Settings(BaseSettings):
     app_name: str = "Inventory Management API"
     debug: bool = False
     
+    # Metrics Configuration
+    metrics_enabled: bool = True
+    
     @property
     def cors_origins(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins_str.split(',')]
     
+    @field_validator('data_backend')
+    @classmethod
+    def validate_data_backend(cls, v):
+        """Validate data backend name."""
+        if v not in ("supabase", "postgres", "memory", "sqlite"):
+            raise ValueError('DATA_BACKEND must be one of "supabase", "postgres", "memory" or "sqlite"')
+        return v
+    
     @field_validator('supabase_url')
     @classmethod
     def validate_supabase_url(cls, v):
         """Validate Supabase URL format."""
         if not v:
-            raise ValueError('SUPABASE_URL is required')
+            return v
         # Allow test URLs for development
         if not (v.startswith('https://') or v.startswith('http://test')):
             raise ValueError('SUPABASE_URL must be a valid HTTPS URL')
@@ -47,9 +132,9 @@ class Settings(BaseSettings):
     @field_validator('supabase_service_key')
     @classmethod
     def validate_supabase_key(cls, v):
-        """Validate Supabase service key is provided."""
+        """Validate Supabase service key length."""
         if not v:
-            raise ValueError('SUPABASE_SERVICE_KEY is required')
+            return v
         # Allow test keys for development
         if len(v) < 10:
             raise ValueError('SUPABASE_SERVICE_KEY must be at least 10 characters')
@@ -66,6 +151,26 @@ class Settings(BaseSettings):
             raise ValueError('JWT_SECRET_KEY must be at least 10 characters')
         return v
     
+    @field_validator('password_hash_executor')
+    @classmethod
+    def validate_password_hash_executor(cls, v):
+        """Validate password hashing executor type."""
+        if v not in ("thread", "process"):
+            raise ValueError('PASSWORD_HASH_EXECUTOR must be either "thread" or "process"')
+        return v
+    
+    @model_validator(mode='after')
+    def validate_backend_settings(self):
+        """Require the connection settings of the selected data backend."""
+        if self.data_backend == "supabase":
+            if not self.supabase_url:
+                raise ValueError('SUPABASE_URL is required')
+            if not self.supabase_service_key:
+                raise ValueError('SUPABASE_SERVICE_KEY is required')
+        if self.data_backend == "postgres" and not self.database_url:
+            raise ValueError('DATABASE_URL is required for the postgres data backend')
+        return self
+    
     class Config:
         env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
         case_sensitive = False
@@ -1,11 +1,19 @@
 """
 Database connection and utilities for Supabase PostgreSQL.
 Handles Supabase client initialization and connection management.
+
+Request handlers use the async PostgREST client exposed through
+``DatabaseManager.table`` and ``DatabaseManager.rpc`` so that database round
+trips never block the event loop. The synchronous Supabase client remains
+available for scripts such as migrations and seeding.
 """
 
 # FIX: Changed import path to avoid conflicting internal imports from the 'realtime' package.
 from supabase.client import create_client, Client 
+from postgrest import AsyncPostgrestClient, AsyncRequestBuilder, AsyncRPCFilterRequestBuilder
+import httpx
 from .config import settings
+from .metrics import InstrumentedTransport
 import logging
 from typing import Optional, Dict, Any
 import asyncio
@@ -24,6 +32,8 @@ class DatabaseManager:
     
     def __init__(self):
         self._client: Optional[Client] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._rest_client: Optional[AsyncPostgrestClient] = None
         self._connection_healthy: bool = False
         self._last_health_check: Optional[datetime] = None
         self._initialize_client()
@@ -63,6 +73,90 @@ class DatabaseManager:
             raise DatabaseConnectionError("Database client is not available")
         return self._client
     
+    @property
+    def rest(self) -> AsyncPostgrestClient:
+        """
+        Get the async PostgREST client backed by the shared connection pool.
+        
+        The client is created lazily so the pool is only opened by processes
+        that actually serve requests.
+        
+        Returns:
+            AsyncPostgrestClient: Async client for table and RPC operations
+        """
+        if self._rest_client is None:
+            self._rest_client = self._create_rest_client()
+        return self._rest_client
+    
+    def _create_rest_client(self) -> AsyncPostgrestClient:
+        """
+        Create the async PostgREST client with a pooled keep-alive HTTP client.
+        
+        Returns:
+            AsyncPostgrestClient: Configured async PostgREST client
+        """
+        limits = httpx.Limits(
+            max_connections=settings.db_pool_max_connections,
+            max_keepalive_connections=settings.db_pool_max_keepalive,
+            keepalive_expiry=settings.db_pool_keepalive_expiry
+        )
+        # The instrumented transport records per-call timings for /metrics
+        transport = InstrumentedTransport(limits=limits) if settings.metrics_enabled else httpx.AsyncHTTPTransport(limits=limits)
+        self._http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(settings.db_request_timeout),
+            follow_redirects=True
+        )
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "apikey": settings.supabase_service_key,
+            "Authorization": f"Bearer {settings.supabase_service_key}"
+        }
+        logger.info(
+            f"Async PostgREST client initialized "
+            f"(max_connections={settings.db_pool_max_connections}, "
+            f"max_keepalive={settings.db_pool_max_keepalive})"
+        )
+        return AsyncPostgrestClient(
+            f"{settings.supabase_url.rstrip('/')}/rest/v1",
+            headers=headers,
+            http_client=self._http_client
+        )
+    
+    def table(self, table_name: str) -> AsyncRequestBuilder:
+        """
+        Start an async query against a table.
+        
+        Args:
+            table_name (str): Name of the table
+            
+        Returns:
+            AsyncRequestBuilder: Query builder whose ``execute()`` must be awaited
+        """
+        return self.rest.from_(table_name)
+    
+    def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> AsyncRPCFilterRequestBuilder:
+        """
+        Start an async call to a Postgres function exposed by PostgREST.
+        
+        Args:
+            function_name (str): Name of the database function
+            params (dict): Function arguments
+            
+        Returns:
+            AsyncRPCFilterRequestBuilder: Call builder whose ``execute()`` must be awaited
+        """
+        return self.rest.rpc(function_name, params or {})
+    
+    async def close(self):
+        """Close the pooled HTTP connections used by the async client."""
+        if self._rest_client is not None:
+            await self._rest_client.aclose()
+            self._rest_client = None
+            self._http_client = None
+            logger.info("Async PostgREST client closed")
+    
     def _perform_sync_health_check(self) -> bool:
         """
         Perform synchronous health check for initialization.
@@ -98,9 +192,8 @@ class DatabaseManager:
                 health_status["error"] = "Database client not initialized"
                 return health_status
                 
-            # Test basic connection
-            # FIX: Added params={} to satisfy new library requirements
-            result = self._client.rpc('version', params={}).execute()
+            # Test basic connection through the async pool
+            result = await self.rpc('version').execute()
             
             if result:
                 health_status["healthy"] = True
@@ -189,8 +282,8 @@ class DatabaseManager:
             raise DatabaseConnectionError(f"Reconnection failed: {e}")
 
 
-# Global database manager instance
-db_manager = DatabaseManager()
+# Global database manager instance, only connected when Supabase is the data backend
+db_manager: Optional[DatabaseManager] = DatabaseManager() if settings.data_backend == "supabase" else None
 
 
 def get_database() -> DatabaseManager:
@@ -199,5 +292,12 @@ def get_database() -> DatabaseManager:
     
     Returns:
         DatabaseManager: The global database manager instance
+        
+    Raises:
+        DatabaseConnectionError: If Supabase is not the configured data backend
     """
+    if db_manager is None:
+        raise DatabaseConnectionError(
+            f"Supabase is not configured (DATA_BACKEND={settings.data_backend})"
+        )
     return db_manager
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Idempotency key handling for retried write requests.
+
+Completed responses are stored in the data store's idempotency_keys table
+with a TTL and fronted by a bounded in-process LRU, so a replay is served
+without a database round trip. Duplicates that arrive while the original
+request is still running wait for it in-process; a duplicate handled by
+another worker process sees the pending claim in the table and is rejected
+as in progress instead of racing the original.
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import time
+
+from .config import settings
+from .repositories import DataStore
+from .utils.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyReuseError
+
+# Minimum seconds between sweeps of expired keys from the table
+PURGE_INTERVAL_SECONDS = 300.0
+
+
+def request_fingerprint(payload: Any) -> str:
+    """
+    Hash a request payload so a reused key with a different body can be detected.
+
+    Args:
+        payload: JSON-serializable request body
+
+    Returns:
+        str: Hex SHA-256 of the canonical JSON encoding
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _seconds_until(expires_at: str) -> float:
+    """Seconds left before a stored ``expires_at`` timestamp, never negative."""
+    expires = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
+    if expires.tzinfo is None:
+        expires = expires.replace(tzinfo=timezone.utc)
+    return max(0.0, (expires - datetime.now(timezone.utc)).total_seconds())
+
+
+class StoredResponse(NamedTuple):
+    """A completed response remembered in the LRU front."""
+    request_hash: str
+    body: bytes
+    expires_at: float
+
+
+class IdempotencyManager:
+    """
+    Coordinates idempotency keys between the LRU front and the data store.
+
+    Usage::
+
+        replay = await manager.begin(store, scope, key, request_hash)
+        if replay is not None:
+            return replay
+        try:
+            body = ...                      # perform the request
+            await manager.complete(store, scope, key, request_hash, body)
+        except Exception:
+            await manager.abandon(store, scope, key)
+            raise
+        finally:
+            manager.finish(scope, key)
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: int):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._completed: "OrderedDict[Tuple[str, str], StoredResponse]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], asyncio.Event] = {}
+        # Monotonic deadline of each key claimed by this process, taken before
+        # the claim so it never outlives the expires_at the table recorded
+        self._claimed_until: Dict[Tuple[str, str], float] = {}
+        self._last_purge = 0.0
+        self.replays = 0
+        self.waits = 0
+
+    def _lookup(self, cache_key: Tuple[str, str]) -> Optional[StoredResponse]:
+        entry = self._completed.get(cache_key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.expires_at:
+            del self._completed[cache_key]
+            return None
+        self._completed.move_to_end(cache_key)
+        return entry
+
+    def _remember(self, cache_key: Tuple[str, str], request_hash: str, body: bytes, ttl_seconds: float):
+        # ttl_seconds is what is left of the key's lifetime in the table, so a
+        # replay is never served in-process after other processes treat the
+        # key as new
+        if self.max_entries <= 0 or ttl_seconds <= 0:
+            return
+        self._completed[cache_key] = StoredResponse(request_hash, body, time.monotonic() + ttl_seconds)
+        self._completed.move_to_end(cache_key)
+        while len(self._completed) > self.max_entries:
+            self._completed.popitem(last=False)
+
+    def _replay(self, entry: StoredResponse, request_hash: str) -> bytes:
+        if entry.request_hash != request_hash:
+            raise IdempotencyKeyReuseError("Idempotency-Key was already used with a different request payload")
+        self.replays += 1
+        return entry.body
+
+    async def _purge_if_due(self, store: DataStore):
+        now = time.monotonic()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        await store.idempotency.purge_expired()
+
+    async def begin(self, store: DataStore, scope: str, key: str, request_hash: str) -> Optional[bytes]:
+        """
+        Claim a key before performing a request.
+
+        Args:
+            store: Data store holding the idempotency_keys table
+            scope: Key owner, typically the authenticated user ID
+            key: Client-supplied Idempotency-Key
+            request_hash: Fingerprint of the request payload
+
+        Returns:
+            The stored response body to replay, or None if the caller owns the
+            key and must perform the request, then call ``complete`` or
+            ``abandon`` followed by ``finish``
+
+        Raises:
+            IdempotencyKeyReuseError: If the key was used with a different payload
+            IdempotencyKeyInProgressError: If another process is still handling the key
+        """
+        cache_key = (scope, key)
+        while True:
+            entry = self._lookup(cache_key)
+            if entry is not None:
+                return self._replay(entry, request_hash)
+            pending = self._in_flight.get(cache_key)
+            if pending is None:
+                break
+            # Same key already running in this process; wait for its outcome
+            self.waits += 1
+            await pending.wait()
+
+        self._in_flight[cache_key] = asyncio.Event()
+        try:
+            await self._purge_if_due(store)
+            claimed_until = time.monotonic() + self.ttl_seconds
+            existing = await store.idempotency.claim(scope, key, request_hash, self.ttl_seconds)
+        except Exception:
+            self.finish(scope, key)
+            raise
+        if existing is None:
+            self._claimed_until[cache_key] = claimed_until
+            return None
+
+        self.finish(scope, key)
+        if existing["response"] is None:
+            if existing["request_hash"] != request_hash:
+                raise IdempotencyKeyReuseError("Idempotency-Key was already used with a different request payload")
+            raise IdempotencyKeyInProgressError("A request with this Idempotency-Key is still being processed")
+
+        entry = StoredResponse(existing["request_hash"], existing["response"].encode("utf-8"), 0.0)
+        self._remember(cache_key, entry.request_hash, entry.body, _seconds_until(existing["expires_at"]))
+        return self._replay(entry, request_hash)
+
+    async def complete(self, store: DataStore, scope: str, key: str, request_hash: str, body: bytes):
+        """Store the response of a claimed key for later replays."""
+        claimed_until = self._claimed_until.pop((scope, key), None)
+        if claimed_until is not None:
+            self._remember((scope, key), request_hash, body, claimed_until - time.monotonic())
+        await store.idempotency.complete(scope, key, body.decode("utf-8"))
+
+    async def abandon(self, store: DataStore, scope: str, key: str):
+        """Release a claimed key whose request failed so the client can retry it."""
+        await store.idempotency.release(scope, key)
+
+    def finish(self, scope: str, key: str):
+        """Wake up duplicates waiting on a key; always call after ``begin`` returned None."""
+        self._claimed_until.pop((scope, key), None)
+        pending = self._in_flight.pop((scope, key), None)
+        if pending is not None:
+            pending.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get LRU size and replay counters.
+
+        Returns:
+            Dict with size, capacity, TTL, in-flight keys and counters
+        """
+        return {
+            "size": len(self._completed),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self._in_flight),
+            "replays": self.replays,
+            "waits": self.waits
+        }
+
+
+# Global idempotency manager for POST /orders
+order_idempotency = IdempotencyManager(
+    name="orders",
+    max_entries=settings.idempotency_cache_max_entries,
+    ttl_seconds=settings.idempotency_ttl_seconds
+)
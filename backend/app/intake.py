@@ -0,0 +1,231 @@
+"""
+Asynchronous order intake.
+
+``POST /orders/intake`` only validates an order and appends it to the data
+store's order_intake queue, so accepting an order costs one insert however
+busy the inventory rows are. A pool of background workers drains the queue:
+each worker claims a batch of the oldest entries and places them with
+``OrderRepository.import_orders``, so a whole batch is validated against one
+stock snapshot and written in one transaction, exactly like a bulk import.
+Clients poll ``GET /orders/intake/{tracking_id}`` for the outcome.
+
+Entries are claimed atomically, so any number of workers in any number of
+processes can drain the same queue. The entry ID is passed as the order ID,
+which makes placing an entry twice fail on the primary key instead of
+creating a duplicate order.
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from .cache import inventory_cache
+from .config import settings
+from .repositories import DataStore
+from .utils.exceptions import ResourceConflictError
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between sweeps that recover timed-out claims and purge
+# processed entries
+MAINTENANCE_INTERVAL_SECONDS = 60.0
+
+
+class OrderIntakeWorkers:
+    """
+    Background workers that place queued orders in batches.
+
+    Usage::
+
+        await order_intake.start(store)     # application startup
+        order_intake.notify()               # after enqueueing an entry
+        await order_intake.stop()           # application shutdown
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        batch_size: int,
+        poll_interval_seconds: float,
+        claim_timeout_seconds: int,
+        max_attempts: int,
+        retention_seconds: int
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._last_maintenance = 0.0
+        self.batches = 0
+        self.created = 0
+        self.rejected = 0
+        self.failed = 0
+        self.recovered = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether intake is accepted; False when no workers are configured."""
+        return self.workers > 0
+
+    async def start(self, store: DataStore):
+        """
+        Recover entries left behind by workers that died and start the worker tasks.
+
+        Does nothing when intake is disabled or the workers are already running.
+        """
+        if not self.enabled or self._tasks:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        try:
+            await self._maintain(store)
+        except Exception as e:
+            logger.error(f"Order intake recovery error: {str(e)}")
+        self._tasks = [
+            asyncio.create_task(self._run(store), name=f"order-intake-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} order intake workers")
+
+    async def stop(self):
+        """Let every worker finish its current batch, then stop them."""
+        if not self._tasks:
+            return
+        self._stopping = True
+        self.notify()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers because new entries were queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self, store: DataStore):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                if time.monotonic() - self._last_maintenance >= MAINTENANCE_INTERVAL_SECONDS:
+                    await self._maintain(store)
+                processed = await self.drain_once(store)
+            except Exception as e:
+                logger.error(f"Order intake worker error: {str(e)}")
+                processed = 0
+            if processed:
+                continue
+            # Queue is empty; wait for new entries, polling for entries
+            # queued by other processes
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _maintain(self, store: DataStore):
+        self._last_maintenance = time.monotonic()
+        self.recovered += await store.intake.recover_stale(self.claim_timeout_seconds)
+        await store.intake.purge_processed(self.retention_seconds)
+
+    async def drain_once(self, store: DataStore) -> int:
+        """
+        Claim one batch of queued entries and place their orders.
+
+        Entries are grouped by creator and each group is placed with one
+        ``import_orders`` call. A group whose import fails is released back to
+        the queue, and rejected once it has used up its attempts.
+
+        Args:
+            store: Data store holding the order_intake queue
+
+        Returns:
+            int: Number of entries claimed; 0 when the queue is empty
+        """
+        entries = await store.intake.claim(self.batch_size)
+        if not entries:
+            return 0
+        self.batches += 1
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            groups.setdefault(entry["created_by"], []).append(entry)
+
+        created = 0
+        for created_by, group in groups.items():
+            try:
+                outcomes = await store.orders.import_orders(created_by, [
+                    {
+                        "id": entry["id"],
+                        "customer_name": entry["payload"]["customer_name"],
+                        "items": entry["payload"]["items"]
+                    }
+                    for entry in group
+                ])
+            except ResourceConflictError:
+                # An entry whose claim timed out was placed by another worker
+                await self._resolve_conflict(store, group)
+                continue
+            except Exception as e:
+                logger.error(f"Order intake batch error: {str(e)}")
+                self.failed += len(group)
+                await store.intake.release([entry["id"] for entry in group], self.max_attempts)
+                continue
+
+            await store.intake.complete([
+                {"id": entry["id"], "status": outcome["status"], "errors": outcome.get("errors")}
+                for entry, outcome in zip(group, outcomes)
+            ])
+            group_created = sum(1 for outcome in outcomes if outcome["status"] == "created")
+            created += group_created
+            self.rejected += len(group) - group_created
+
+        self.created += created
+        if created:
+            # Stock levels changed, so cached inventory snapshots are stale
+            inventory_cache.invalidate()
+        return len(entries)
+
+    async def _resolve_conflict(self, store: DataStore, group: List[Dict[str, Any]]):
+        """Mark entries whose order already exists as created and queue the rest again."""
+        placed = [entry for entry in group if await store.orders.get(entry["id"]) is not None]
+        placed_ids = {entry["id"] for entry in placed}
+        if placed:
+            await store.intake.complete([
+                {"id": entry["id"], "status": "created", "errors": None} for entry in placed
+            ])
+        await store.intake.release(
+            [entry["id"] for entry in group if entry["id"] not in placed_ids],
+            self.max_attempts
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get worker configuration and counters.
+
+        Returns:
+            Dict with whether intake is enabled, running workers and counters
+        """
+        return {
+            "enabled": self.enabled,
+            "workers": len(self._tasks),
+            "batch_size": self.batch_size,
+            "batches": self.batches,
+            "created": self.created,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "recovered": self.recovered
+        }
+
+
+# Global intake workers for POST /orders/intake
+order_intake = OrderIntakeWorkers(
+    workers=settings.order_intake_workers,
+    batch_size=settings.order_intake_batch_size,
+    poll_interval_seconds=settings.order_intake_poll_interval_seconds,
+    claim_timeout_seconds=settings.order_intake_claim_timeout_seconds,
+    max_attempts=settings.order_intake_max_attempts,
+    retention_seconds=settings.order_intake_retention_seconds
+)
@@ -4,8 +4,16 @@ FastAPI application entry point for the inventory management system.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .config import settings
-from .database import db_manager
+from .repositories import data_store
+from .auth.password import password_pool
+from .auth.jwt_handler import token_cache
+from .cache import inventory_cache
+from .idempotency import order_idempotency
+from .intake import order_intake
+from .reconcile import inventory_reconciler
+from .metrics import MetricsMiddleware, render_metrics
 from .routers import auth, users, inventory, orders
 import logging
 
@@ -28,8 +36,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Cache", "Idempotent-Replayed"],
 )
 
+# Record per-route latency and database round trips
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -43,19 +56,36 @@ async def startup_event():
     logger.info("Starting inventory management API...")
     
     # Validate database connection
-    health_result = await db_manager.health_check()
+    logger.info(f"Using {data_store.backend_name} data backend")
+    health_result = await data_store.health_check()
     if not health_result.get("healthy", False):
         logger.warning("Database connection check failed during startup")
         if health_result.get("error"):
             logger.error(f"Database error: {health_result['error']}")
     else:
         logger.info("Database connection validated successfully")
+    
+    # Start the workers that place orders queued by POST /orders/intake
+    await order_intake.start(data_store)
+    
+    # Schedule stock ledger reconciliation when an interval is configured
+    await inventory_reconciler.start(data_store)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event handler."""
     logger.info("Shutting down inventory management API...")
+    
+    # Let intake workers finish their current batch before closing the store
+    await order_intake.stop()
+    await inventory_reconciler.stop()
+    
+    # Release pooled database connections
+    await data_store.close()
+    
+    # Stop password hashing workers
+    password_pool.shutdown()
 
 
 @app.get("/health")
@@ -66,17 +96,41 @@ async def health_check():
     Returns:
         dict: Application health status
     """
-    db_health = await db_manager.health_check()
+    db_health = await data_store.health_check()
     db_healthy = db_health.get("healthy", False)
     
     return {
         "status": "healthy" if db_healthy else "degraded",
         "database": "connected" if db_healthy else "disconnected",
+        "database_backend": data_store.backend_name,
         "database_details": db_health,
+        "password_hashing": password_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "inventory_cache": inventory_cache.stats(),
+        "order_idempotency": order_idempotency.stats(),
+        "order_intake": order_intake.stats(),
+        "inventory_reconcile": inventory_reconciler.stats(),
         "version": "1.0.0"
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Metrics endpoint in Prometheus text exposition format.
+    
+    Exposes per-route latency histograms, database round trips per request,
+    and database call durations by table and operation.
+    
+    Returns:
+        PlainTextResponse: Metrics in Prometheus text format
+    """
+    return PlainTextResponse(
+        render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/")
 async def root():
     """
@@ -89,5 +143,6 @@ async def root():
         "message": "Inventory Management API",
         "version": "1.0.0",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "metrics": "/metrics"
     }
\ No newline at end of file
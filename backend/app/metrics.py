@@ -0,0 +1,267 @@
+"""
+Request and database metrics in Prometheus text exposition format.
+
+The ASGI middleware records per-route latency and the number of database
+round trips each request made, including those made while a streaming body
+is produced; the instrumented HTTP transport used by the async PostgREST
+client records the duration of every database call by table and operation. Everything is exposed at ``/metrics``.
+"""
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+import bisect
+import time
+
+import httpx
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value per the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a Prometheus label set."""
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        """Increment the counter for a label combination."""
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with labels and fixed buckets."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        """Record an observation for a label combination."""
+        series = self._series.get(label_values)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0])
+            self._series[label_values] = series
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status")
+))
+http_request_db_calls = registry.register(Histogram(
+    "http_request_db_calls",
+    "Database round trips made while handling one HTTP request",
+    ("method", "route"),
+    buckets=DB_CALL_COUNT_BUCKETS
+))
+db_call_duration = registry.register(Histogram(
+    "db_call_duration_seconds",
+    "Database call latency by table and operation",
+    ("table", "operation")
+))
+db_call_errors = registry.register(Counter(
+    "db_call_errors_total",
+    "Database calls that failed or returned an error status",
+    ("table", "operation")
+))
+
+
+class RequestDbStats:
+    """Mutable per-request counter shared with the data layer through a context variable."""
+
+    def __init__(self):
+        self.calls = 0
+
+
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def record_db_call(table: str, operation: str, duration: float, failed: bool = False):
+    """
+    Record one database round trip.
+
+    Args:
+        table: Table or function name
+        operation: select, insert, upsert, update, delete or rpc
+        duration: Call duration in seconds
+        failed: Whether the call raised or returned an error status
+    """
+    db_call_duration.observe(duration, table, operation)
+    if failed:
+        db_call_errors.inc(table, operation)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.calls += 1
+
+
+def _describe_postgrest_request(request: httpx.Request) -> Tuple[str, str]:
+    """Derive (table, operation) labels from a PostgREST request."""
+    path = request.url.path
+    marker = "/rest/v1/"
+    resource = path.split(marker, 1)[1] if marker in path else path.rsplit("/", 1)[-1]
+
+    if resource.startswith("rpc/"):
+        return resource[len("rpc/"):], "rpc"
+
+    method = request.method
+    if method == "POST":
+        prefer = request.headers.get("prefer", "")
+        operation = "upsert" if "resolution=" in prefer else "insert"
+    else:
+        operation = {
+            "GET": "select",
+            "HEAD": "select",
+            "PATCH": "update",
+            "PUT": "upsert",
+            "DELETE": "delete"
+        }.get(method, method.lower())
+    return resource, operation
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that times every PostgREST call for the metrics registry."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        table, operation = _describe_postgrest_request(request)
+        start = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            record_db_call(table, operation, time.perf_counter() - start, failed=True)
+            raise
+        record_db_call(table, operation, time.perf_counter() - start, failed=response.status_code >= 400)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Records latency and database round trips per route.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``: observations are
+    taken when the final body message is sent, so work done while a streaming
+    response is produced (NDJSON pages, for example) is counted.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDbStats()
+        token = _request_db_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+        observed = False
+
+        def observe():
+            nonlocal observed
+            observed = True
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration.observe(time.perf_counter() - start, method, route_path, str(status_code))
+            http_request_db_calls.observe(stats.calls, method, route_path)
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The final body message has been sent by now; the reset happens
+            # here because the streaming body may be sent from a child task
+            # whose context cannot reset this token.
+            if not observed:
+                observe()
+            _request_db_stats.reset(token)
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text format."""
+    return registry.render()
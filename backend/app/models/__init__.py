@@ -10,7 +10,20 @@ from .user import (
 from .inventory import (
     InventoryItemCreate,
     InventoryItemUpdate,
-    InventoryItemResponse
+    InventoryItemResponse,
+    LowStockItemResponse,
+    InventoryMovementKind,
+    InventoryMovementResponse,
+    InventoryDrift,
+    InventoryReconcileReport,
+    InventoryAdjustment,
+    InventoryBatchAdjustmentLine,
+    InventoryBatchAdjustment,
+    InventoryAdjustmentOutcome,
+    InventoryAdjustmentResult,
+    InventoryAdjustmentReport,
+    InventoryImportStatus,
+    InventoryImportResult
 )
 from .order import (
     OrderStatus,
@@ -18,7 +31,23 @@ from .order import (
     OrderCreate,
     OrderItemResponse,
     OrderResponse,
-    OrderStatusUpdate
+    OrderStatusUpdate,
+    OrderStatusEvent,
+    OrderTimelineResponse,
+    OrderStatusDurationStats,
+    OrderBulkStatusUpdate,
+    OrderBulkCancel,
+    OrderStatusOutcome,
+    OrderBulkStatusResult,
+    OrderBulkStatusReport,
+    OrderImportRow,
+    OrderImportStatus,
+    OrderImportResult,
+    OrderImportReport,
+    OrderIntakeStatus,
+    OrderIntakeResponse,
+    PickingListLine,
+    PickingListResponse
 )
 
 __all__ = [
@@ -34,11 +63,40 @@ __all__ = [
     "InventoryItemCreate",
     "InventoryItemUpdate",
     "InventoryItemResponse",
+    "LowStockItemResponse",
+    "InventoryMovementKind",
+    "InventoryMovementResponse",
+    "InventoryDrift",
+    "InventoryReconcileReport",
+    "InventoryAdjustment",
+    "InventoryBatchAdjustmentLine",
+    "InventoryBatchAdjustment",
+    "InventoryAdjustmentOutcome",
+    "InventoryAdjustmentResult",
+    "InventoryAdjustmentReport",
+    "InventoryImportStatus",
+    "InventoryImportResult",
     # Order models
     "OrderStatus",
     "OrderItemCreate",
     "OrderCreate",
     "OrderItemResponse",
     "OrderResponse",
-    "OrderStatusUpdate"
+    "OrderStatusUpdate",
+    "OrderStatusEvent",
+    "OrderTimelineResponse",
+    "OrderStatusDurationStats",
+    "OrderBulkStatusUpdate",
+    "OrderBulkCancel",
+    "OrderStatusOutcome",
+    "OrderBulkStatusResult",
+    "OrderBulkStatusReport",
+    "OrderImportRow",
+    "OrderImportStatus",
+    "OrderImportResult",
+    "OrderImportReport",
+    "OrderIntakeStatus",
+    "OrderIntakeResponse",
+    "PickingListLine",
+    "PickingListResponse"
 ]
\ No newline at end of file
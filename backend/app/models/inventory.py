@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel, Field, computed_field, validator
 
 
 class InventoryItemCreate(BaseModel):
@@ -35,10 +36,123 @@ class InventoryItemResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
     @property
     def is_low_stock(self) -> bool:
         """Check if item is below low stock threshold"""
         return self.stock_level <= self.low_stock_threshold
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class LowStockItemResponse(InventoryItemResponse):
+    """Model for low stock alert responses"""
+
+    @computed_field
+    @property
+    def shortfall(self) -> int:
+        """Number of units the item is below its low stock threshold"""
+        return self.low_stock_threshold - self.stock_level
+
+
+class InventoryMovementKind(str, Enum):
+    RECEIPT = "receipt"
+    SALE = "sale"
+    ADJUSTMENT = "adjustment"
+    CANCELLATION = "cancellation"
+
+
+class InventoryMovementResponse(BaseModel):
+    """Model for one entry of an item's stock ledger"""
+    id: int
+    item_id: str
+    kind: InventoryMovementKind
+    quantity: int
+    balance: int
+    reason: Optional[str] = None
+    created_at: datetime
+
+
+class InventoryDrift(BaseModel):
+    """Model for an item whose stock level differs from its ledger balance"""
+    item_id: str
+    name: str
+    stock_level: int
+    ledger_balance: int
+    corrected: bool
+
+
+class InventoryReconcileReport(BaseModel):
+    """Model for the result of a stock ledger reconciliation run"""
+    started_at: datetime
+    finished_at: datetime
+    applied: bool
+    scanned: int
+    drifted: int
+    corrected: int
+    drift: List[InventoryDrift]
+
+
+class InventoryAdjustment(BaseModel):
+    """Model for adding a signed delta to one item's stock level"""
+    delta: int
+    reason: str = Field(..., min_length=1, max_length=255)
+
+    @validator('delta')
+    def validate_delta(cls, v):
+        """Reject adjustments that would not change the stock level"""
+        if v == 0:
+            raise ValueError('Delta must not be zero')
+        return v
+
+
+class InventoryBatchAdjustmentLine(InventoryAdjustment):
+    """Model for one item of a batch stock adjustment"""
+    item_id: str
+
+
+class InventoryBatchAdjustment(BaseModel):
+    """Model for adjusting the stock levels of many items at once"""
+    adjustments: List[InventoryBatchAdjustmentLine] = Field(..., min_items=1)
+
+
+class InventoryAdjustmentOutcome(str, Enum):
+    ADJUSTED = "adjusted"
+    INSUFFICIENT_STOCK = "insufficient_stock"
+    NOT_FOUND = "not_found"
+
+
+class InventoryAdjustmentResult(BaseModel):
+    """Model for the outcome of one item in a batch stock adjustment"""
+    item_id: str
+    outcome: InventoryAdjustmentOutcome
+    stock_level: Optional[int] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class InventoryAdjustmentReport(BaseModel):
+    """Model for batch stock adjustment responses"""
+    adjusted: int
+    rejected: int
+    results: List[InventoryAdjustmentResult]
+
+
+class InventoryImportStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    REJECTED = "rejected"
+
+
+class InventoryImportResult(BaseModel):
+    """Model for the outcome of one row of a bulk inventory import"""
+    row: int
+    name: Optional[str] = None
+    status: InventoryImportStatus
+    item_id: Optional[str] = None
+    errors: List[str] = []
+
+    class Config:
+        use_enum_values = True
\ No newline at end of file
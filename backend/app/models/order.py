@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -8,6 +8,7 @@ class OrderStatus(str, Enum):
     PENDING = "pending"
     PROCESSING = "processing"
     FULFILLED = "fulfilled"
+    CANCELLED = "cancelled"
 
 
 class OrderItemCreate(BaseModel):
@@ -28,6 +29,11 @@ class OrderCreate(BaseModel):
         from_attributes = True
 
 
+class OrderImportRow(OrderCreate):
+    """Model for one order in a bulk import"""
+    reference: Optional[str] = Field(None, max_length=255)
+
+
 class OrderItemResponse(BaseModel):
     """Model for order item responses"""
     id: str
@@ -59,4 +65,138 @@ class OrderStatusUpdate(BaseModel):
     status: OrderStatus
 
     class Config:
-        use_enum_values = True
\ No newline at end of file
+        use_enum_values = True
+
+class OrderStatusEvent(BaseModel):
+    """Model for one status period in an order's timeline"""
+    status: OrderStatus
+    entered_at: datetime
+    left_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class OrderTimelineResponse(BaseModel):
+    """Model for order status timeline responses"""
+    order_id: str
+    events: List[OrderStatusEvent]
+
+
+class OrderStatusDurationStats(BaseModel):
+    """Model for time-in-status statistics of one order status"""
+    status: OrderStatus
+    completed: int
+    current: int
+    avg_seconds: Optional[float] = None
+    p50_seconds: Optional[float] = None
+    p90_seconds: Optional[float] = None
+    max_seconds: Optional[float] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class OrderBulkStatusUpdate(BaseModel):
+    """Model for moving many orders to a new status"""
+    order_ids: List[str] = Field(..., min_items=1)
+    status: OrderStatus
+
+    class Config:
+        use_enum_values = True
+
+
+class OrderBulkCancel(BaseModel):
+    """Model for cancelling many orders"""
+    order_ids: List[str] = Field(..., min_items=1)
+
+
+class OrderStatusOutcome(str, Enum):
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    INVALID_TRANSITION = "invalid_transition"
+    NOT_FOUND = "not_found"
+
+
+class OrderBulkStatusResult(BaseModel):
+    """Model for the outcome of one order in a bulk status update"""
+    order_id: str
+    outcome: OrderStatusOutcome
+    previous_status: Optional[OrderStatus] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class OrderBulkStatusReport(BaseModel):
+    """Model for bulk status update responses"""
+    status: OrderStatus
+    updated: int
+    unchanged: int
+    rejected: int
+    results: List[OrderBulkStatusResult]
+
+    class Config:
+        use_enum_values = True
+
+
+class OrderImportStatus(str, Enum):
+    CREATED = "created"
+    REJECTED = "rejected"
+
+
+class OrderImportResult(BaseModel):
+    """Model for the outcome of one imported order"""
+    row: int
+    reference: Optional[str] = None
+    status: OrderImportStatus
+    order_id: Optional[str] = None
+    errors: List[str] = []
+
+    class Config:
+        use_enum_values = True
+
+
+class OrderImportReport(BaseModel):
+    """Model for bulk order import responses"""
+    total: int
+    created: int
+    rejected: int
+    results: List[OrderImportResult]
+
+
+class OrderIntakeStatus(str, Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    CREATED = "created"
+    REJECTED = "rejected"
+
+
+class OrderIntakeResponse(BaseModel):
+    """Model for the state of an order submitted for asynchronous intake"""
+    tracking_id: str
+    status: OrderIntakeStatus
+    order_id: Optional[str] = None
+    errors: List[str] = []
+    attempts: int
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class PickingListLine(BaseModel):
+    """Model for the total quantity of one inventory item to pick"""
+    item_id: str
+    item_name: str
+    quantity: int
+    stock_level: int
+    order_ids: List[str]
+
+
+class PickingListResponse(BaseModel):
+    """Model for picking list responses"""
+    order_count: int
+    lines: List[PickingListLine]
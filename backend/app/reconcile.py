@@ -0,0 +1,153 @@
+"""
+Stock ledger reconciliation.
+
+Every change to an item's stock level appends a movement to the
+inventory_movements ledger in the same transaction, so ``stock_level`` should
+always equal the sum of the item's movements. A write that bypasses the
+repositories (a manual SQL fix, a restored backup, triggers disabled during a
+bulk load) breaks that invariant silently. The reconciler walks the catalog
+in batches of items, compares each stock level with the balance recomputed
+from the ledger and reports the drift; it can optionally set drifted stock
+levels back to their ledger balance.
+
+It runs on demand through ``POST /inventory/reconcile`` and, when
+``INVENTORY_RECONCILE_INTERVAL_SECONDS`` is set, periodically in the
+background.
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from .cache import inventory_cache
+from .config import settings
+from .repositories import DataStore
+from .repositories.base import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryReconciler:
+    """
+    Batched comparison of stock levels with their ledger balances.
+
+    Usage::
+
+        report = await inventory_reconciler.run(store)   # on demand
+        await inventory_reconciler.start(store)          # application startup
+        await inventory_reconciler.stop()                # application shutdown
+    """
+
+    def __init__(self, interval_seconds: float, batch_size: int, apply: bool):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.apply = apply
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.runs = 0
+        self.drifted = 0
+        self.corrected = 0
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    async def run(self, store: DataStore, apply: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Reconcile every item, one batch per repository call.
+
+        Runs are serialized, so an on-demand run waits for a scheduled one.
+
+        Args:
+            store: Data store to reconcile
+            apply: Correct drifted stock levels; defaults to
+                ``INVENTORY_RECONCILE_APPLY``
+
+        Returns:
+            Dict with when the run started and finished, whether corrections
+            were applied, the number of items scanned, drifted and corrected,
+            and the drifted items
+        """
+        apply = self.apply if apply is None else apply
+        async with self._lock:
+            started_at = utc_now()
+            scanned = 0
+            drift: List[Dict[str, Any]] = []
+            after = None
+            while True:
+                batch = await store.inventory.reconcile_balances(after, self.batch_size, apply)
+                scanned += batch["scanned"]
+                drift.extend(batch["drift"])
+                if batch["scanned"] < self.batch_size:
+                    break
+                after = batch["last_item_id"]
+
+            corrected = sum(1 for row in drift if row["corrected"])
+            for row in drift:
+                logger.warning(
+                    f"Stock drift for inventory item {row['item_id']}: stock level {row['stock_level']}, "
+                    f"ledger balance {row['ledger_balance']}{' (corrected)' if row['corrected'] else ''}"
+                )
+            if corrected:
+                # Stock levels changed, so cached inventory snapshots are stale
+                inventory_cache.invalidate()
+
+            self.runs += 1
+            self.drifted += len(drift)
+            self.corrected += corrected
+            self.last_report = {
+                "started_at": started_at,
+                "finished_at": utc_now(),
+                "applied": apply,
+                "scanned": scanned,
+                "drifted": len(drift),
+                "corrected": corrected,
+                "drift": drift
+            }
+            return self.last_report
+
+    async def start(self, store: DataStore):
+        """Start periodic runs; does nothing when no interval is configured."""
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run_periodically(store), name="inventory-reconcile")
+        logger.info(f"Reconciling inventory balances every {self.interval_seconds} seconds")
+
+    async def stop(self):
+        """Cancel periodic runs, abandoning a run in progress."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run_periodically(self, store: DataStore):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run(store)
+            except Exception as e:
+                logger.error(f"Inventory reconcile error: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get reconciler configuration and counters.
+
+        Returns:
+            Dict with the schedule, counters and summary of the last run
+        """
+        last = self.last_report
+        return {
+            "scheduled": self._task is not None,
+            "interval_seconds": self.interval_seconds,
+            "apply": self.apply,
+            "runs": self.runs,
+            "drifted": self.drifted,
+            "corrected": self.corrected,
+            "last_run_at": last["finished_at"] if last else None,
+            "last_drifted": last["drifted"] if last else None
+        }
+
+
+# Global reconciler for POST /inventory/reconcile and periodic runs
+inventory_reconciler = InventoryReconciler(
+    interval_seconds=settings.inventory_reconcile_interval_seconds,
+    batch_size=settings.inventory_reconcile_batch_size,
+    apply=settings.inventory_reconcile_apply
+)
@@ -0,0 +1,63 @@
+# Data access layer
+from .base import (
+    DataStore,
+    UserRepository,
+    InventoryRepository,
+    OrderRepository
+)
+
+from ..config import settings
+
+
+def create_data_store() -> DataStore:
+    """
+    Create the data backend selected by ``settings.data_backend``.
+
+    Returns:
+        DataStore: Supabase, Postgres, in-memory or SQLite backend
+    """
+    if settings.data_backend == "memory":
+        from .memory_store import MemoryDataStore
+        return MemoryDataStore()
+    if settings.data_backend == "postgres":
+        # asyncpg is only needed when this backend is selected
+        from .postgres_store import PostgresConnection, PostgresDataStore
+        return PostgresDataStore(PostgresConnection(
+            settings.database_url,
+            min_size=settings.db_pool_min_connections,
+            max_size=settings.db_pool_max_connections,
+            command_timeout=settings.db_request_timeout,
+            statement_cache_size=settings.db_statement_cache_size
+        ))
+    if settings.data_backend == "sqlite":
+        from .sqlite_store import SQLiteDataStore
+        return SQLiteDataStore(settings.sqlite_path)
+
+    from ..database import get_database
+    from .supabase_store import SupabaseDataStore
+    return SupabaseDataStore(get_database())
+
+
+# Global data store instance
+data_store = create_data_store()
+
+
+def get_data_store() -> DataStore:
+    """
+    Dependency function to get the data store instance.
+
+    Returns:
+        DataStore: The global data store instance
+    """
+    return data_store
+
+
+__all__ = [
+    "DataStore",
+    "UserRepository",
+    "InventoryRepository",
+    "OrderRepository",
+    "create_data_store",
+    "data_store",
+    "get_data_store"
+]
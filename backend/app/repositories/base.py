@@ -0,0 +1,709 @@
+"""
+Repository interfaces for the inventory management data layer.
+
+Routers depend only on these interfaces; the concrete backend (Supabase, Postgres,
+in-memory or SQLite) is selected by ``Settings.data_backend``. Every backend
+returns plain dictionaries shaped like the database rows in
+``migrations/001_create_tables.sql`` and enforces the same constraints,
+raising the exceptions from ``app.utils.exceptions``:
+
+- ``ResourceConflictError`` for unique constraint violations
+- ``DatabaseError`` for check and foreign key constraint violations
+- ``ResourceNotFoundError`` / ``InsufficientStockError`` for guarded stock updates
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import uuid
+
+from ..utils.exceptions import InsufficientStockError, ResourceNotFoundError
+
+
+USER_ROLES = ("admin", "salesperson", "warehouse_manager")
+USER_STATUSES = ("invited", "active")
+ORDER_STATUSES = ("pending", "processing", "fulfilled", "cancelled")
+INTAKE_STATUSES = ("queued", "processing", "created", "rejected")
+INVENTORY_MOVEMENT_KINDS = ("receipt", "sale", "adjustment", "cancellation")
+
+# inventory_items columns returned by the apply_stock_adjustments function
+STOCK_ADJUSTMENT_ITEM_COLUMNS = (
+    "id", "name", "description", "stock_level", "low_stock_threshold", "created_at", "updated_at"
+)
+
+# Order state machine: target status -> statuses an order can move to it from
+ORDER_STATUS_TRANSITIONS = {
+    "processing": ("pending",),
+    "fulfilled": ("processing",),
+    "cancelled": ("pending", "processing")
+}
+
+# Default admin account created by 002_seed_data.sql / seed_database.py
+DEFAULT_ADMIN = {
+    "first_name": "System",
+    "last_name": "Administrator",
+    "email": "admin@admin.com",
+    "phone_number": "1234567890",
+    "emergency_contact_number": "1234567890",
+    "role": "admin",
+    "status": "active"
+}
+DEFAULT_ADMIN_PASSWORD = "admin123!"
+
+
+def new_id() -> str:
+    """Generate a new UUID primary key."""
+    return str(uuid.uuid4())
+
+
+def utc_now() -> str:
+    """
+    Current UTC time as a fixed-width ISO-8601 string.
+
+    The fixed width keeps string comparison consistent with time ordering,
+    which the local backends rely on for keyset pagination.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def utc_after(seconds: float) -> str:
+    """UTC time ``seconds`` from now, formatted like ``utc_now``."""
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def format_timestamp(value: datetime) -> str:
+    """
+    Format a datetime like ``utc_now`` so it compares correctly with stored timestamps.
+
+    Naive datetimes are taken to be UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def aggregate_order_lines(items: Sequence[Dict[str, Any]]) -> "OrderedDict[str, int]":
+    """
+    Sum requested quantities per item, ordered by item ID.
+
+    Stock is always decremented in item ID order so that concurrent orders
+    touching the same items cannot deadlock.
+
+    Args:
+        items: Order lines with item_id and quantity
+
+    Returns:
+        OrderedDict mapping item_id to total quantity
+    """
+    totals: Dict[str, int] = {}
+    for line in items:
+        totals[line["item_id"]] = totals.get(line["item_id"], 0) + line["quantity"]
+    return OrderedDict(sorted(totals.items()))
+
+
+def item_not_found_message(item_id: str) -> str:
+    """Stock validation message for an unknown inventory item."""
+    return f"Inventory item {item_id} not found"
+
+
+def insufficient_stock_message(name: str, requested: int, available: int) -> str:
+    """Stock validation message for an item without enough stock."""
+    return f"Insufficient stock for item '{name}'. Requested: {requested}, Available: {available}"
+
+
+def stock_adjustment_results(
+    adjustments: Sequence[Dict[str, Any]],
+    rows: Sequence[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Shape the rows returned by the apply_stock_adjustments function.
+
+    Args:
+        adjustments: The adjustments passed to the function
+        rows: One row per distinct requested item ID with item_id, applied
+            and the inventory_items columns, which are NULL for unknown items
+
+    Returns:
+        One ``adjust_stock_batch`` result per requested item ID in request order
+    """
+    by_id = {row["item_id"]: row for row in rows}
+    results = []
+    for item_id in dict.fromkeys(adjustment["item_id"] for adjustment in adjustments):
+        row = by_id[item_id]
+        item = {column: row[column] for column in STOCK_ADJUSTMENT_ITEM_COLUMNS} if row["id"] is not None else None
+        results.append({"item_id": item_id, "applied": row["applied"], "item": item})
+    return results
+
+
+def adjusted_item(result: Dict[str, Any], delta: int) -> Dict[str, Any]:
+    """
+    Get the item of a single ``adjust_stock_batch`` result.
+
+    Raises:
+        ResourceNotFoundError: If the item does not exist
+        InsufficientStockError: If the guard rejected the delta
+    """
+    item = result["item"]
+    if item is None:
+        raise ResourceNotFoundError("Inventory item not found", {"item_id": result["item_id"]})
+    if not result["applied"]:
+        raise InsufficientStockError(
+            insufficient_stock_message(item["name"], -delta, item["stock_level"]),
+            {"item_id": result["item_id"], "requested": -delta, "available": item["stock_level"]}
+        )
+    return item
+
+
+def allocate_order_batch(
+    orders: Sequence[Dict[str, Any]],
+    stock: Dict[str, Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], "OrderedDict[str, int]"]:
+    """
+    Validate a batch of orders in sequence against one stock snapshot.
+
+    Each order is checked against the stock left over by the orders accepted
+    before it, exactly as if they had been placed one at a time, and
+    ``stock`` is decremented in place for every accepted order.
+
+    Args:
+        orders: Orders with customer_name, items (item_id, quantity) and
+            optionally the id to create the order with
+        stock: Snapshot mapping item_id to a dict with name and stock_level;
+            items missing from it are reported as not found
+
+    Returns:
+        Tuple of one result per order, either ``{"status": "created",
+        "order_id": ...}`` with the given or a newly generated order ID or
+        ``{"status": "rejected", "errors": [...]}``, and the total quantity
+        taken per item, ordered by item ID
+    """
+    results: List[Dict[str, Any]] = []
+    taken: Dict[str, int] = {}
+    for order in orders:
+        requested = aggregate_order_lines(order["items"])
+        errors = []
+        for item_id, quantity in requested.items():
+            item = stock.get(item_id)
+            if item is None:
+                errors.append(item_not_found_message(item_id))
+            elif item["stock_level"] < quantity:
+                errors.append(insufficient_stock_message(item["name"], quantity, item["stock_level"]))
+        if errors:
+            results.append({"status": "rejected", "errors": errors})
+            continue
+
+        for item_id, quantity in requested.items():
+            stock[item_id]["stock_level"] -= quantity
+            taken[item_id] = taken.get(item_id, 0) + quantity
+        results.append({"status": "created", "order_id": order.get("id") or new_id()})
+    return results, OrderedDict(sorted(taken.items()))
+
+
+class UserRepository(ABC):
+    """Data access for the users table."""
+
+    @abstractmethod
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a user by ID, or None if it does not exist."""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Get a user by email, or None if it does not exist."""
+
+    @abstractmethod
+    async def list_by_status(self, statuses: Sequence[str]) -> List[Dict[str, Any]]:
+        """List users whose status is one of ``statuses``."""
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a user.
+
+        Raises:
+            ResourceConflictError: If the email is already taken
+            DatabaseError: If a check constraint is violated
+        """
+
+    @abstractmethod
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update a user and return the new row, or None if it does not exist."""
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> bool:
+        """
+        Delete a user.
+
+        Returns:
+            bool: True if a row was deleted
+
+        Raises:
+            DatabaseError: If the user still owns orders
+        """
+
+
+class InventoryRepository(ABC):
+    """
+    Data access for the inventory_items table and its inventory_movements ledger.
+
+    Every change to an item's stock level appends a movement with the signed
+    quantity and the resulting balance in the same transaction, so
+    ``stock_level`` is the materialized balance of the item's movements.
+    Creating an item with stock records a ``receipt``, order placement a
+    ``sale``, cancellation a ``cancellation`` and any other change an
+    ``adjustment``.
+    """
+
+    @abstractmethod
+    async def list_page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        List items in (name, id) keyset order.
+
+        Args:
+            limit: Maximum number of rows
+            after: (name, id) of the last row of the previous page
+        """
+
+    @abstractmethod
+    async def list_low_stock(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List items at or below their low stock threshold, largest shortfall first."""
+
+    @abstractmethod
+    async def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Search items by name and description, best match first.
+
+        The query is lowercased and split on whitespace; an item matches when
+        every term is a substring of its name or its description. Matches are
+        ranked by name equal to the query, name starting with the query,
+        every term found in the name, shorter name, then name and ID.
+
+        Args:
+            query: Search text; a blank query matches nothing
+            limit: Maximum number of items to return
+        """
+
+    @abstractmethod
+    async def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Get an item by ID, or None if it does not exist."""
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert an item.
+
+        Raises:
+            ResourceConflictError: If another item has the name, regardless
+                of case
+            DatabaseError: If a check constraint is violated
+        """
+
+    @abstractmethod
+    async def update(self, item_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Update an item and return the new row, or None if it does not exist.
+
+        Raises:
+            ResourceConflictError: If another item has the new name,
+                regardless of case
+        """
+
+    @abstractmethod
+    async def upsert_many(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create or update a chunk of items by name in one transaction.
+
+        An item whose name matches an existing one regardless of case updates
+        that item, keeping its name and, when none is given, its description;
+        the others are inserted. Stock changes are recorded in the ledger like
+        ``create`` and ``update`` record them.
+
+        Args:
+            items: Dicts with name, description, stock_level and
+                low_stock_threshold; names must be distinct regardless of
+                case
+
+        Returns:
+            One dict per item in order with the ``item_id`` it created or
+            updated and whether it was ``created``
+        """
+
+    @abstractmethod
+    async def adjust_stock(self, item_id: str, delta: int, reason: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Apply a signed delta to an item's stock level in one guarded step.
+
+        Equivalent to ``UPDATE ... SET stock_level = stock_level + delta
+        WHERE id = ... AND stock_level + delta >= 0 RETURNING *``. The change
+        is recorded as an ``adjustment`` movement carrying ``reason``.
+
+        Raises:
+            ResourceNotFoundError: If the item does not exist
+            InsufficientStockError: If the adjustment would make stock negative
+        """
+
+    @abstractmethod
+    async def adjust_stock_batch(self, adjustments: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply signed deltas to many items with one guarded update.
+
+        Every adjustment that keeps its item's stock non-negative is applied
+        and recorded as an ``adjustment`` movement with its reason; the others
+        leave their item untouched. Runs in one transaction with the items
+        locked in id order.
+
+        Args:
+            adjustments: Dicts with item_id, delta and reason; each item at most once
+
+        Returns:
+            One dict per requested item ID in request order with the item_id,
+            whether the delta was ``applied`` and the ``item`` row afterwards
+            (None if the item does not exist)
+        """
+
+    @abstractmethod
+    async def list_movements(
+        self,
+        item_id: str,
+        limit: int,
+        after: Optional[Tuple[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List an item's stock movements newest first in (created_at, id) keyset order.
+
+        Args:
+            item_id: Inventory item ID
+            limit: Maximum number of rows
+            after: (created_at, id) of the last row of the previous page
+        """
+
+    @abstractmethod
+    async def reconcile_balances(
+        self,
+        after: Optional[str],
+        limit: int,
+        apply: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Compare one batch of stock levels with the balances recomputed from the ledger.
+
+        Args:
+            after: Item ID the previous batch ended with, or None to start
+            limit: Maximum number of items to compare, in id order
+            apply: Set drifted stock levels to their ledger balance, without
+                recording a movement. Negative ledger balances are only reported.
+
+        Returns:
+            Dict with ``scanned`` (items compared), ``last_item_id`` (the cursor
+            for the next batch) and ``drift``: one dict per item whose stock
+            level differs from its ledger balance, with item_id, name,
+            stock_level, ledger_balance and whether it was ``corrected``
+        """
+
+
+class OrderRepository(ABC):
+    """
+    Data access for the orders and order_items tables.
+
+    Orders are returned with their lines under ``items``, each line carrying
+    id, item_id, item_name and quantity.
+    """
+
+    @abstractmethod
+    async def place_order(
+        self,
+        customer_name: str,
+        created_by: str,
+        items: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Atomically validate stock, create the order and its items, and decrement stock.
+
+        Raises:
+            InsufficientStockError: If any line cannot be fulfilled; ``details["errors"]``
+                lists one message per failing item and nothing is written
+        """
+
+    @abstractmethod
+    async def import_orders(self, created_by: str, orders: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place a batch of orders against one stock snapshot.
+
+        The stock of every item the batch references is read (and locked) once
+        and the orders are validated in sequence with ``allocate_order_batch``,
+        so each order sees the stock left by the orders accepted before it.
+        Accepted orders, their lines and the combined stock decrements are then
+        written with batched statements in a single transaction; rejected
+        orders write nothing.
+
+        Args:
+            created_by: User ID recorded as the creator of every order
+            orders: Orders with customer_name, items (item_id, quantity) and
+                optionally the id to create the order with
+
+        Returns:
+            One result per order in input order, shaped like the results of
+            ``allocate_order_batch``
+
+        Raises:
+            ResourceConflictError: If a given order id already exists; nothing
+                in the batch is written
+        """
+
+    @abstractmethod
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        include_items: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        List orders newest first in (created_at, id) keyset order.
+
+        Args:
+            limit: Maximum number of rows
+            after: (created_at, id) of the last row of the previous page
+            status: Only orders with this status
+            created_by: Only orders created by this user ID
+            created_from: Inclusive lower bound on created_at, formatted with ``format_timestamp``
+            created_to: Exclusive upper bound on created_at, formatted with ``format_timestamp``
+            include_items: Embed each order's lines under ``items`` in the same query
+        """
+
+    @abstractmethod
+    async def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Get an order with its items, or None if it does not exist."""
+
+    @abstractmethod
+    async def set_status(
+        self,
+        order_id: str,
+        status: str,
+        from_statuses: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Set an order's status and return it with its items.
+
+        Args:
+            order_id: Order to update
+            status: New status
+            from_statuses: When given, only update the order if its current
+                status is one of these
+
+        Returns:
+            The updated order, or None if it does not exist or its current
+            status is not in ``from_statuses``
+        """
+
+    @abstractmethod
+    async def transition_statuses(
+        self,
+        order_ids: Sequence[str],
+        status: str,
+        from_statuses: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Move many orders to a new status with one set-based update.
+
+        Only orders whose current status is one of ``from_statuses`` change;
+        the others are left untouched.
+
+        Args:
+            order_ids: Orders to update; duplicates are ignored
+            status: New status
+            from_statuses: Statuses an order may currently have to be updated
+
+        Returns:
+            One result per distinct order ID in input order, with order_id,
+            previous_status (None if the order does not exist) and updated
+        """
+
+    @abstractmethod
+    async def cancel_orders(self, order_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Cancel many orders and put their stock back in one transaction.
+
+        Only orders in one of ``ORDER_STATUS_TRANSITIONS["cancelled"]`` are
+        cancelled. The quantities of all their lines are summed per item and
+        added back to ``inventory_items`` with one set-based update.
+
+        Args:
+            order_ids: Orders to cancel; duplicates are ignored
+
+        Returns:
+            One result per distinct order ID in input order, shaped like the
+            results of ``transition_statuses``
+        """
+
+    @abstractmethod
+    async def picking_list(
+        self,
+        order_ids: Optional[Sequence[str]] = None,
+        status: str = "pending"
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate order lines per inventory item with one grouped query.
+
+        Args:
+            order_ids: Only these orders, whatever their status; unknown IDs
+                are ignored
+            status: Only orders with this status, used when ``order_ids`` is None
+
+        Returns:
+            One row per item ordered by item name, with item_id, item_name,
+            stock_level, quantity (summed over the orders) and order_ids
+            (sorted IDs of the orders containing the item)
+        """
+
+    @abstractmethod
+    async def status_timeline(self, order_id: str) -> List[Dict[str, Any]]:
+        """
+        Get an order's status history from order_status_events.
+
+        Returns:
+            Events in time order with status, entered_at, left_at and
+            duration_seconds (both None for the current status); empty if
+            the order does not exist
+        """
+
+    @abstractmethod
+    async def status_durations(
+        self,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate the time orders spend in each status.
+
+        Args:
+            created_from: Inclusive lower bound on when a status was entered,
+                formatted with ``format_timestamp``
+            created_to: Exclusive upper bound on when a status was entered,
+                formatted with ``format_timestamp``
+
+        Returns:
+            One row per status with completed (periods the order has left),
+            current (orders still in the status) and avg_seconds,
+            p50_seconds, p90_seconds and max_seconds over completed periods
+            (nearest-rank percentiles, None when nothing completed)
+        """
+
+
+class IdempotencyRepository(ABC):
+    """
+    Data access for the idempotency_keys table.
+
+    Records are keyed by (scope, key) and carry the request fingerprint and
+    the serialized response, which stays None while the original request is
+    still being processed.
+    """
+
+    @abstractmethod
+    async def claim(self, scope: str, key: str, request_hash: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim a key for a new request.
+
+        Returns:
+            None if the caller now owns the key (it was unused or expired),
+            otherwise the existing record with request_hash and response
+        """
+
+    @abstractmethod
+    async def complete(self, scope: str, key: str, response: str):
+        """Store the serialized response of a claimed key."""
+
+    @abstractmethod
+    async def release(self, scope: str, key: str):
+        """Drop a claimed key whose request failed so it can be retried."""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Delete expired keys and return how many were removed."""
+
+
+class OrderIntakeRepository(ABC):
+    """
+    Data access for the order_intake queue.
+
+    Entries carry the creator, the order payload (customer_name and items)
+    and a status that moves from queued to processing when a worker claims
+    the entry, then to created or rejected. The entry ID doubles as the ID
+    of the order it creates, so an entry that is processed twice can never
+    create a second order.
+    """
+
+    @abstractmethod
+    async def enqueue(self, created_by: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a queued entry and return it."""
+
+    @abstractmethod
+    async def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """Get an entry by ID, or None if it does not exist."""
+
+    @abstractmethod
+    async def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Atomically mark up to ``limit`` of the oldest queued entries as processing.
+
+        Concurrent claimers, including other processes, never receive the
+        same entry. Claiming increments an entry's attempts.
+
+        Returns:
+            The claimed entries, oldest first
+        """
+
+    @abstractmethod
+    async def complete(self, results: Sequence[Dict[str, Any]]):
+        """
+        Record the outcome of claimed entries with one set-based update.
+
+        Args:
+            results: Dicts with id, status (created or rejected) and errors
+                (a list of messages, or None)
+        """
+
+    @abstractmethod
+    async def release(self, entry_ids: Sequence[str], max_attempts: int):
+        """
+        Return claimed entries to the queue after a failed attempt.
+
+        Entries that have already been attempted ``max_attempts`` times are
+        rejected instead.
+        """
+
+    @abstractmethod
+    async def recover_stale(self, claim_timeout_seconds: int) -> int:
+        """
+        Resolve entries claimed more than ``claim_timeout_seconds`` ago.
+
+        Their worker is assumed to have died: entries whose order exists are
+        marked created, the others are queued again.
+
+        Returns:
+            int: Number of entries resolved
+        """
+
+    @abstractmethod
+    async def purge_processed(self, older_than_seconds: int) -> int:
+        """Delete created and rejected entries processed more than ``older_than_seconds`` ago."""
+
+
+class DataStore(ABC):
+    """A data backend: the repositories plus connection lifecycle."""
+
+    backend_name: str = ""
+    users: UserRepository
+    inventory: InventoryRepository
+    orders: OrderRepository
+    idempotency: IdempotencyRepository
+    intake: OrderIntakeRepository
+
+    @abstractmethod
+    async def health_check(self) -> Dict[str, Any]:
+        """Check backend health; the result always contains a boolean ``healthy``."""
+
+    async def close(self):
+        """Release connections and other resources held by the backend."""
@@ -0,0 +1,858 @@
+"""
+In-memory implementation of the repository interfaces.
+
+Intended for local load tests and CI benchmarks: no network, no disk. The
+constraints of ``migrations/001_create_tables.sql`` (NOT NULL, CHECK, UNIQUE,
+foreign keys with RESTRICT/CASCADE) are enforced in Python. Every operation
+runs to completion without awaiting, so each one is atomic with respect to
+other requests on the event loop.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import bisect
+import itertools
+import math
+
+from ..utils.exceptions import (
+    DatabaseError,
+    InsufficientStockError,
+    ResourceConflictError,
+    ResourceNotFoundError
+)
+from .base import (
+    DEFAULT_ADMIN,
+    DEFAULT_ADMIN_PASSWORD,
+    ORDER_STATUS_TRANSITIONS,
+    ORDER_STATUSES,
+    USER_ROLES,
+    USER_STATUSES,
+    DataStore,
+    IdempotencyRepository,
+    InventoryRepository,
+    OrderIntakeRepository,
+    OrderRepository,
+    UserRepository,
+    aggregate_order_lines,
+    allocate_order_batch,
+    insufficient_stock_message,
+    item_not_found_message,
+    new_id,
+    utc_after,
+    utc_now
+)
+from .search_index import TrigramIndex
+
+
+USER_COLUMNS = {
+    "id": None, "first_name": 100, "last_name": 100, "email": 255, "password_hash": 255,
+    "phone_number": 20, "emergency_contact_number": 20, "role": 20, "status": 20,
+    "created_at": None, "updated_at": None
+}
+INVENTORY_COLUMNS = {
+    "id": None, "name": 255, "description": None, "stock_level": None,
+    "low_stock_threshold": None, "created_at": None, "updated_at": None
+}
+ORDER_COLUMNS = {
+    "id": None, "customer_name": 255, "status": 20, "created_by": None,
+    "created_at": None, "updated_at": None
+}
+
+
+def _check_columns(table: str, columns: Dict[str, Optional[int]], row: Dict[str, Any]):
+    """Reject unknown columns and values longer than their VARCHAR limit."""
+    for column, value in row.items():
+        if column not in columns:
+            raise DatabaseError(f"Column '{column}' does not exist on {table}")
+        max_length = columns[column]
+        if max_length is not None and isinstance(value, str) and len(value) > max_length:
+            raise DatabaseError(f"Value too long for {table}.{column} (max {max_length})")
+
+
+def _require(table: str, row: Dict[str, Any], *columns: str):
+    """Enforce NOT NULL columns."""
+    for column in columns:
+        if row.get(column) is None:
+            raise DatabaseError(f"Null value in column '{column}' of {table} violates not-null constraint")
+
+
+def _seconds_between(start: str, end: str) -> float:
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+
+def _nearest_rank(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values, matching SQL percentile_disc."""
+    if not values:
+        return None
+    return values[max(math.ceil(fraction * len(values)), 1) - 1]
+
+
+class MemoryUserRepository(UserRepository):
+    """Users held in process memory."""
+
+    def __init__(self, store: "MemoryDataStore"):
+        self.store = store
+
+    def _validate(self, row: Dict[str, Any]):
+        _require("users", row, "email", "role", "status")
+        if row["role"] not in USER_ROLES:
+            raise DatabaseError("users.role violates check constraint")
+        if row["status"] not in USER_STATUSES:
+            raise DatabaseError("users.status violates check constraint")
+
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self.store.user_rows.get(user_id)
+        return dict(row) if row else None
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        user_id = self.store.user_emails.get(email)
+        return dict(self.store.user_rows[user_id]) if user_id else None
+
+    async def list_by_status(self, statuses: Sequence[str]) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.store.user_rows.values() if row["status"] in statuses]
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        _check_columns("users", USER_COLUMNS, data)
+        now = utc_now()
+        row = {column: None for column in USER_COLUMNS}
+        row.update({"id": new_id(), "status": "invited", "created_at": now, "updated_at": now})
+        row.update(data)
+        self._validate(row)
+        if row["email"] in self.store.user_emails or row["id"] in self.store.user_rows:
+            raise ResourceConflictError("Duplicate key value violates unique constraint on users.email")
+
+        self.store.user_rows[row["id"]] = row
+        self.store.user_emails[row["email"]] = row["id"]
+        return dict(row)
+
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        _check_columns("users", USER_COLUMNS, data)
+        current = self.store.user_rows.get(user_id)
+        if current is None:
+            return None
+
+        row = {**current, **data, "id": user_id, "updated_at": utc_now()}
+        self._validate(row)
+        if row["email"] != current["email"] and row["email"] in self.store.user_emails:
+            raise ResourceConflictError("Duplicate key value violates unique constraint on users.email")
+
+        del self.store.user_emails[current["email"]]
+        self.store.user_emails[row["email"]] = user_id
+        self.store.user_rows[user_id] = row
+        return dict(row)
+
+    async def delete(self, user_id: str) -> bool:
+        row = self.store.user_rows.get(user_id)
+        if row is None:
+            return False
+        # orders.created_by REFERENCES users(id) ON DELETE RESTRICT
+        if any(order["created_by"] == user_id for order in self.store.order_rows.values()):
+            raise DatabaseError("User is still referenced by orders")
+
+        del self.store.user_rows[user_id]
+        del self.store.user_emails[row["email"]]
+        # order_intake.created_by REFERENCES users(id) ON DELETE CASCADE
+        for entry_id in [e["id"] for e in self.store.intake_entries.values() if e["created_by"] == user_id]:
+            self.store.intake.remove(entry_id)
+        return True
+
+
+class MemoryInventoryRepository(InventoryRepository):
+    """
+    Inventory items held in process memory.
+
+    A sorted (name, id) index serves keyset pages with a binary search, a
+    map of lowercased names enforces unique names regardless of case like
+    the database index, a trigram index serves search, and the set of low
+    stock item IDs is maintained on every write so alert queries only touch
+    alerting items.
+    """
+
+    def __init__(self, store: "MemoryDataStore"):
+        self.store = store
+
+    def _validate(self, row: Dict[str, Any]):
+        _require("inventory_items", row, "name", "stock_level", "low_stock_threshold")
+        if row["stock_level"] < 0:
+            raise DatabaseError("inventory_items.stock_level violates check constraint (stock_level >= 0)")
+        if row["low_stock_threshold"] < 0:
+            raise DatabaseError("inventory_items.low_stock_threshold violates check constraint (low_stock_threshold >= 0)")
+
+    def _check_name(self, row: Dict[str, Any]):
+        if self.store.item_keys.get(row["name"].lower(), row["id"]) != row["id"]:
+            raise ResourceConflictError("Duplicate key value violates unique constraint on lower(inventory_items.name)")
+
+    def _store(self, row: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Write a row and keep the name and low stock indexes in sync."""
+        store = self.store
+        if previous is not None and previous["name"] != row["name"]:
+            index = bisect.bisect_left(store.item_names, (previous["name"], row["id"]))
+            del store.item_names[index]
+            del store.item_keys[previous["name"].lower()]
+        if previous is None or previous["name"] != row["name"]:
+            bisect.insort(store.item_names, (row["name"], row["id"]))
+            store.item_keys[row["name"].lower()] = row["id"]
+        if previous is None or (previous["name"], previous["description"]) != (row["name"], row["description"]):
+            store.item_search.add(row["id"], row["name"], row["description"])
+
+        if row["stock_level"] <= row["low_stock_threshold"]:
+            store.low_stock_ids.add(row["id"])
+        else:
+            store.low_stock_ids.discard(row["id"])
+        store.items[row["id"]] = row
+
+    def _record_movement(self, row: Dict[str, Any], quantity: int, kind: str, reason: Optional[str] = None):
+        """Append a ledger movement for a stock change just written to ``row``."""
+        if quantity == 0:
+            return
+        store = self.store
+        store.movement_seq += 1
+        store.inventory_movements.setdefault(row["id"], []).append({
+            "id": store.movement_seq,
+            "item_id": row["id"],
+            "kind": kind,
+            "quantity": quantity,
+            "balance": row["stock_level"],
+            "reason": reason,
+            "created_at": row["updated_at"]
+        })
+
+    async def list_page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        names = self.store.item_names
+        start = bisect.bisect_right(names, tuple(after)) if after is not None else 0
+        return [dict(self.store.items[item_id]) for _, item_id in names[start:start + limit]]
+
+    async def list_low_stock(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = sorted(
+            (self.store.items[item_id] for item_id in self.store.low_stock_ids),
+            key=lambda row: (row["stock_level"] - row["low_stock_threshold"], row["name"])
+        )
+        if limit is not None:
+            rows = rows[:limit]
+        return [dict(row) for row in rows]
+
+    async def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        return [dict(self.store.items[item_id]) for item_id in self.store.item_search.search(query, limit)]
+
+    async def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        row = self.store.items.get(item_id)
+        return dict(row) if row else None
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        _check_columns("inventory_items", INVENTORY_COLUMNS, data)
+        now = utc_now()
+        row = {column: None for column in INVENTORY_COLUMNS}
+        row.update({"id": new_id(), "stock_level": 0, "low_stock_threshold": 0, "created_at": now, "updated_at": now})
+        row.update(data)
+        self._validate(row)
+        if row["id"] in self.store.items:
+            raise ResourceConflictError("Duplicate key value violates unique constraint on inventory_items.id")
+        self._check_name(row)
+
+        self._store(row)
+        self._record_movement(row, row["stock_level"], "receipt")
+        return dict(row)
+
+    async def update(self, item_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        _check_columns("inventory_items", INVENTORY_COLUMNS, data)
+        current = self.store.items.get(item_id)
+        if current is None:
+            return None
+
+        row = {**current, **data, "id": item_id, "updated_at": utc_now()}
+        self._validate(row)
+        self._check_name(row)
+        self._store(row, current)
+        self._record_movement(row, row["stock_level"] - current["stock_level"], "adjustment")
+        return dict(row)
+
+    async def upsert_many(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = []
+        for item in items:
+            item_id = self.store.item_keys.get(item["name"].lower())
+            if item_id is None:
+                created = await self.create(item)
+                results.append({"item_id": created["id"], "created": True})
+                continue
+
+            data = {key: value for key, value in item.items() if key != "name" and (key != "description" or value is not None)}
+            await self.update(item_id, data)
+            results.append({"item_id": item_id, "created": False})
+        return results
+
+    async def adjust_stock(self, item_id: str, delta: int, reason: Optional[str] = None) -> Dict[str, Any]:
+        return self.move_stock(item_id, delta, "adjustment", reason)
+
+    async def adjust_stock_batch(self, adjustments: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = {}
+        for adjustment in adjustments:
+            item_id = adjustment["item_id"]
+            if item_id in results:
+                continue
+            try:
+                item = self.move_stock(item_id, adjustment["delta"], "adjustment", adjustment["reason"])
+                results[item_id] = {"item_id": item_id, "applied": True, "item": item}
+            except (ResourceNotFoundError, InsufficientStockError):
+                current = self.store.items.get(item_id)
+                results[item_id] = {"item_id": item_id, "applied": False, "item": dict(current) if current else None}
+        return list(results.values())
+
+    def move_stock(self, item_id: str, delta: int, kind: str, reason: Optional[str] = None) -> Dict[str, Any]:
+        """Guarded stock change recorded as a movement of the given kind; used by orders too."""
+        current = self.store.items.get(item_id)
+        if current is None:
+            raise ResourceNotFoundError("Inventory item not found", {"item_id": item_id})
+        if current["stock_level"] + delta < 0:
+            raise InsufficientStockError(
+                insufficient_stock_message(current["name"], -delta, current["stock_level"]),
+                {"item_id": item_id, "requested": -delta, "available": current["stock_level"]}
+            )
+
+        row = {**current, "stock_level": current["stock_level"] + delta, "updated_at": utc_now()}
+        self._store(row, current)
+        self._record_movement(row, delta, kind, reason)
+        return dict(row)
+
+    async def list_movements(
+        self,
+        item_id: str,
+        limit: int,
+        after: Optional[Tuple[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        # Movements are appended in (created_at, id) order
+        rows = reversed(self.store.inventory_movements.get(item_id, []))
+        if after is not None:
+            key = tuple(after)
+            rows = (row for row in rows if (row["created_at"], row["id"]) < key)
+        return [dict(row) for row in itertools.islice(rows, limit)]
+
+    async def reconcile_balances(
+        self,
+        after: Optional[str],
+        limit: int,
+        apply: bool = False
+    ) -> Dict[str, Any]:
+        store = self.store
+        item_ids = sorted(store.items)
+        start = bisect.bisect_right(item_ids, after) if after is not None else 0
+        batch = item_ids[start:start + limit]
+        drift = []
+        for item_id in batch:
+            current = store.items[item_id]
+            ledger_balance = sum(row["quantity"] for row in store.inventory_movements.get(item_id, []))
+            if current["stock_level"] == ledger_balance:
+                continue
+            corrected = apply and ledger_balance >= 0
+            if corrected:
+                self._store({**current, "stock_level": ledger_balance, "updated_at": utc_now()}, current)
+            drift.append({
+                "item_id": item_id,
+                "name": current["name"],
+                "stock_level": current["stock_level"],
+                "ledger_balance": ledger_balance,
+                "corrected": corrected
+            })
+        return {"scanned": len(batch), "last_item_id": batch[-1] if batch else None, "drift": drift}
+
+
+class MemoryOrderRepository(OrderRepository):
+    """
+    Orders and order items held in process memory.
+
+    A sorted (created_at, id) index serves newest-first keyset pages.
+    """
+
+    def __init__(self, store: "MemoryDataStore"):
+        self.store = store
+
+    def _with_items(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of an order with its lines embedded."""
+        items = []
+        for order_item_id in self.store.order_item_ids.get(order["id"], []):
+            order_item = self.store.order_items[order_item_id]
+            items.append({
+                "id": order_item["id"],
+                "item_id": order_item["item_id"],
+                "item_name": self.store.items[order_item["item_id"]]["name"],
+                "quantity": order_item["quantity"]
+            })
+        return {**order, "items": items}
+
+    async def place_order(
+        self,
+        customer_name: str,
+        created_by: str,
+        items: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        store = self.store
+        order = self._new_order(new_id(), customer_name, created_by, utc_now())
+        if created_by not in store.user_rows:
+            raise DatabaseError("orders.created_by violates foreign key constraint")
+        if any(line["quantity"] <= 0 for line in items):
+            raise DatabaseError("order_items.quantity violates check constraint (quantity > 0)")
+
+        # Validate every line before writing anything
+        requested = aggregate_order_lines(items)
+        errors = []
+        for item_id, quantity in requested.items():
+            inventory_item = store.items.get(item_id)
+            if inventory_item is None:
+                errors.append(item_not_found_message(item_id))
+            elif inventory_item["stock_level"] < quantity:
+                errors.append(insufficient_stock_message(inventory_item["name"], quantity, inventory_item["stock_level"]))
+        if errors:
+            raise InsufficientStockError(
+                "Order cannot be fulfilled due to insufficient inventory",
+                {"errors": errors}
+            )
+
+        for item_id, quantity in requested.items():
+            store.inventory.move_stock(item_id, -quantity, "sale")
+
+        self._insert(order, items)
+        return self._with_items(order)
+
+    def _new_order(self, order_id: str, customer_name: str, created_by: str, now: str) -> Dict[str, Any]:
+        """Build and validate an orders row without storing it."""
+        order = {
+            "id": order_id,
+            "customer_name": customer_name,
+            "status": "pending",
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now
+        }
+        _check_columns("orders", ORDER_COLUMNS, order)
+        _require("orders", order, "customer_name", "created_by")
+        return order
+
+    def _insert(self, order: Dict[str, Any], items: Sequence[Dict[str, Any]]):
+        """Store a validated order and its lines."""
+        store = self.store
+        store.order_rows[order["id"]] = order
+        bisect.insort(store.order_keys, (order["created_at"], order["id"]))
+        store.order_status_events[order["id"]] = [(order["status"], order["created_at"])]
+        line_ids = store.order_item_ids.setdefault(order["id"], [])
+        for line in items:
+            order_item = {
+                "id": new_id(),
+                "order_id": order["id"],
+                "item_id": line["item_id"],
+                "quantity": line["quantity"],
+                "created_at": order["created_at"]
+            }
+            store.order_items[order_item["id"]] = order_item
+            line_ids.append(order_item["id"])
+
+    async def import_orders(self, created_by: str, orders: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        store = self.store
+        if created_by not in store.user_rows:
+            raise DatabaseError("orders.created_by violates foreign key constraint")
+        if any(line["quantity"] <= 0 for order in orders for line in order["items"]):
+            raise DatabaseError("order_items.quantity violates check constraint (quantity > 0)")
+
+        stock = {}
+        for order in orders:
+            for line in order["items"]:
+                item = store.items.get(line["item_id"])
+                if item is not None:
+                    stock[item["id"]] = {"name": item["name"], "stock_level": item["stock_level"]}
+        results, taken = allocate_order_batch(orders, stock)
+
+        # Validate every row before writing anything
+        now = utc_now()
+        accepted = [
+            (self._new_order(result["order_id"], order["customer_name"], created_by, now), order["items"])
+            for order, result in zip(orders, results)
+            if result["status"] == "created"
+        ]
+        if any(order["id"] in store.order_rows for order, _ in accepted):
+            raise ResourceConflictError("Duplicate key value violates unique constraint on orders.id")
+        for item_id, quantity in taken.items():
+            store.inventory.move_stock(item_id, -quantity, "sale")
+        for order, items in accepted:
+            self._insert(order, items)
+        return results
+
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        include_items: bool = False
+    ) -> List[Dict[str, Any]]:
+        keys = self.store.order_keys
+        # Walk the index backwards from the newest key still in range
+        end = len(keys)
+        if after is not None:
+            end = bisect.bisect_left(keys, tuple(after))
+        if created_to is not None:
+            end = min(end, bisect.bisect_left(keys, (created_to, "")))
+
+        rows = []
+        for index in range(end - 1, -1, -1):
+            if len(rows) >= limit:
+                break
+            created_at, order_id = keys[index]
+            if created_from is not None and created_at < created_from:
+                break
+            order = self.store.order_rows[order_id]
+            if status is not None and order["status"] != status:
+                continue
+            if created_by is not None and order["created_by"] != created_by:
+                continue
+            rows.append(self._with_items(order) if include_items else dict(order))
+        return rows
+
+    async def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        order = self.store.order_rows.get(order_id)
+        return self._with_items(order) if order else None
+
+    async def set_status(
+        self,
+        order_id: str,
+        status: str,
+        from_statuses: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        if status not in ORDER_STATUSES:
+            raise DatabaseError("orders.status violates check constraint")
+        order = self.store.order_rows.get(order_id)
+        if order is None or (from_statuses is not None and order["status"] not in from_statuses):
+            return None
+        self._change_status(order, status, utc_now())
+        return self._with_items(order)
+
+    def _change_status(self, order: Dict[str, Any], status: str, now: str):
+        """Update an order's status, recording a status event when it changes."""
+        if order["status"] != status:
+            self.store.order_status_events[order["id"]].append((status, now))
+        order.update({"status": status, "updated_at": now})
+
+    async def transition_statuses(
+        self,
+        order_ids: Sequence[str],
+        status: str,
+        from_statuses: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        if status not in ORDER_STATUSES:
+            raise DatabaseError("orders.status violates check constraint")
+        now = utc_now()
+        results = []
+        for order_id in dict.fromkeys(order_ids):
+            order = self.store.order_rows.get(order_id)
+            previous_status = order["status"] if order is not None else None
+            updated = previous_status in from_statuses
+            if updated:
+                self._change_status(order, status, now)
+            results.append({"order_id": order_id, "previous_status": previous_status, "updated": updated})
+        return results
+
+    async def cancel_orders(self, order_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        store = self.store
+        now = utc_now()
+        results = []
+        restock: Dict[str, int] = {}
+        for order_id in dict.fromkeys(order_ids):
+            order = store.order_rows.get(order_id)
+            previous_status = order["status"] if order is not None else None
+            updated = previous_status in ORDER_STATUS_TRANSITIONS["cancelled"]
+            if updated:
+                self._change_status(order, "cancelled", now)
+                for line_id in store.order_item_ids.get(order_id, []):
+                    line = store.order_items[line_id]
+                    restock[line["item_id"]] = restock.get(line["item_id"], 0) + line["quantity"]
+            results.append({"order_id": order_id, "previous_status": previous_status, "updated": updated})
+
+        for item_id, quantity in sorted(restock.items()):
+            store.inventory.move_stock(item_id, quantity, "cancellation")
+        return results
+
+    async def picking_list(
+        self,
+        order_ids: Optional[Sequence[str]] = None,
+        status: str = "pending"
+    ) -> List[Dict[str, Any]]:
+        store = self.store
+        if order_ids is None:
+            selected = [order_id for order_id, order in store.order_rows.items() if order["status"] == status]
+        else:
+            selected = [order_id for order_id in dict.fromkeys(order_ids) if order_id in store.order_rows]
+
+        lines: Dict[str, Dict[str, Any]] = {}
+        for order_id in selected:
+            for line_id in store.order_item_ids.get(order_id, []):
+                order_item = store.order_items[line_id]
+                line = lines.get(order_item["item_id"])
+                if line is None:
+                    item = store.items[order_item["item_id"]]
+                    line = lines[item["id"]] = {
+                        "item_id": item["id"],
+                        "item_name": item["name"],
+                        "stock_level": item["stock_level"],
+                        "quantity": 0,
+                        "order_ids": set()
+                    }
+                line["quantity"] += order_item["quantity"]
+                line["order_ids"].add(order_id)
+
+        results = sorted(lines.values(), key=lambda line: (line["item_name"], line["item_id"]))
+        for line in results:
+            line["order_ids"] = sorted(line["order_ids"])
+        return results
+
+    async def status_timeline(self, order_id: str) -> List[Dict[str, Any]]:
+        events = self.store.order_status_events.get(order_id, [])
+        timeline = []
+        for index, (status, entered_at) in enumerate(events):
+            left_at = events[index + 1][1] if index + 1 < len(events) else None
+            timeline.append({
+                "status": status,
+                "entered_at": entered_at,
+                "left_at": left_at,
+                "duration_seconds": _seconds_between(entered_at, left_at) if left_at is not None else None
+            })
+        return timeline
+
+    async def status_durations(
+        self,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        completed: Dict[str, List[float]] = {}
+        current: Dict[str, int] = {}
+        for events in self.store.order_status_events.values():
+            for index, (status, entered_at) in enumerate(events):
+                if (created_from is not None and entered_at < created_from) or \
+                        (created_to is not None and entered_at >= created_to):
+                    continue
+                completed.setdefault(status, [])
+                if index + 1 < len(events):
+                    completed[status].append(_seconds_between(entered_at, events[index + 1][1]))
+                else:
+                    current[status] = current.get(status, 0) + 1
+
+        results = []
+        for status, durations in completed.items():
+            durations.sort()
+            results.append({
+                "status": status,
+                "completed": len(durations),
+                "current": current.get(status, 0),
+                "avg_seconds": sum(durations) / len(durations) if durations else None,
+                "p50_seconds": _nearest_rank(durations, 0.5),
+                "p90_seconds": _nearest_rank(durations, 0.9),
+                "max_seconds": durations[-1] if durations else None
+            })
+        return results
+
+
+class MemoryIdempotencyRepository(IdempotencyRepository):
+    """Idempotency keys held in process memory."""
+
+    def __init__(self, store: "MemoryDataStore"):
+        self.store = store
+
+    async def claim(self, scope: str, key: str, request_hash: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+        existing = self.store.idempotency_keys.get((scope, key))
+        now = utc_now()
+        if existing is not None and existing["expires_at"] > now:
+            return dict(existing)
+
+        self.store.idempotency_keys[(scope, key)] = {
+            "scope": scope,
+            "key": key,
+            "request_hash": request_hash,
+            "response": None,
+            "created_at": now,
+            "expires_at": utc_after(ttl_seconds)
+        }
+        return None
+
+    async def complete(self, scope: str, key: str, response: str):
+        record = self.store.idempotency_keys.get((scope, key))
+        if record is not None:
+            record["response"] = response
+
+    async def release(self, scope: str, key: str):
+        record = self.store.idempotency_keys.get((scope, key))
+        if record is not None and record["response"] is None:
+            del self.store.idempotency_keys[(scope, key)]
+
+    async def purge_expired(self) -> int:
+        now = utc_now()
+        expired = [k for k, record in self.store.idempotency_keys.items() if record["expires_at"] <= now]
+        for k in expired:
+            del self.store.idempotency_keys[k]
+        return len(expired)
+
+
+class MemoryOrderIntakeRepository(OrderIntakeRepository):
+    """
+    Order intake queue held in process memory.
+
+    Queued entries are indexed by (created_at, id) in a sorted list, so
+    claiming takes the oldest entries without scanning the whole queue.
+    """
+
+    def __init__(self, store: "MemoryDataStore"):
+        self.store = store
+
+    def remove(self, entry_id: str):
+        """Delete an entry, keeping the queued index in step."""
+        entry = self.store.intake_entries.pop(entry_id)
+        if entry["status"] == "queued":
+            self.store.intake_queue.remove((entry["created_at"], entry_id))
+
+    def _requeue(self, entry: Dict[str, Any]):
+        entry["status"] = "queued"
+        entry["claimed_at"] = None
+        bisect.insort(self.store.intake_queue, (entry["created_at"], entry["id"]))
+
+    async def enqueue(self, created_by: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if created_by not in self.store.user_rows:
+            raise DatabaseError("order_intake.created_by violates foreign key constraint")
+        entry = {
+            "id": new_id(),
+            "created_by": created_by,
+            "payload": payload,
+            "status": "queued",
+            "order_id": None,
+            "errors": None,
+            "attempts": 0,
+            "created_at": utc_now(),
+            "claimed_at": None,
+            "processed_at": None
+        }
+        self.store.intake_entries[entry["id"]] = entry
+        self.store.intake_queue.append((entry["created_at"], entry["id"]))
+        return dict(entry)
+
+    async def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.store.intake_entries.get(entry_id)
+        return dict(entry) if entry else None
+
+    async def claim(self, limit: int) -> List[Dict[str, Any]]:
+        queue = self.store.intake_queue
+        claimed_keys = queue[:limit]
+        del queue[:limit]
+        now = utc_now()
+        claimed = []
+        for _, entry_id in claimed_keys:
+            entry = self.store.intake_entries[entry_id]
+            entry.update({"status": "processing", "claimed_at": now, "attempts": entry["attempts"] + 1})
+            claimed.append(dict(entry))
+        return claimed
+
+    async def complete(self, results: Sequence[Dict[str, Any]]):
+        now = utc_now()
+        for result in results:
+            entry = self.store.intake_entries.get(result["id"])
+            if entry is None or entry["status"] != "processing":
+                continue
+            entry.update({
+                "status": result["status"],
+                "order_id": result["id"] if result["status"] == "created" else None,
+                "errors": result.get("errors"),
+                "processed_at": now
+            })
+
+    async def release(self, entry_ids: Sequence[str], max_attempts: int):
+        now = utc_now()
+        for entry_id in entry_ids:
+            entry = self.store.intake_entries.get(entry_id)
+            if entry is None or entry["status"] != "processing":
+                continue
+            if entry["attempts"] >= max_attempts:
+                entry.update({
+                    "status": "rejected",
+                    "errors": [f"Order could not be processed after {entry['attempts']} attempts"],
+                    "processed_at": now
+                })
+            else:
+                self._requeue(entry)
+
+    async def recover_stale(self, claim_timeout_seconds: int) -> int:
+        cutoff = utc_after(-claim_timeout_seconds)
+        now = utc_now()
+        stale = [
+            entry for entry in self.store.intake_entries.values()
+            if entry["status"] == "processing" and entry["claimed_at"] < cutoff
+        ]
+        for entry in stale:
+            if entry["id"] in self.store.order_rows:
+                entry.update({"status": "created", "order_id": entry["id"], "processed_at": now})
+            else:
+                self._requeue(entry)
+        return len(stale)
+
+    async def purge_processed(self, older_than_seconds: int) -> int:
+        cutoff = utc_after(-older_than_seconds)
+        expired = [
+            entry_id for entry_id, entry in self.store.intake_entries.items()
+            if entry["processed_at"] is not None and entry["processed_at"] < cutoff
+        ]
+        for entry_id in expired:
+            self.remove(entry_id)
+        return len(expired)
+
+
+class MemoryDataStore(DataStore):
+    """Data backend that keeps every table in process memory."""
+
+    backend_name = "memory"
+
+    def __init__(self, seed_admin: bool = True):
+        self.users = MemoryUserRepository(self)
+        self.inventory = MemoryInventoryRepository(self)
+        self.orders = MemoryOrderRepository(self)
+        self.idempotency = MemoryIdempotencyRepository(self)
+        self.intake = MemoryOrderIntakeRepository(self)
+        self.reset()
+        if seed_admin:
+            self._seed_default_admin()
+
+    def reset(self):
+        """Drop all data."""
+        self.user_rows: Dict[str, Dict[str, Any]] = {}
+        self.user_emails: Dict[str, str] = {}
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.item_names: List[Tuple[str, str]] = []
+        self.item_keys: Dict[str, str] = {}
+        self.item_search = TrigramIndex()
+        self.low_stock_ids: Set[str] = set()
+        self.inventory_movements: Dict[str, List[Dict[str, Any]]] = {}
+        self.movement_seq = 0
+        self.order_rows: Dict[str, Dict[str, Any]] = {}
+        self.order_keys: List[Tuple[str, str]] = []
+        self.order_items: Dict[str, Dict[str, Any]] = {}
+        self.order_item_ids: Dict[str, List[str]] = {}
+        self.order_status_events: Dict[str, List[Tuple[str, str]]] = {}
+        self.idempotency_keys: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.intake_entries: Dict[str, Dict[str, Any]] = {}
+        self.intake_queue: List[Tuple[str, str]] = []
+
+    def _seed_default_admin(self):
+        """Create the default admin account, mirroring 002_seed_data.sql."""
+        from ..auth.password import hash_password
+
+        now = utc_now()
+        row = {column: None for column in USER_COLUMNS}
+        row.update(DEFAULT_ADMIN)
+        row.update({
+            "id": new_id(),
+            "password_hash": hash_password(DEFAULT_ADMIN_PASSWORD),
+            "created_at": now,
+            "updated_at": now
+        })
+        self.user_rows[row["id"]] = row
+        self.user_emails[row["email"]] = row["id"]
+
+    async def health_check(self) -> Dict[str, Any]:
+        return {
+            "healthy": True,
+            "timestamp": utc_now(),
+            "connection_status": "in_memory",
+            "error": None
+        }
@@ -0,0 +1,665 @@
+"""
+Direct PostgreSQL implementation of the repository interfaces.
+
+Talks to Postgres through asyncpg instead of going HTTP -> PostgREST ->
+Postgres, so there is no extra hop and no JSON encoding of every row. A
+sized connection pool is opened lazily on first use; asyncpg prepares and
+caches every statement per connection. Order placement, imports and other
+multi-row writes call the same database functions as the Supabase backend, so
+the stock rules live in one place. The schema is the one created by the SQL
+migrations.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import time
+import uuid
+
+import asyncpg
+
+from ..metrics import record_db_call
+from ..utils.exceptions import (
+    DatabaseError,
+    InsufficientStockError,
+    ResourceConflictError
+)
+from .base import (
+    DataStore,
+    IdempotencyRepository,
+    InventoryRepository,
+    OrderIntakeRepository,
+    OrderRepository,
+    UserRepository,
+    adjusted_item,
+    item_not_found_message,
+    stock_adjustment_results,
+    utc_after,
+    utc_now
+)
+
+
+# Correlated subquery embedding an order's lines as a JSON array
+ORDER_ITEMS_JSON = """
+COALESCE((
+    SELECT json_agg(json_build_object(
+        'id', oi.id, 'item_id', oi.item_id, 'item_name', i.name, 'quantity', oi.quantity
+    ) ORDER BY oi.created_at, oi.id)
+    FROM order_items oi
+    JOIN inventory_items i ON i.id = oi.item_id
+    WHERE oi.order_id = orders.id
+), '[]') AS items
+"""
+
+ORDER_ITEMS_QUERY = """
+SELECT oi.id, oi.item_id, i.name AS item_name, oi.quantity
+FROM order_items oi
+JOIN inventory_items i ON i.id = oi.item_id
+WHERE oi.order_id = $1
+ORDER BY oi.created_at, oi.id
+"""
+
+
+def _is_uuid(value: Any) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+
+def _record(record: Optional[asyncpg.Record]) -> Optional[Dict[str, Any]]:
+    """Convert a row to the dictionary shape PostgREST returns (UUIDs and timestamps as strings)."""
+    if record is None:
+        return None
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        row[key] = value
+    return row
+
+
+def _translate_postgres_error(error: asyncpg.PostgresError) -> Exception:
+    """Map a Postgres error to the repository exception contract."""
+    details = {"code": error.sqlstate}
+    if isinstance(error, asyncpg.UniqueViolationError):
+        return ResourceConflictError(str(error), details)
+    if isinstance(error, (asyncpg.IntegrityConstraintViolationError, asyncpg.DataError)):
+        return DatabaseError(str(error), details)
+    return error
+
+
+class InstrumentedConnection:
+    """
+    A pooled connection that records every statement it sends for /metrics.
+
+    Each ``fetch``/``fetchrow``/``fetchval``/``execute`` is one database round
+    trip, so multi-statement operations are counted statement by statement.
+    """
+
+    def __init__(self, conn: asyncpg.Connection, table: str, operation: str):
+        self._conn = conn
+        self.table = table
+        self.operation = operation
+
+    async def _timed(self, method, query: str, args: Tuple[Any, ...]):
+        start = time.perf_counter()
+        try:
+            result = await method(query, *args)
+        except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+            record_db_call(self.table, self.operation, time.perf_counter() - start, failed=True)
+            raise
+        record_db_call(self.table, self.operation, time.perf_counter() - start)
+        return result
+
+    async def fetch(self, query: str, *args: Any) -> List[asyncpg.Record]:
+        return await self._timed(self._conn.fetch, query, args)
+
+    async def fetchrow(self, query: str, *args: Any) -> Optional[asyncpg.Record]:
+        return await self._timed(self._conn.fetchrow, query, args)
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        return await self._timed(self._conn.fetchval, query, args)
+
+    async def execute(self, query: str, *args: Any) -> str:
+        return await self._timed(self._conn.execute, query, args)
+
+
+class PostgresConnection:
+    """A lazily created asyncpg connection pool."""
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int,
+        max_size: int,
+        command_timeout: float,
+        statement_cache_size: int
+    ):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self.statement_cache_size = statement_cache_size
+        self._pool: Optional[asyncpg.Pool] = None
+        self._lock = asyncio.Lock()
+
+    async def pool(self) -> asyncpg.Pool:
+        """Get the connection pool, creating it on first use."""
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        command_timeout=self.command_timeout,
+                        statement_cache_size=self.statement_cache_size
+                    )
+        return self._pool
+
+    @asynccontextmanager
+    async def acquire(self, table: str, operation: str) -> AsyncIterator[InstrumentedConnection]:
+        """
+        Check out a pooled connection for one repository operation.
+
+        Every statement sent on the connection is recorded for /metrics, and
+        constraint violations are translated.
+
+        Args:
+            table: Table name for metrics
+            operation: Operation name for metrics
+        """
+        pool = await self.pool()
+        start = time.perf_counter()
+        try:
+            conn = await pool.acquire()
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+            record_db_call(table, operation, time.perf_counter() - start, failed=True)
+            raise
+        try:
+            yield InstrumentedConnection(conn, table, operation)
+        except asyncpg.PostgresError as e:
+            raise _translate_postgres_error(e)
+        finally:
+            await pool.release(conn)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+async def _insert(conn: InstrumentedConnection, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    columns = ", ".join(data)
+    placeholders = ", ".join(f"${index}" for index in range(1, len(data) + 1))
+    return _record(await conn.fetchrow(
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING *",
+        *data.values()
+    ))
+
+
+async def _update(conn: InstrumentedConnection, table: str, row_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # updated_at is maintained by the update_*_updated_at triggers
+    assignments = ", ".join(f"{column} = ${index}" for index, column in enumerate(data, start=2))
+    return _record(await conn.fetchrow(
+        f"UPDATE {table} SET {assignments} WHERE id = $1 RETURNING *",
+        row_id, *data.values()
+    ))
+
+
+class PostgresUserRepository(UserRepository):
+    """Users stored in Postgres."""
+
+    def __init__(self, db: PostgresConnection):
+        self.db = db
+
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if not _is_uuid(user_id):
+            return None
+        async with self.db.acquire("users", "select") as conn:
+            return _record(await conn.fetchrow("SELECT * FROM users WHERE id = $1", user_id))
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        async with self.db.acquire("users", "select") as conn:
+            return _record(await conn.fetchrow("SELECT * FROM users WHERE email = $1", email))
+
+    async def list_by_status(self, statuses: Sequence[str]) -> List[Dict[str, Any]]:
+        async with self.db.acquire("users", "select") as conn:
+            rows = await conn.fetch("SELECT * FROM users WHERE status = ANY($1::varchar[])", list(statuses))
+        return [_record(row) for row in rows]
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.db.acquire("users", "insert") as conn:
+            return await _insert(conn, "users", data)
+
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not _is_uuid(user_id):
+            return None
+        async with self.db.acquire("users", "update") as conn:
+            return await _update(conn, "users", user_id, data)
+
+    async def delete(self, user_id: str) -> bool:
+        if not _is_uuid(user_id):
+            return False
+        async with self.db.acquire("users", "delete") as conn:
+            result = await conn.execute("DELETE FROM users WHERE id = $1", user_id)
+        return result != "DELETE 0"
+
+
+class PostgresInventoryRepository(InventoryRepository):
+    """Inventory items stored in Postgres."""
+
+    def __init__(self, db: PostgresConnection):
+        self.db = db
+
+    async def list_page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        async with self.db.acquire("inventory_items", "select") as conn:
+            if after is None:
+                rows = await conn.fetch("SELECT * FROM inventory_items ORDER BY name, id LIMIT $1", limit)
+            else:
+                rows = await conn.fetch(
+                    "SELECT * FROM inventory_items WHERE (name, id) > ($1, $2::uuid) ORDER BY name, id LIMIT $3",
+                    after[0], after[1], limit
+                )
+        return [_record(row) for row in rows]
+
+    async def list_low_stock(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # low_stock_items (migration 005) is served by the partial low stock index
+        async with self.db.acquire("low_stock_items", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM low_stock_items($1)", limit)
+        return [_record(row) for row in rows]
+
+    async def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        # search_inventory_items (migration 018) looks terms up through the trigram indexes
+        async with self.db.acquire("search_inventory_items", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM search_inventory_items($1, $2)", query, limit)
+        return [_record(row) for row in rows]
+
+    async def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        if not _is_uuid(item_id):
+            return None
+        async with self.db.acquire("inventory_items", "select") as conn:
+            return _record(await conn.fetchrow("SELECT * FROM inventory_items WHERE id = $1", item_id))
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.db.acquire("inventory_items", "insert") as conn:
+            return await _insert(conn, "inventory_items", data)
+
+    async def update(self, item_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not _is_uuid(item_id):
+            return None
+        async with self.db.acquire("inventory_items", "update") as conn:
+            return await _update(conn, "inventory_items", item_id, data)
+
+    async def upsert_many(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # upsert_inventory_items (migration 017) writes the chunk with one insert ... on conflict
+        async with self.db.acquire("upsert_inventory_items", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM upsert_inventory_items($1::jsonb)", json.dumps(list(items)))
+        return [{"item_id": str(row["item_id"]), "created": row["created"]} for row in rows]
+
+    async def adjust_stock(self, item_id: str, delta: int, reason: Optional[str] = None) -> Dict[str, Any]:
+        [result] = await self.adjust_stock_batch([{"item_id": item_id, "delta": delta, "reason": reason}])
+        return adjusted_item(result, delta)
+
+    async def adjust_stock_batch(self, adjustments: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # apply_stock_adjustments (migration 015) applies every delta with one guarded update
+        async with self.db.acquire("apply_stock_adjustments", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM apply_stock_adjustments($1::jsonb)", json.dumps(list(adjustments)))
+        return stock_adjustment_results(adjustments, [_record(row) for row in rows])
+
+    async def list_movements(
+        self,
+        item_id: str,
+        limit: int,
+        after: Optional[Tuple[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        if not _is_uuid(item_id):
+            return []
+        async with self.db.acquire("inventory_movements", "select") as conn:
+            if after is None:
+                rows = await conn.fetch(
+                    "SELECT * FROM inventory_movements WHERE item_id = $1 "
+                    "ORDER BY created_at DESC, id DESC LIMIT $2",
+                    item_id, limit
+                )
+            else:
+                # Row comparison keeps the scan on idx_inventory_movements_item_id_created_at
+                rows = await conn.fetch(
+                    "SELECT * FROM inventory_movements WHERE item_id = $1 AND (created_at, id) < ($2, $3) "
+                    "ORDER BY created_at DESC, id DESC LIMIT $4",
+                    item_id, datetime.fromisoformat(after[0]), after[1], limit
+                )
+        return [_record(row) for row in rows]
+
+    async def reconcile_balances(
+        self,
+        after: Optional[str],
+        limit: int,
+        apply: bool = False
+    ) -> Dict[str, Any]:
+        # reconcile_inventory_balances (migration 014) compares one batch in SQL
+        async with self.db.acquire("reconcile_inventory_balances", "rpc") as conn:
+            result = await conn.fetchval(
+                "SELECT reconcile_inventory_balances($1::uuid, $2, $3)", after, limit, apply
+            )
+        return json.loads(result)
+
+
+class PostgresOrderRepository(OrderRepository):
+    """Orders and order items stored in Postgres."""
+
+    def __init__(self, db: PostgresConnection):
+        self.db = db
+
+    async def _with_items(self, conn: InstrumentedConnection, order: Optional[asyncpg.Record]) -> Optional[Dict[str, Any]]:
+        if order is None:
+            return None
+        result = _record(order)
+        result["items"] = [_record(row) for row in await conn.fetch(ORDER_ITEMS_QUERY, order["id"])]
+        return result
+
+    async def place_order(
+        self,
+        customer_name: str,
+        created_by: str,
+        items: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        # place_order casts every item ID to UUID; report malformed IDs as
+        # missing items the way the other backends do
+        unknown = [line["item_id"] for line in items if not _is_uuid(line["item_id"])]
+        if unknown:
+            raise InsufficientStockError(
+                "Order cannot be fulfilled due to insufficient inventory",
+                {"errors": [item_not_found_message(item_id) for item_id in dict.fromkeys(unknown)]}
+            )
+
+        # Validation, inserts, stock decrements and the ledger labelling all
+        # run inside the place_order database function (migrations 003/004/014)
+        try:
+            async with self.db.acquire("place_order", "rpc") as conn:
+                result = await conn.fetchval(
+                    "SELECT place_order($1, $2, $3::jsonb)",
+                    customer_name, created_by,
+                    json.dumps([{"item_id": line["item_id"], "quantity": line["quantity"]} for line in items])
+                )
+        except asyncpg.RaiseError as e:
+            if e.hint == "insufficient_stock":
+                raise InsufficientStockError(
+                    "Order cannot be fulfilled due to insufficient inventory",
+                    {"errors": json.loads(e.detail) if e.detail else []}
+                )
+            raise
+        return json.loads(result)
+
+    async def import_orders(self, created_by: str, orders: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Snapshot, validation and batched writes run inside the import_orders
+        # database function (migrations 008/011/014), one round trip per batch
+        async with self.db.acquire("import_orders", "rpc") as conn:
+            result = await conn.fetchval(
+                "SELECT import_orders($1, $2::jsonb)",
+                created_by,
+                json.dumps([
+                    {
+                        "id": order.get("id"),
+                        "customer_name": order["customer_name"],
+                        "items": [{"item_id": line["item_id"], "quantity": line["quantity"]} for line in order["items"]]
+                    }
+                    for order in orders
+                ])
+            )
+        return json.loads(result)
+
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        include_items: bool = False
+    ) -> List[Dict[str, Any]]:
+        if created_by is not None and not _is_uuid(created_by):
+            return []
+
+        conditions, params = [], []
+
+        def bind(value: Any) -> str:
+            params.append(value)
+            return f"${len(params)}"
+
+        if status is not None:
+            conditions.append(f"status = {bind(status)}")
+        if created_by is not None:
+            conditions.append(f"created_by = {bind(created_by)}::uuid")
+        if created_from is not None:
+            conditions.append(f"created_at >= {bind(datetime.fromisoformat(created_from))}")
+        if created_to is not None:
+            conditions.append(f"created_at < {bind(datetime.fromisoformat(created_to))}")
+        if after is not None:
+            # Row comparison keeps the scan on idx_orders_created_at
+            conditions.append(
+                f"(created_at, id) < ({bind(datetime.fromisoformat(after[0]))}, {bind(after[1])}::uuid)"
+            )
+
+        columns = f"*, {ORDER_ITEMS_JSON}" if include_items else "*"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT {columns} FROM orders {where} ORDER BY created_at DESC, id DESC LIMIT {bind(limit)}"
+
+        async with self.db.acquire("orders", "select") as conn:
+            rows = [_record(row) for row in await conn.fetch(sql, *params)]
+        if include_items:
+            for row in rows:
+                row["items"] = json.loads(row["items"])
+        return rows
+
+    async def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        if not _is_uuid(order_id):
+            return None
+        async with self.db.acquire("orders", "select") as conn:
+            return await self._with_items(
+                conn, await conn.fetchrow("SELECT * FROM orders WHERE id = $1", order_id)
+            )
+
+    async def set_status(
+        self,
+        order_id: str,
+        status: str,
+        from_statuses: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        if not _is_uuid(order_id):
+            return None
+        async with self.db.acquire("orders", "update") as conn:
+            return await self._with_items(
+                conn,
+                await conn.fetchrow(
+                    "SELECT * FROM set_order_status($1, $2, $3)",
+                    order_id, status, list(from_statuses) if from_statuses is not None else None
+                )
+            )
+
+    async def transition_statuses(
+        self,
+        order_ids: Sequence[str],
+        status: str,
+        from_statuses: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        order_ids = list(dict.fromkeys(order_ids))
+        async with self.db.acquire("orders", "update") as conn:
+            rows = await conn.fetch(
+                "SELECT * FROM transition_order_statuses($1, $2, $3)",
+                order_ids, status, list(from_statuses)
+            )
+        outcomes = {row["order_id"]: dict(row) for row in rows}
+        return [outcomes[order_id] for order_id in order_ids]
+
+    async def cancel_orders(self, order_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        order_ids = list(dict.fromkeys(order_ids))
+        # cancel_orders (migration 013) cancels and restocks in one transaction
+        async with self.db.acquire("cancel_orders", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM cancel_orders($1)", order_ids)
+        outcomes = {row["order_id"]: dict(row) for row in rows}
+        return [outcomes[order_id] for order_id in order_ids]
+
+    async def picking_list(
+        self,
+        order_ids: Optional[Sequence[str]] = None,
+        status: str = "pending"
+    ) -> List[Dict[str, Any]]:
+        if order_ids is not None:
+            order_ids = [order_id for order_id in order_ids if _is_uuid(order_id)]
+        # order_picking_list (migration 012) groups the lines in one query
+        async with self.db.acquire("order_picking_list", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM order_picking_list($1, $2::uuid[])", status, order_ids)
+        return [
+            {**_record(row), "order_ids": [str(order_id) for order_id in row["order_ids"]]}
+            for row in rows
+        ]
+
+    async def status_timeline(self, order_id: str) -> List[Dict[str, Any]]:
+        if not _is_uuid(order_id):
+            return []
+        async with self.db.acquire("order_status_timeline", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM order_status_timeline($1)", order_id)
+        return [_record(row) for row in rows]
+
+    async def status_durations(
+        self,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        async with self.db.acquire("order_status_durations", "rpc") as conn:
+            rows = await conn.fetch(
+                "SELECT * FROM order_status_durations($1, $2)",
+                datetime.fromisoformat(created_from) if created_from is not None else None,
+                datetime.fromisoformat(created_to) if created_to is not None else None
+            )
+        return [_record(row) for row in rows]
+
+
+class PostgresIdempotencyRepository(IdempotencyRepository):
+    """Idempotency keys stored in Postgres."""
+
+    def __init__(self, db: PostgresConnection):
+        self.db = db
+
+    async def claim(self, scope: str, key: str, request_hash: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+        # claim_idempotency_key (migration 007) inserts or takes over an expired key atomically
+        async with self.db.acquire("claim_idempotency_key", "rpc") as conn:
+            return _record(await conn.fetchrow(
+                "SELECT * FROM claim_idempotency_key($1, $2, $3, $4)",
+                scope, key, request_hash, ttl_seconds
+            ))
+
+    async def complete(self, scope: str, key: str, response: str):
+        async with self.db.acquire("idempotency_keys", "update") as conn:
+            await conn.execute(
+                "UPDATE idempotency_keys SET response = $3 WHERE scope = $1 AND key = $2",
+                scope, key, response
+            )
+
+    async def release(self, scope: str, key: str):
+        async with self.db.acquire("idempotency_keys", "delete") as conn:
+            await conn.execute(
+                "DELETE FROM idempotency_keys WHERE scope = $1 AND key = $2 AND response IS NULL",
+                scope, key
+            )
+
+    async def purge_expired(self) -> int:
+        async with self.db.acquire("idempotency_keys", "delete") as conn:
+            result = await conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= NOW()")
+        return int(result.split()[-1])
+
+
+def _intake_entry(record: Optional[asyncpg.Record]) -> Optional[Dict[str, Any]]:
+    """Convert an order_intake row, decoding its JSONB columns."""
+    entry = _record(record)
+    if entry is not None:
+        entry["payload"] = json.loads(entry["payload"])
+        entry["errors"] = json.loads(entry["errors"]) if entry["errors"] is not None else None
+    return entry
+
+
+class PostgresOrderIntakeRepository(OrderIntakeRepository):
+    """Order intake queue stored in Postgres, claimed with the migration 011 functions."""
+
+    def __init__(self, db: PostgresConnection):
+        self.db = db
+
+    async def enqueue(self, created_by: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.db.acquire("order_intake", "insert") as conn:
+            return _intake_entry(await conn.fetchrow(
+                "INSERT INTO order_intake (created_by, payload) VALUES ($1, $2::jsonb) RETURNING *",
+                created_by, json.dumps(payload)
+            ))
+
+    async def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        if not _is_uuid(entry_id):
+            return None
+        async with self.db.acquire("order_intake", "select") as conn:
+            return _intake_entry(await conn.fetchrow("SELECT * FROM order_intake WHERE id = $1", entry_id))
+
+    async def claim(self, limit: int) -> List[Dict[str, Any]]:
+        async with self.db.acquire("claim_order_intake", "rpc") as conn:
+            rows = await conn.fetch("SELECT * FROM claim_order_intake($1) ORDER BY created_at, id", limit)
+        return [_intake_entry(row) for row in rows]
+
+    async def complete(self, results: Sequence[Dict[str, Any]]):
+        async with self.db.acquire("complete_order_intake", "rpc") as conn:
+            await conn.execute("SELECT complete_order_intake($1::jsonb)", json.dumps(list(results)))
+
+    async def release(self, entry_ids: Sequence[str], max_attempts: int):
+        async with self.db.acquire("release_order_intake", "rpc") as conn:
+            await conn.execute("SELECT release_order_intake($1::uuid[], $2)", list(entry_ids), max_attempts)
+
+    async def recover_stale(self, claim_timeout_seconds: int) -> int:
+        async with self.db.acquire("recover_order_intake", "rpc") as conn:
+            return await conn.fetchval("SELECT recover_order_intake($1)", claim_timeout_seconds)
+
+    async def purge_processed(self, older_than_seconds: int) -> int:
+        async with self.db.acquire("order_intake", "delete") as conn:
+            result = await conn.execute(
+                "DELETE FROM order_intake WHERE processed_at < $1",
+                datetime.fromisoformat(utc_after(-older_than_seconds))
+            )
+        return int(result.split()[-1])
+
+
+class PostgresDataStore(DataStore):
+    """Data backend that connects to Postgres directly through asyncpg."""
+
+    backend_name = "postgres"
+
+    def __init__(self, db: PostgresConnection):
+        self.db = db
+        self.users = PostgresUserRepository(db)
+        self.inventory = PostgresInventoryRepository(db)
+        self.orders = PostgresOrderRepository(db)
+        self.idempotency = PostgresIdempotencyRepository(db)
+        self.intake = PostgresOrderIntakeRepository(db)
+
+    async def health_check(self) -> Dict[str, Any]:
+        try:
+            async with self.db.acquire("version", "rpc") as conn:
+                await conn.fetchval("SELECT version()")
+            return {
+                "healthy": True,
+                "timestamp": utc_now(),
+                "connection_status": "connected",
+                "error": None
+            }
+        except Exception as e:
+            return {
+                "healthy": False,
+                "timestamp": utc_now(),
+                "connection_status": "error",
+                "error": str(e)
+            }
+
+    async def close(self):
+        await self.db.close()
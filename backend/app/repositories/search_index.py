@@ -0,0 +1,203 @@
+"""
+In-process trigram index behind inventory search on the local backends.
+
+Matches and ranks like ``search_inventory_items`` (migration 018): the query
+is lowercased and split on whitespace, an item matches when every term is a
+substring of its name or its description, and matches are ranked by name
+equal to the query, name starting with the query, every term found in the
+name, shorter name, and finally name and ID.
+
+Each ranking tier is read from its own structure, in rank order, so a
+search stops once it has enough results instead of ranking every match:
+
+- names equal to or starting with the query are a range of a sorted list of
+  lowercased names
+- the items that may match the other tiers are those in the rarest trigram
+  posting of the name, or of the name and description, of the query terms;
+  they are checked exactly as they are visited
+- within a tier, items are visited in the static (length, name, ID) order
+
+Postings are arrays of item ordinals, which keeps a catalog of 100k items
+in tens of megabytes. Terms shorter than three characters have no
+trigrams and cannot narrow a tier, so a query made only of them visits
+every item until it has enough results.
+"""
+from array import array
+from itertools import islice
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+import bisect
+
+# Sorts after every character, so (prefix + LAST_CHARACTER,) bounds a prefix range
+LAST_CHARACTER = "\U0010ffff"
+
+# (name length, name, item ID, ordinal): the order within a tier
+OrderKey = Tuple[int, str, str, int]
+
+
+class SearchDocument(NamedTuple):
+    """The indexed text of one item."""
+    name_lower: str
+    description_lower: str
+    order_key: OrderKey
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a search query into lowercased terms."""
+    return query.lower().split()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def _add_postings(postings: Dict[str, array], ordinal: int, text: str):
+    """Add a new item, whose ordinal is the highest yet, to the postings of its text."""
+    for trigram in _trigrams(text):
+        items = postings.get(trigram)
+        if items is None:
+            postings[trigram] = array("I", (ordinal,))
+        else:
+            items.append(ordinal)
+
+
+def _update_postings(postings: Dict[str, array], ordinal: int, old_text: str, new_text: str):
+    """Move an item between postings as its text changes, keeping each sorted."""
+    old, new = _trigrams(old_text), _trigrams(new_text)
+    for trigram in old - new:
+        items = postings[trigram]
+        del items[bisect.bisect_left(items, ordinal)]
+        if not items:
+            del postings[trigram]
+    for trigram in new - old:
+        items = postings.get(trigram)
+        if items is None:
+            postings[trigram] = array("I", (ordinal,))
+        elif items[-1] < ordinal:
+            items.append(ordinal)
+        else:
+            items.insert(bisect.bisect_left(items, ordinal), ordinal)
+
+
+def _rarest(postings: Dict[str, array], terms: List[str]) -> Optional[array]:
+    """The shortest posting among the trigrams of the terms, or None if they have none."""
+    rarest = None
+    for term in terms:
+        for trigram in _trigrams(term):
+            items = postings.get(trigram, array("I"))
+            if rarest is None or len(items) < len(rarest):
+                rarest = items
+    return rarest
+
+
+class TrigramIndex:
+    """
+    Trigram postings over item names and descriptions.
+
+    Not thread safe: the owning repository updates and searches it from the
+    event loop only.
+    """
+
+    def __init__(self):
+        self._ordinals: Dict[str, int] = {}
+        self._documents: Dict[int, SearchDocument] = {}
+        self._name_postings: Dict[str, array] = {}
+        self._description_postings: Dict[str, array] = {}
+        # (lowercased name, ordinal), for the exact and prefix tiers
+        self._names: List[Tuple[str, int]] = []
+        self._order: List[OrderKey] = []
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, item_id: str, name: str, description: Optional[str]):
+        """Index an item, or re-index it if its name or description changed."""
+        ordinal = self._ordinals.setdefault(item_id, len(self._ordinals))
+        previous = self._documents.get(ordinal)
+        document = SearchDocument(name.lower(), (description or "").lower(), (len(name), name, item_id, ordinal))
+        if document == previous:
+            return
+
+        if previous is None:
+            _add_postings(self._name_postings, ordinal, document.name_lower)
+            _add_postings(self._description_postings, ordinal, document.description_lower)
+        else:
+            _update_postings(self._name_postings, ordinal, previous.name_lower, document.name_lower)
+            _update_postings(
+                self._description_postings, ordinal, previous.description_lower, document.description_lower
+            )
+            del self._names[bisect.bisect_left(self._names, (previous.name_lower, ordinal))]
+            del self._order[bisect.bisect_left(self._order, previous.order_key)]
+        bisect.insort(self._names, (document.name_lower, ordinal))
+        bisect.insort(self._order, document.order_key)
+        self._documents[ordinal] = document
+
+    def _in_order(self, ordinals: Optional[Set[int]]) -> Iterator[SearchDocument]:
+        """Yield the given items, or every item when None, in the static order."""
+        documents = self._documents
+        if ordinals is not None and len(ordinals) * 8 < len(self._order):
+            yield from sorted((documents[ordinal] for ordinal in ordinals), key=lambda document: document.order_key)
+            return
+        for order_key in self._order:
+            if ordinals is None or order_key[3] in ordinals:
+                yield documents[order_key[3]]
+
+    def search(self, query: str, limit: int) -> List[str]:
+        """
+        Find the items matching a query.
+
+        Args:
+            query: Search text
+            limit: Maximum number of item IDs to return
+
+        Returns:
+            IDs of the best matching items, best first
+        """
+        terms = search_terms(query)
+        if not terms or limit <= 0:
+            return []
+        phrase = " ".join(terms)
+
+        # Names equal to the query sort first in the range of names starting with it
+        start = bisect.bisect_left(self._names, (phrase,))
+        end = bisect.bisect_left(self._names, (phrase + LAST_CHARACTER,), start)
+        exact = start
+        while exact < end and self._names[exact][0] == phrase:
+            exact += 1
+        documents = self._documents
+        results = sorted(
+            (documents[ordinal] for _, ordinal in self._names[start:exact]),
+            key=lambda document: document.order_key
+        )
+        prefixed = {ordinal for _, ordinal in self._names[exact:end]}
+        results.extend(islice(self._in_order(prefixed), limit - len(results)))
+        seen = prefixed.union(ordinal for _, ordinal in self._names[start:exact])
+
+        # Every term in the name
+        if len(results) < limit:
+            names = _rarest(self._name_postings, terms)
+            for document in self._in_order(set(names) - seen if names is not None else None):
+                if document.order_key[3] not in seen and all(term in document.name_lower for term in terms):
+                    results.append(document)
+                    if len(results) >= limit:
+                        break
+            seen.update(document.order_key[3] for document in results)
+
+        # Each term in the name or the description, narrowed by its rarest term
+        if len(results) < limit:
+            narrowest = None
+            for term in terms:
+                term_names = _rarest(self._name_postings, [term])
+                term_descriptions = _rarest(self._description_postings, [term])
+                if term_names is not None and term_descriptions is not None and (
+                    narrowest is None or len(term_names) + len(term_descriptions) < sum(map(len, narrowest))
+                ):
+                    narrowest = (term_names, term_descriptions)
+            candidates = set(narrowest[0]).union(narrowest[1]) - seen if narrowest is not None else None
+            for document in self._in_order(candidates):
+                if document.order_key[3] not in seen and all(
+                    term in document.name_lower or term in document.description_lower for term in terms
+                ):
+                    results.append(document)
+                    if len(results) >= limit:
+                        break
+        return [document.order_key[2] for document in results[:limit]]
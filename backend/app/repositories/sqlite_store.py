@@ -0,0 +1,1379 @@
+"""
+SQLite implementation of the repository interfaces.
+
+A single connection is driven by one dedicated worker thread, so calls never
+block the event loop and SQLite sees one writer at a time. The schema mirrors
+``migrations/001_create_tables.sql`` including its CHECK, UNIQUE and foreign
+key constraints, and multi-statement operations run in real transactions.
+Requires SQLite 3.35+ for ``RETURNING``.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import sqlite3
+import time
+
+from ..metrics import record_db_call
+from ..utils.exceptions import (
+    DatabaseError,
+    InsufficientStockError,
+    ResourceConflictError,
+    ResourceNotFoundError
+)
+from .base import (
+    DEFAULT_ADMIN,
+    DEFAULT_ADMIN_PASSWORD,
+    ORDER_STATUS_TRANSITIONS,
+    DataStore,
+    IdempotencyRepository,
+    InventoryRepository,
+    OrderIntakeRepository,
+    OrderRepository,
+    UserRepository,
+    aggregate_order_lines,
+    allocate_order_batch,
+    insufficient_stock_message,
+    item_not_found_message,
+    new_id,
+    utc_after,
+    utc_now
+)
+from .search_index import TrigramIndex
+
+
+# IDs bound per IN (...) list, well below SQLite's bound parameter limit
+IN_LIST_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    first_name TEXT CHECK (length(first_name) <= 100),
+    last_name TEXT CHECK (length(last_name) <= 100),
+    email TEXT UNIQUE NOT NULL CHECK (length(email) <= 255),
+    password_hash TEXT CHECK (length(password_hash) <= 255),
+    phone_number TEXT CHECK (length(phone_number) <= 20),
+    emergency_contact_number TEXT CHECK (length(emergency_contact_number) <= 20),
+    role TEXT NOT NULL CHECK (role IN ('admin', 'salesperson', 'warehouse_manager')),
+    status TEXT NOT NULL DEFAULT 'invited' CHECK (status IN ('invited', 'active')),
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS inventory_items (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL CHECK (length(name) <= 255),
+    description TEXT,
+    stock_level INTEGER NOT NULL DEFAULT 0 CHECK (stock_level >= 0),
+    low_stock_threshold INTEGER NOT NULL DEFAULT 0 CHECK (low_stock_threshold >= 0),
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    customer_name TEXT NOT NULL CHECK (length(customer_name) <= 255),
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'fulfilled', 'cancelled')),
+    created_by TEXT NOT NULL REFERENCES users(id) ON DELETE RESTRICT,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS order_items (
+    id TEXT PRIMARY KEY,
+    order_id TEXT NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    item_id TEXT NOT NULL REFERENCES inventory_items(id) ON DELETE RESTRICT,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL CHECK (length(key) <= 255),
+    request_hash TEXT NOT NULL,
+    response TEXT,
+    created_at TEXT,
+    expires_at TEXT NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+
+CREATE TABLE IF NOT EXISTS order_status_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS order_intake (
+    id TEXT PRIMARY KEY,
+    created_by TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'processing', 'created', 'rejected')),
+    order_id TEXT,
+    errors TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    claimed_at TEXT,
+    processed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS inventory_movements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id TEXT NOT NULL REFERENCES inventory_items(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL CHECK (kind IN ('receipt', 'sale', 'adjustment', 'cancellation')),
+    quantity INTEGER NOT NULL,
+    balance INTEGER NOT NULL,
+    reason TEXT CHECK (length(reason) <= 255),
+    created_at TEXT NOT NULL
+);
+
+-- Every write to orders sets created_at/updated_at, which time the events
+CREATE TRIGGER IF NOT EXISTS record_order_created_event
+    AFTER INSERT ON orders
+BEGIN
+    INSERT INTO order_status_events (order_id, status, created_at)
+    VALUES (NEW.id, NEW.status, NEW.created_at);
+END;
+
+CREATE TRIGGER IF NOT EXISTS record_order_status_change_event
+    AFTER UPDATE OF status ON orders
+    WHEN OLD.status IS NOT NEW.status
+BEGIN
+    INSERT INTO order_status_events (order_id, status, created_at)
+    VALUES (NEW.id, NEW.status, NEW.updated_at);
+END;
+
+-- Backfill orders created before the events table existed
+INSERT INTO order_status_events (order_id, status, created_at)
+SELECT o.id, 'pending', o.created_at
+FROM orders o
+WHERE NOT EXISTS (SELECT 1 FROM order_status_events e WHERE e.order_id = o.id);
+
+INSERT INTO order_status_events (order_id, status, created_at)
+SELECT o.id, o.status, o.updated_at
+FROM orders o
+WHERE o.status <> 'pending'
+  AND NOT EXISTS (SELECT 1 FROM order_status_events e WHERE e.order_id = o.id AND e.status = o.status);
+
+-- Backfill an opening balance for items created before the ledger existed
+INSERT INTO inventory_movements (item_id, kind, quantity, balance, created_at)
+SELECT i.id, 'receipt', i.stock_level, i.stock_level, COALESCE(i.updated_at, i.created_at)
+FROM inventory_items i
+WHERE i.stock_level <> 0
+  AND NOT EXISTS (SELECT 1 FROM inventory_movements m WHERE m.item_id = i.id);
+
+CREATE INDEX IF NOT EXISTS idx_users_status ON users(status);
+CREATE INDEX IF NOT EXISTS idx_inventory_items_name ON inventory_items(name, id);
+-- Fails to build, and so to open the database, while names differ only in case
+CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_items_name_lower ON inventory_items(lower(name));
+CREATE INDEX IF NOT EXISTS idx_inventory_items_low_stock
+    ON inventory_items ((stock_level - low_stock_threshold), name)
+    WHERE stock_level <= low_stock_threshold;
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+CREATE INDEX IF NOT EXISTS idx_orders_created_by ON orders(created_by);
+CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items(order_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_item_id ON order_items(item_id);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+CREATE INDEX IF NOT EXISTS idx_order_status_events_order_id_created_at
+    ON order_status_events(order_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_order_status_events_created_at ON order_status_events(created_at);
+CREATE INDEX IF NOT EXISTS idx_order_intake_queued ON order_intake(created_at, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_order_intake_processing ON order_intake(claimed_at) WHERE status = 'processing';
+CREATE INDEX IF NOT EXISTS idx_order_intake_processed_at ON order_intake(processed_at) WHERE processed_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_order_intake_created_by ON order_intake(created_by);
+CREATE INDEX IF NOT EXISTS idx_inventory_movements_item_id_created_at
+    ON inventory_movements(item_id, created_at);
+"""
+
+# CHECK constraints widened since a table was first created: table -> (old, new)
+WIDENED_CHECKS = {
+    "orders": (
+        "CHECK (status IN ('pending', 'processing', 'fulfilled'))",
+        "CHECK (status IN ('pending', 'processing', 'fulfilled', 'cancelled'))"
+    )
+}
+
+# Columns added since a table was first created: table -> {column: definition}
+ADDED_COLUMNS = {
+    "inventory_movements": {"reason": "TEXT CHECK (length(reason) <= 255)"}
+}
+
+# Correlated subquery embedding an order's lines as a JSON array
+ORDER_ITEMS_JSON = """
+(SELECT json_group_array(json_object(
+    'id', oi.id, 'item_id', oi.item_id, 'item_name', i.name, 'quantity', oi.quantity
+))
+FROM order_items oi
+JOIN inventory_items i ON i.id = oi.item_id
+WHERE oi.order_id = orders.id) AS items
+"""
+
+# Line quantities summed per item over the orders bound as one JSON array
+RESTOCK_QUERY = """
+SELECT item_id, SUM(quantity) AS quantity
+FROM order_items
+WHERE order_id IN (SELECT value FROM json_each(?))
+GROUP BY item_id
+"""
+
+ORDER_ITEMS_QUERY = """
+SELECT oi.id, oi.item_id, i.name AS item_name, oi.quantity
+FROM order_items oi
+JOIN inventory_items i ON i.id = oi.item_id
+WHERE oi.order_id = ?
+ORDER BY oi.rowid
+"""
+
+
+def _translate_integrity_error(error: sqlite3.IntegrityError) -> Exception:
+    """Map a SQLite constraint violation to the repository exception contract."""
+    message = str(error)
+    if message.startswith("UNIQUE constraint failed"):
+        return ResourceConflictError(message)
+    return DatabaseError(message)
+
+
+def _row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    return dict(row) if row is not None else None
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    """Run a block in a write transaction, rolling back on any error."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _widen_checks(conn: sqlite3.Connection):
+    """
+    Bring CHECK constraints of tables created by an earlier SCHEMA up to date.
+
+    ``CREATE TABLE IF NOT EXISTS`` leaves existing tables alone, and SQLite
+    cannot alter a constraint. A widened CHECK accepts every row the old one
+    did and does not change the on-disk format, so the stored table
+    definition is rewritten in place, as the SQLite documentation allows for
+    relaxing constraints.
+    """
+    for table, (old, new) in WIDENED_CHECKS.items():
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        if row is None or old not in row["sql"]:
+            continue
+        with _transaction(conn):
+            schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            conn.execute("PRAGMA writable_schema = ON")
+            conn.execute(
+                "UPDATE sqlite_master SET sql = ? WHERE type = 'table' AND name = ?",
+                (row["sql"].replace(old, new), table)
+            )
+            conn.execute(f"PRAGMA schema_version = {schema_version + 1}")
+            conn.execute("PRAGMA writable_schema = OFF")
+
+
+def _add_columns(conn: sqlite3.Connection):
+    """Add columns missing from tables created by an earlier SCHEMA."""
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, definition in columns.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _insert(conn: sqlite3.Connection, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    columns = ", ".join(data)
+    placeholders = ", ".join("?" for _ in data)
+    cursor = conn.execute(
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING *",
+        tuple(data.values())
+    )
+    return dict(cursor.fetchone())
+
+
+def _update(conn: sqlite3.Connection, table: str, row_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    data = {**data, "updated_at": utc_now()}
+    assignments = ", ".join(f"{column} = ?" for column in data)
+    cursor = conn.execute(
+        f"UPDATE {table} SET {assignments} WHERE id = ? RETURNING *",
+        (*data.values(), row_id)
+    )
+    return _row(cursor.fetchone())
+
+
+class SQLiteConnection:
+    """A SQLite connection owned by a single worker thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        # Autocommit mode; transactions are opened explicitly with _transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+        _widen_checks(self._conn)
+        _add_columns(self._conn)
+
+    def _call(self, fn: Callable, args: Tuple[Any, ...]):
+        try:
+            return fn(self._conn, *args)
+        except sqlite3.IntegrityError as e:
+            raise _translate_integrity_error(e)
+        except sqlite3.OperationalError as e:
+            raise DatabaseError(str(e))
+
+    def run_sync(self, fn: Callable, *args):
+        """Run ``fn(conn, *args)`` on the worker thread and wait for it."""
+        return self._executor.submit(self._call, fn, args).result()
+
+    async def run(self, table: str, operation: str, fn: Callable, *args):
+        """
+        Run ``fn(conn, *args)`` on the worker thread.
+
+        Args:
+            table: Table name for metrics
+            operation: Operation name for metrics
+            fn: Callable receiving the connection followed by ``args``
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(self._executor, self._call, fn, args)
+        except Exception:
+            record_db_call(table, operation, time.perf_counter() - start, failed=True)
+            raise
+        record_db_call(table, operation, time.perf_counter() - start)
+        return result
+
+    def close(self):
+        self.run_sync(lambda conn: conn.close())
+        self._executor.shutdown(wait=True)
+
+
+class SQLiteUserRepository(UserRepository):
+    """Users stored in SQLite."""
+
+    def __init__(self, db: SQLiteConnection):
+        self.db = db
+
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self.db.run("users", "select", lambda conn: _row(
+            conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        ))
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return await self.db.run("users", "select", lambda conn: _row(
+            conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+        ))
+
+    async def list_by_status(self, statuses: Sequence[str]) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" for _ in statuses)
+        return await self.db.run("users", "select", lambda conn: [
+            dict(row) for row in conn.execute(
+                f"SELECT * FROM users WHERE status IN ({placeholders})", tuple(statuses)
+            )
+        ])
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = utc_now()
+        row = {"id": new_id(), "created_at": now, "updated_at": now, **data}
+        return await self.db.run("users", "insert", _insert, "users", row)
+
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await self.db.run("users", "update", _update, "users", user_id, data)
+
+    async def delete(self, user_id: str) -> bool:
+        return await self.db.run("users", "delete", lambda conn: (
+            conn.execute("DELETE FROM users WHERE id = ?", (user_id,)).rowcount > 0
+        ))
+
+
+def _record_movements(
+    conn: sqlite3.Connection,
+    kind: str,
+    quantities: Dict[str, int],
+    now: str,
+    reason: Optional[str] = None
+):
+    """
+    Append one ledger movement per item for stock changes just written.
+
+    ``quantities`` maps item IDs to signed changes and is bound as one JSON
+    object; the balance is read back from the updated rows.
+    """
+    conn.execute(
+        """
+        INSERT INTO inventory_movements (item_id, kind, quantity, balance, reason, created_at)
+        SELECT i.id, ?, change.value, i.stock_level, ?, ?
+        FROM json_each(?) AS change
+        JOIN inventory_items i ON i.id = change.key
+        WHERE change.value <> 0
+        """,
+        (kind, reason, now, json.dumps(quantities))
+    )
+
+
+def _search_documents(conn: sqlite3.Connection, item_ids: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Read the searchable text of the given items, or of every item."""
+    if item_ids is None:
+        rows = conn.execute("SELECT id, name, description FROM inventory_items")
+    else:
+        rows = conn.execute(
+            "SELECT id, name, description FROM inventory_items WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(item_ids),)
+        )
+    return [dict(row) for row in rows]
+
+
+def _create_item(conn: sqlite3.Connection, row: Dict[str, Any]) -> Dict[str, Any]:
+    with _transaction(conn):
+        item = _insert(conn, "inventory_items", row)
+        _record_movements(conn, "receipt", {item["id"]: item["stock_level"]}, item["updated_at"])
+    return item
+
+
+def _update_item(conn: sqlite3.Connection, item_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if "stock_level" not in data:
+        return _update(conn, "inventory_items", item_id, data)
+    with _transaction(conn):
+        current = conn.execute("SELECT stock_level FROM inventory_items WHERE id = ?", (item_id,)).fetchone()
+        item = _update(conn, "inventory_items", item_id, data)
+        if item is not None:
+            _record_movements(
+                conn, "adjustment", {item_id: item["stock_level"] - current["stock_level"]}, item["updated_at"]
+            )
+    return item
+
+
+def _upsert_items(conn: sqlite3.Connection, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Update the items matched by name regardless of case and insert the rest,
+    one statement each.
+
+    The chunk is bound as one JSON array, so the lookup, update, insert and
+    ledger writes cost the same number of statements whatever its size.
+    Names are compared with SQLite's lower(), like the unique index.
+    """
+    now = utc_now()
+    with _transaction(conn):
+        # Keyed by position in the chunk, so Python never has to fold case
+        existing = {
+            row["position"]: dict(row)
+            for row in conn.execute(
+                """
+                SELECT r.key AS position, i.id, i.stock_level
+                FROM json_each(?) AS r
+                JOIN inventory_items i ON lower(i.name) = lower(r.value)
+                """,
+                (json.dumps([item["name"] for item in items]),)
+            )
+        }
+        item_ids = [
+            existing[position]["id"] if position in existing else new_id()
+            for position in range(len(items))
+        ]
+        updates = [{**item, "id": item_ids[position]} for position, item in enumerate(items) if position in existing]
+        inserts = [{**item, "id": item_ids[position]} for position, item in enumerate(items) if position not in existing]
+
+        conn.execute(
+            """
+            UPDATE inventory_items
+            SET description = COALESCE(json_extract(u.value, '$.description'), description),
+                stock_level = json_extract(u.value, '$.stock_level'),
+                low_stock_threshold = json_extract(u.value, '$.low_stock_threshold'),
+                updated_at = ?
+            FROM json_each(?) AS u
+            WHERE inventory_items.id = json_extract(u.value, '$.id')
+            """,
+            (now, json.dumps(updates))
+        )
+        conn.execute(
+            """
+            INSERT INTO inventory_items (id, name, description, stock_level, low_stock_threshold, created_at, updated_at)
+            SELECT json_extract(value, '$.id'), json_extract(value, '$.name'), json_extract(value, '$.description'),
+                   json_extract(value, '$.stock_level'), json_extract(value, '$.low_stock_threshold'), ?, ?
+            FROM json_each(?)
+            """,
+            (now, now, json.dumps(inserts))
+        )
+        _record_movements(conn, "receipt", {item["id"]: item["stock_level"] for item in inserts}, now)
+        _record_movements(conn, "adjustment", {
+            item_ids[position]: item["stock_level"] - existing[position]["stock_level"]
+            for position, item in enumerate(items) if position in existing
+        }, now)
+
+    return [
+        {"item_id": item_ids[position], "created": position not in existing}
+        for position in range(len(items))
+    ]
+
+
+def _adjust_stock(
+    conn: sqlite3.Connection,
+    item_id: str,
+    delta: int,
+    kind: str = "adjustment",
+    reason: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Guarded stock update; the WHERE clause makes check-and-write one statement.
+
+    Records the movement too, so callers run it inside a transaction.
+    """
+    row = conn.execute(
+        """
+        UPDATE inventory_items
+        SET stock_level = stock_level + ?, updated_at = ?
+        WHERE id = ? AND stock_level + ? >= 0
+        RETURNING *
+        """,
+        (delta, utc_now(), item_id, delta)
+    ).fetchone()
+    if row is not None:
+        _record_movements(conn, kind, {item_id: delta}, row["updated_at"], reason)
+        return dict(row)
+
+    item = conn.execute("SELECT name, stock_level FROM inventory_items WHERE id = ?", (item_id,)).fetchone()
+    if item is None:
+        raise ResourceNotFoundError("Inventory item not found", {"item_id": item_id})
+    raise InsufficientStockError(
+        insufficient_stock_message(item["name"], -delta, item["stock_level"]),
+        {"item_id": item_id, "requested": -delta, "available": item["stock_level"]}
+    )
+
+
+def _adjust_item_stock(conn: sqlite3.Connection, item_id: str, delta: int, reason: Optional[str]) -> Dict[str, Any]:
+    with _transaction(conn):
+        return _adjust_stock(conn, item_id, delta, reason=reason)
+
+
+def _adjust_stock_batch(conn: sqlite3.Connection, adjustments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply many guarded deltas with one ``UPDATE ... FROM``, recording their movements.
+
+    The adjustments are bound as one JSON array, so the update, the ledger
+    insert and the read-back are three statements whatever the batch size.
+    """
+    now = utc_now()
+    payload = json.dumps(adjustments)
+    with _transaction(conn):
+        applied = {
+            row["id"]: dict(row)
+            for row in conn.execute(
+                """
+                UPDATE inventory_items
+                SET stock_level = stock_level + r.delta, updated_at = ?
+                FROM (
+                    SELECT json_extract(value, '$.item_id') AS item_id, json_extract(value, '$.delta') AS delta
+                    FROM json_each(?)
+                ) AS r
+                WHERE inventory_items.id = r.item_id AND inventory_items.stock_level + r.delta >= 0
+                RETURNING *
+                """,
+                (now, payload)
+            )
+        }
+        conn.execute(
+            """
+            INSERT INTO inventory_movements (item_id, kind, quantity, balance, reason, created_at)
+            SELECT i.id, 'adjustment', json_extract(a.value, '$.delta'), i.stock_level,
+                   json_extract(a.value, '$.reason'), ?
+            FROM json_each(?) AS a
+            JOIN inventory_items i ON i.id = json_extract(a.value, '$.item_id')
+            WHERE json_extract(a.value, '$.delta') <> 0
+            """,
+            (now, json.dumps([a for a in adjustments if a["item_id"] in applied]))
+        )
+        rejected = {
+            row["id"]: dict(row)
+            for row in conn.execute(
+                "SELECT * FROM inventory_items WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps([a["item_id"] for a in adjustments if a["item_id"] not in applied]),)
+            )
+        }
+
+    results = {}
+    for adjustment in adjustments:
+        item_id = adjustment["item_id"]
+        if item_id not in results:
+            results[item_id] = {
+                "item_id": item_id,
+                "applied": item_id in applied,
+                "item": applied.get(item_id) or rejected.get(item_id)
+            }
+    return list(results.values())
+
+
+def _reconcile_balances(
+    conn: sqlite3.Connection,
+    after: Optional[str],
+    limit: int,
+    apply: bool
+) -> Dict[str, Any]:
+    """Compare a batch of stock levels with their ledger sums and correct drift in one transaction."""
+    with _transaction(conn):
+        rows = conn.execute(
+            """
+            SELECT
+                i.id AS item_id,
+                i.name,
+                i.stock_level,
+                (SELECT COALESCE(SUM(m.quantity), 0) FROM inventory_movements m WHERE m.item_id = i.id) AS ledger_balance
+            FROM inventory_items i
+            WHERE i.id > ?
+            ORDER BY i.id
+            LIMIT ?
+            """,
+            (after or "", limit)
+        ).fetchall()
+        drift = [
+            {**dict(row), "corrected": apply and row["ledger_balance"] >= 0}
+            for row in rows
+            if row["stock_level"] != row["ledger_balance"]
+        ]
+        now = utc_now()
+        conn.executemany(
+            "UPDATE inventory_items SET stock_level = ?, updated_at = ? WHERE id = ?",
+            [(row["ledger_balance"], now, row["item_id"]) for row in drift if row["corrected"]]
+        )
+    return {"scanned": len(rows), "last_item_id": rows[-1]["item_id"] if rows else None, "drift": drift}
+
+
+class SQLiteInventoryRepository(InventoryRepository):
+    """
+    Inventory items stored in SQLite.
+
+    Search is served by an in-process trigram index over names and
+    descriptions, loaded when the repository is created and updated after
+    every write that changes them, so a search reads only the matching rows.
+    """
+
+    def __init__(self, db: SQLiteConnection):
+        self.db = db
+        self.search_index = TrigramIndex()
+        self._index(db.run_sync(_search_documents, None))
+
+    def _index(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            self.search_index.add(row["id"], row["name"], row["description"])
+
+    async def list_page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        if after is None:
+            sql, params = "SELECT * FROM inventory_items ORDER BY name, id LIMIT ?", (limit,)
+        else:
+            # Row value comparison walks idx_inventory_items_name from the last seen key
+            sql = "SELECT * FROM inventory_items WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?"
+            params = (after[0], after[1], limit)
+        return await self.db.run("inventory_items", "select", lambda conn: [
+            dict(row) for row in conn.execute(sql, params)
+        ])
+
+    async def list_low_stock(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await self.db.run("inventory_items", "select", lambda conn: [
+            dict(row) for row in conn.execute(
+                """
+                SELECT * FROM inventory_items
+                WHERE stock_level <= low_stock_threshold
+                ORDER BY stock_level - low_stock_threshold, name
+                LIMIT ?
+                """,
+                (limit if limit is not None else -1,)
+            )
+        ])
+
+    async def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        item_ids = self.search_index.search(query, limit)
+        if not item_ids:
+            return []
+        rows = await self.db.run("inventory_items", "select", lambda conn: {
+            row["id"]: dict(row) for row in conn.execute(
+                "SELECT * FROM inventory_items WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(item_ids),)
+            )
+        })
+        return [rows[item_id] for item_id in item_ids if item_id in rows]
+
+    async def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return await self.db.run("inventory_items", "select", lambda conn: _row(
+            conn.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,)).fetchone()
+        ))
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = utc_now()
+        row = {"id": new_id(), "created_at": now, "updated_at": now, **data}
+        item = await self.db.run("inventory_items", "insert", _create_item, row)
+        self.search_index.add(item["id"], item["name"], item["description"])
+        return item
+
+    async def update(self, item_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        item = await self.db.run("inventory_items", "update", _update_item, item_id, data)
+        if item is not None and ("name" in data or "description" in data):
+            self.search_index.add(item["id"], item["name"], item["description"])
+        return item
+
+    async def upsert_many(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = await self.db.run("inventory_items", "upsert", _upsert_items, list(items))
+        # Updated items keep their stored name, so index what was written
+        changed = [
+            result["item_id"] for result, item in zip(results, items)
+            if result["created"] or item.get("description") is not None
+        ]
+        if changed:
+            self._index(await self.db.run("inventory_items", "select", _search_documents, changed))
+        return results
+
+    async def adjust_stock(self, item_id: str, delta: int, reason: Optional[str] = None) -> Dict[str, Any]:
+        return await self.db.run("inventory_items", "update", _adjust_item_stock, item_id, delta, reason)
+
+    async def adjust_stock_batch(self, adjustments: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self.db.run("inventory_items", "update", _adjust_stock_batch, list(adjustments))
+
+    async def list_movements(
+        self,
+        item_id: str,
+        limit: int,
+        after: Optional[Tuple[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        if after is None:
+            sql = "SELECT * FROM inventory_movements WHERE item_id = ? ORDER BY created_at DESC, id DESC LIMIT ?"
+            params = (item_id, limit)
+        else:
+            # Row value comparison walks idx_inventory_movements_item_id_created_at backwards
+            sql = (
+                "SELECT * FROM inventory_movements WHERE item_id = ? AND (created_at, id) < (?, ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?"
+            )
+            params = (item_id, after[0], after[1], limit)
+        return await self.db.run("inventory_movements", "select", lambda conn: [
+            dict(row) for row in conn.execute(sql, params)
+        ])
+
+    async def reconcile_balances(
+        self,
+        after: Optional[str],
+        limit: int,
+        apply: bool = False
+    ) -> Dict[str, Any]:
+        return await self.db.run("inventory_items", "reconcile", _reconcile_balances, after, limit, apply)
+
+
+def _order_with_items(conn: sqlite3.Connection, order: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    if order is None:
+        return None
+    order = dict(order)
+    order["items"] = [dict(row) for row in conn.execute(ORDER_ITEMS_QUERY, (order["id"],))]
+    return order
+
+
+# Order lines summed per item; the selected orders are bound as one JSON
+# array so any number of IDs fits in a single statement
+PICKING_LIST_QUERY = """
+SELECT
+    oi.item_id,
+    i.name AS item_name,
+    i.stock_level,
+    SUM(oi.quantity) AS quantity,
+    json_group_array(DISTINCT oi.order_id) AS order_ids
+FROM order_items oi
+JOIN orders o ON o.id = oi.order_id
+JOIN inventory_items i ON i.id = oi.item_id
+WHERE {condition}
+GROUP BY oi.item_id
+ORDER BY i.name, oi.item_id
+"""
+
+STATUS_TIMELINE_QUERY = """
+SELECT
+    status,
+    created_at AS entered_at,
+    LEAD(created_at) OVER w AS left_at,
+    ROUND((julianday(LEAD(created_at) OVER w) - julianday(created_at)) * 86400.0, 3) AS duration_seconds
+FROM order_status_events
+WHERE order_id = ?
+WINDOW w AS (ORDER BY created_at, id)
+ORDER BY created_at, id
+"""
+
+
+def _status_durations(
+    conn: sqlite3.Connection,
+    created_from: Optional[str],
+    created_to: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Time-in-status aggregates with nearest-rank percentiles, computed in one query."""
+    conditions, params = [], []
+    if created_from is not None:
+        conditions.append("created_at >= ?")
+        params.append(created_from)
+    if created_to is not None:
+        conditions.append("created_at < ?")
+        params.append(created_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
+        WITH scoped AS (
+            SELECT DISTINCT order_id FROM order_status_events {where}
+        ), periods AS (
+            SELECT
+                e.status,
+                e.created_at,
+                (julianday(LEAD(e.created_at) OVER w) - julianday(e.created_at)) * 86400.0 AS seconds
+            FROM order_status_events e
+            JOIN scoped s ON s.order_id = e.order_id
+            WINDOW w AS (PARTITION BY e.order_id ORDER BY e.created_at, e.id)
+        ), ranked AS (
+            SELECT
+                status,
+                seconds,
+                ROW_NUMBER() OVER (PARTITION BY status ORDER BY seconds IS NULL, seconds) AS position,
+                COUNT(seconds) OVER (PARTITION BY status) AS total
+            FROM periods {where}
+        )
+        SELECT
+            status,
+            COUNT(seconds) AS completed,
+            COUNT(*) - COUNT(seconds) AS current,
+            ROUND(AVG(seconds), 3) AS avg_seconds,
+            ROUND(MIN(CASE WHEN seconds IS NOT NULL AND position >= 0.5 * total THEN seconds END), 3) AS p50_seconds,
+            ROUND(MIN(CASE WHEN seconds IS NOT NULL AND position >= 0.9 * total THEN seconds END), 3) AS p90_seconds,
+            ROUND(MAX(seconds), 3) AS max_seconds
+        FROM ranked
+        GROUP BY status
+    """
+    return [dict(row) for row in conn.execute(query, params * 2)]
+
+
+def _place_order(
+    conn: sqlite3.Connection,
+    customer_name: str,
+    created_by: str,
+    items: Sequence[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Validate, decrement stock and insert the order in one transaction."""
+    with _transaction(conn):
+        errors = []
+        for item_id, quantity in aggregate_order_lines(items).items():
+            try:
+                _adjust_stock(conn, item_id, -quantity, "sale")
+            except ResourceNotFoundError:
+                errors.append(item_not_found_message(item_id))
+            except InsufficientStockError as e:
+                errors.append(e.message)
+        if errors:
+            raise InsufficientStockError(
+                "Order cannot be fulfilled due to insufficient inventory",
+                {"errors": errors}
+            )
+
+        now = utc_now()
+        order = _insert(conn, "orders", {
+            "id": new_id(),
+            "customer_name": customer_name,
+            "status": "pending",
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now
+        })
+        conn.executemany(
+            "INSERT INTO order_items (id, order_id, item_id, quantity, created_at) VALUES (?, ?, ?, ?, ?)",
+            [(new_id(), order["id"], line["item_id"], line["quantity"], now) for line in items]
+        )
+        return _order_with_items(conn, order)
+
+
+def _import_orders(
+    conn: sqlite3.Connection,
+    created_by: str,
+    orders: Sequence[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Validate a batch of orders against one stock snapshot and write it with batched statements."""
+    item_ids = sorted({line["item_id"] for order in orders for line in order["items"]})
+    with _transaction(conn):
+        stock = {}
+        for start in range(0, len(item_ids), IN_LIST_CHUNK):
+            chunk = item_ids[start:start + IN_LIST_CHUNK]
+            rows = conn.execute(
+                f"SELECT id, name, stock_level FROM inventory_items WHERE id IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            )
+            for row in rows:
+                stock[row["id"]] = {"name": row["name"], "stock_level": row["stock_level"]}
+
+        results, taken = allocate_order_batch(orders, stock)
+
+        now = utc_now()
+        conn.executemany(
+            "UPDATE inventory_items SET stock_level = stock_level - ?, updated_at = ? WHERE id = ?",
+            [(quantity, now, item_id) for item_id, quantity in taken.items()]
+        )
+        _record_movements(conn, "sale", {item_id: -quantity for item_id, quantity in taken.items()}, now)
+        accepted = [
+            (result["order_id"], order)
+            for order, result in zip(orders, results)
+            if result["status"] == "created"
+        ]
+        conn.executemany(
+            "INSERT INTO orders (id, customer_name, status, created_by, created_at, updated_at) "
+            "VALUES (?, ?, 'pending', ?, ?, ?)",
+            [(order_id, order["customer_name"], created_by, now, now) for order_id, order in accepted]
+        )
+        conn.executemany(
+            "INSERT INTO order_items (id, order_id, item_id, quantity, created_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (new_id(), order_id, line["item_id"], line["quantity"], now)
+                for order_id, order in accepted
+                for line in order["items"]
+            ]
+        )
+    return results
+
+
+def _cancel_orders(conn: sqlite3.Connection, order_ids: List[str]) -> List[Dict[str, Any]]:
+    """Cancel the cancellable orders and restock all their lines with one UPDATE ... FROM, in one transaction."""
+    now = utc_now()
+    with _transaction(conn):
+        previous = {
+            row["id"]: row["status"]
+            for row in conn.execute(
+                "SELECT id, status FROM orders WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(order_ids),)
+            )
+        }
+        cancelled = json.dumps([
+            order_id for order_id in order_ids
+            if previous.get(order_id) in ORDER_STATUS_TRANSITIONS["cancelled"]
+        ])
+        conn.execute(
+            f"""
+            UPDATE inventory_items
+            SET stock_level = stock_level + restock.quantity, updated_at = ?
+            FROM ({RESTOCK_QUERY}) AS restock
+            WHERE inventory_items.id = restock.item_id
+            """,
+            (now, cancelled)
+        )
+        conn.execute(
+            f"""
+            INSERT INTO inventory_movements (item_id, kind, quantity, balance, created_at)
+            SELECT restock.item_id, 'cancellation', restock.quantity, i.stock_level, ?
+            FROM ({RESTOCK_QUERY}) AS restock
+            JOIN inventory_items i ON i.id = restock.item_id
+            """,
+            (now, cancelled)
+        )
+        updated = {
+            row["id"]
+            for row in conn.execute(
+                "UPDATE orders SET status = 'cancelled', updated_at = ? "
+                "WHERE id IN (SELECT value FROM json_each(?)) RETURNING id",
+                (now, cancelled)
+            )
+        }
+    return [
+        {"order_id": order_id, "previous_status": previous.get(order_id), "updated": order_id in updated}
+        for order_id in order_ids
+    ]
+
+
+def _transition_statuses(
+    conn: sqlite3.Connection,
+    order_ids: List[str],
+    status: str,
+    from_statuses: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """Read the current statuses and apply a guarded set-based update in one transaction."""
+    previous: Dict[str, str] = {}
+    updated = set()
+    now = utc_now()
+    guard = ", ".join("?" for _ in from_statuses)
+    with _transaction(conn):
+        for start in range(0, len(order_ids), IN_LIST_CHUNK):
+            chunk = order_ids[start:start + IN_LIST_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            for row in conn.execute(f"SELECT id, status FROM orders WHERE id IN ({placeholders})", chunk):
+                previous[row["id"]] = row["status"]
+            rows = conn.execute(
+                f"UPDATE orders SET status = ?, updated_at = ? "
+                f"WHERE id IN ({placeholders}) AND status IN ({guard}) RETURNING id",
+                (status, now, *chunk, *from_statuses)
+            )
+            updated.update(row["id"] for row in rows)
+    return [
+        {"order_id": order_id, "previous_status": previous.get(order_id), "updated": order_id in updated}
+        for order_id in order_ids
+    ]
+
+
+class SQLiteOrderRepository(OrderRepository):
+    """Orders and order items stored in SQLite."""
+
+    def __init__(self, db: SQLiteConnection):
+        self.db = db
+
+    async def place_order(
+        self,
+        customer_name: str,
+        created_by: str,
+        items: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return await self.db.run("orders", "insert", _place_order, customer_name, created_by, items)
+
+    async def import_orders(self, created_by: str, orders: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self.db.run("orders", "import", _import_orders, created_by, orders)
+
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        include_items: bool = False
+    ) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if created_by is not None:
+            conditions.append("created_by = ?")
+            params.append(created_by)
+        if created_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            conditions.append("created_at < ?")
+            params.append(created_to)
+        if after is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+
+        columns = f"*, {ORDER_ITEMS_JSON}" if include_items else "*"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT {columns} FROM orders {where} ORDER BY created_at DESC, id DESC LIMIT ?"
+
+        def list_page(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            rows = [dict(row) for row in conn.execute(sql, (*params, limit))]
+            if include_items:
+                for row in rows:
+                    row["items"] = json.loads(row["items"])
+            return rows
+
+        return await self.db.run("orders", "select", list_page)
+
+    async def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        return await self.db.run("orders", "select", lambda conn: _order_with_items(
+            conn, conn.execute("SELECT * FROM orders WHERE id = ?", (order_id,)).fetchone()
+        ))
+
+    async def set_status(
+        self,
+        order_id: str,
+        status: str,
+        from_statuses: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        def set_status(conn: sqlite3.Connection):
+            query = "UPDATE orders SET status = ?, updated_at = ? WHERE id = ?"
+            params: List[Any] = [status, utc_now(), order_id]
+            if from_statuses is not None:
+                query += f" AND status IN ({', '.join('?' for _ in from_statuses)})"
+                params.extend(from_statuses)
+            order = conn.execute(query + " RETURNING *", params).fetchone()
+            return _order_with_items(conn, order)
+
+        return await self.db.run("orders", "update", set_status)
+
+    async def transition_statuses(
+        self,
+        order_ids: Sequence[str],
+        status: str,
+        from_statuses: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        return await self.db.run(
+            "orders", "update", _transition_statuses, list(dict.fromkeys(order_ids)), status, from_statuses
+        )
+
+    async def cancel_orders(self, order_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        return await self.db.run("orders", "update", _cancel_orders, list(dict.fromkeys(order_ids)))
+
+    async def picking_list(
+        self,
+        order_ids: Optional[Sequence[str]] = None,
+        status: str = "pending"
+    ) -> List[Dict[str, Any]]:
+        if order_ids is None:
+            query = PICKING_LIST_QUERY.format(condition="o.status = ?")
+            params: Tuple[Any, ...] = (status,)
+        else:
+            query = PICKING_LIST_QUERY.format(condition="o.id IN (SELECT value FROM json_each(?))")
+            params = (json.dumps(list(order_ids)),)
+
+        rows = await self.db.run("order_items", "select", lambda conn: conn.execute(query, params).fetchall())
+        results = []
+        for row in rows:
+            line = dict(row)
+            line["order_ids"] = sorted(json.loads(line["order_ids"]))
+            results.append(line)
+        return results
+
+    async def status_timeline(self, order_id: str) -> List[Dict[str, Any]]:
+        return await self.db.run(
+            "order_status_events", "select",
+            lambda conn: [dict(row) for row in conn.execute(STATUS_TIMELINE_QUERY, (order_id,))]
+        )
+
+    async def status_durations(
+        self,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await self.db.run("order_status_events", "select", _status_durations, created_from, created_to)
+
+
+def _claim_idempotency_key(
+    conn: sqlite3.Connection,
+    scope: str,
+    key: str,
+    request_hash: str,
+    ttl_seconds: int
+) -> Optional[Dict[str, Any]]:
+    """Insert the key, or take it over if expired; mirrors claim_idempotency_key (migration 007)."""
+    now = utc_now()
+    cursor = conn.execute(
+        """
+        INSERT INTO idempotency_keys (scope, key, request_hash, response, created_at, expires_at)
+        VALUES (?, ?, ?, NULL, ?, ?)
+        ON CONFLICT (scope, key) DO UPDATE
+            SET request_hash = excluded.request_hash,
+                response = NULL,
+                created_at = excluded.created_at,
+                expires_at = excluded.expires_at
+            WHERE idempotency_keys.expires_at <= ?
+        """,
+        (scope, key, request_hash, now, utc_after(ttl_seconds), now)
+    )
+    if cursor.rowcount > 0:
+        return None
+    return _row(conn.execute(
+        "SELECT * FROM idempotency_keys WHERE scope = ? AND key = ?", (scope, key)
+    ).fetchone())
+
+
+class SQLiteIdempotencyRepository(IdempotencyRepository):
+    """Idempotency keys stored in SQLite."""
+
+    def __init__(self, db: SQLiteConnection):
+        self.db = db
+
+    async def claim(self, scope: str, key: str, request_hash: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+        return await self.db.run(
+            "idempotency_keys", "upsert", _claim_idempotency_key, scope, key, request_hash, ttl_seconds
+        )
+
+    async def complete(self, scope: str, key: str, response: str):
+        await self.db.run("idempotency_keys", "update", lambda conn: conn.execute(
+            "UPDATE idempotency_keys SET response = ? WHERE scope = ? AND key = ?",
+            (response, scope, key)
+        ))
+
+    async def release(self, scope: str, key: str):
+        await self.db.run("idempotency_keys", "delete", lambda conn: conn.execute(
+            "DELETE FROM idempotency_keys WHERE scope = ? AND key = ? AND response IS NULL",
+            (scope, key)
+        ))
+
+    async def purge_expired(self) -> int:
+        return await self.db.run("idempotency_keys", "delete", lambda conn: conn.execute(
+            "DELETE FROM idempotency_keys WHERE expires_at <= ?", (utc_now(),)
+        ).rowcount)
+
+
+def _intake_entry(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    """Decode the JSON columns of an order_intake row."""
+    entry = _row(row)
+    if entry is not None:
+        entry["payload"] = json.loads(entry["payload"])
+        entry["errors"] = json.loads(entry["errors"]) if entry["errors"] is not None else None
+    return entry
+
+
+def _release_intake(conn: sqlite3.Connection, entry_ids: Sequence[str], max_attempts: int):
+    """Requeue claimed entries, or reject those out of attempts, in one transaction."""
+    now = utc_now()
+    with _transaction(conn):
+        for start in range(0, len(entry_ids), IN_LIST_CHUNK):
+            chunk = list(entry_ids[start:start + IN_LIST_CHUNK])
+            conn.execute(
+                f"""
+                UPDATE order_intake
+                SET status = CASE WHEN attempts >= ? THEN 'rejected' ELSE 'queued' END,
+                    errors = CASE WHEN attempts >= ?
+                        THEN json_array('Order could not be processed after ' || attempts || ' attempts')
+                    END,
+                    claimed_at = CASE WHEN attempts >= ? THEN claimed_at END,
+                    processed_at = CASE WHEN attempts >= ? THEN ? END
+                WHERE id IN ({', '.join('?' for _ in chunk)}) AND status = 'processing'
+                """,
+                (max_attempts, max_attempts, max_attempts, max_attempts, now, *chunk)
+            )
+
+
+def _recover_stale_intake(conn: sqlite3.Connection, claim_timeout_seconds: int) -> int:
+    """Resolve entries whose claim timed out: created if their order exists, else queued again."""
+    cutoff = utc_after(-claim_timeout_seconds)
+    with _transaction(conn):
+        created = conn.execute(
+            """
+            UPDATE order_intake
+            SET status = 'created', order_id = id, processed_at = ?
+            WHERE status = 'processing' AND claimed_at < ?
+              AND EXISTS (SELECT 1 FROM orders WHERE orders.id = order_intake.id)
+            """,
+            (utc_now(), cutoff)
+        ).rowcount
+        queued = conn.execute(
+            "UPDATE order_intake SET status = 'queued', claimed_at = NULL "
+            "WHERE status = 'processing' AND claimed_at < ?",
+            (cutoff,)
+        ).rowcount
+    return created + queued
+
+
+class SQLiteOrderIntakeRepository(OrderIntakeRepository):
+    """Order intake queue stored in SQLite; entries survive restarts."""
+
+    def __init__(self, db: SQLiteConnection):
+        self.db = db
+
+    async def enqueue(self, created_by: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        row = {
+            "id": new_id(),
+            "created_by": created_by,
+            "payload": json.dumps(payload),
+            "status": "queued",
+            "created_at": utc_now()
+        }
+        return await self.db.run("order_intake", "insert", lambda conn: _intake_entry(
+            conn.execute(
+                "INSERT INTO order_intake (id, created_by, payload, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?) RETURNING *",
+                tuple(row.values())
+            ).fetchone()
+        ))
+
+    async def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        return await self.db.run("order_intake", "select", lambda conn: _intake_entry(
+            conn.execute("SELECT * FROM order_intake WHERE id = ?", (entry_id,)).fetchone()
+        ))
+
+    async def claim(self, limit: int) -> List[Dict[str, Any]]:
+        rows = await self.db.run("order_intake", "update", lambda conn: conn.execute(
+            """
+            UPDATE order_intake
+            SET status = 'processing', claimed_at = ?, attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM order_intake
+                WHERE status = 'queued'
+                ORDER BY created_at, id
+                LIMIT ?
+            )
+            RETURNING *
+            """,
+            (utc_now(), limit)
+        ).fetchall())
+        # RETURNING does not follow the subquery's order
+        return sorted((_intake_entry(row) for row in rows), key=lambda entry: (entry["created_at"], entry["id"]))
+
+    async def complete(self, results: Sequence[Dict[str, Any]]):
+        now = utc_now()
+
+        def complete(conn: sqlite3.Connection):
+            with _transaction(conn):
+                conn.executemany(
+                    "UPDATE order_intake SET status = ?, order_id = ?, errors = ?, processed_at = ? "
+                    "WHERE id = ? AND status = 'processing'",
+                    [
+                        (
+                            result["status"],
+                            result["id"] if result["status"] == "created" else None,
+                            json.dumps(result["errors"]) if result.get("errors") is not None else None,
+                            now,
+                            result["id"]
+                        )
+                        for result in results
+                    ]
+                )
+
+        await self.db.run("order_intake", "update", complete)
+
+    async def release(self, entry_ids: Sequence[str], max_attempts: int):
+        await self.db.run("order_intake", "update", _release_intake, entry_ids, max_attempts)
+
+    async def recover_stale(self, claim_timeout_seconds: int) -> int:
+        return await self.db.run("order_intake", "update", _recover_stale_intake, claim_timeout_seconds)
+
+    async def purge_processed(self, older_than_seconds: int) -> int:
+        return await self.db.run("order_intake", "delete", lambda conn: conn.execute(
+            "DELETE FROM order_intake WHERE processed_at < ?", (utc_after(-older_than_seconds),)
+        ).rowcount)
+
+
+class SQLiteDataStore(DataStore):
+    """Data backend backed by a local SQLite database file."""
+
+    backend_name = "sqlite"
+
+    def __init__(self, path: str, seed_admin: bool = True):
+        self.db = SQLiteConnection(path)
+        self.users = SQLiteUserRepository(self.db)
+        self.inventory = SQLiteInventoryRepository(self.db)
+        self.orders = SQLiteOrderRepository(self.db)
+        self.idempotency = SQLiteIdempotencyRepository(self.db)
+        self.intake = SQLiteOrderIntakeRepository(self.db)
+        if seed_admin:
+            self.db.run_sync(self._seed_default_admin)
+
+    @staticmethod
+    def _seed_default_admin(conn: sqlite3.Connection):
+        """Create the default admin account if missing, mirroring 002_seed_data.sql."""
+        from ..auth.password import hash_password
+
+        if conn.execute("SELECT 1 FROM users WHERE email = ?", (DEFAULT_ADMIN["email"],)).fetchone():
+            return
+        now = utc_now()
+        _insert(conn, "users", {
+            "id": new_id(),
+            **DEFAULT_ADMIN,
+            "password_hash": hash_password(DEFAULT_ADMIN_PASSWORD),
+            "created_at": now,
+            "updated_at": now
+        })
+
+    async def health_check(self) -> Dict[str, Any]:
+        try:
+            await self.db.run("sqlite", "select", lambda conn: conn.execute("SELECT 1").fetchone())
+            return {
+                "healthy": True,
+                "timestamp": utc_now(),
+                "connection_status": "connected",
+                "error": None
+            }
+        except Exception as e:
+            return {
+                "healthy": False,
+                "timestamp": utc_now(),
+                "connection_status": "failed",
+                "error": str(e)
+            }
+
+    async def close(self):
+        self.db.close()
@@ -0,0 +1,439 @@
+"""
+Supabase (PostgREST) implementation of the repository interfaces.
+
+All calls go through the pooled async PostgREST client owned by
+``DatabaseManager``. Multi-statement operations run inside the database
+functions added by the SQL migrations so each one is a single round trip.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod, ReturnMethod
+
+from ..database import DatabaseManager
+from ..utils.exceptions import (
+    DatabaseError,
+    InsufficientStockError,
+    ResourceConflictError
+)
+from ..utils.pagination import quote_filter_value
+from .base import (
+    DataStore,
+    IdempotencyRepository,
+    InventoryRepository,
+    OrderIntakeRepository,
+    OrderRepository,
+    UserRepository,
+    adjusted_item,
+    stock_adjustment_results,
+    utc_after,
+    utc_now
+)
+
+# Embedded select returning an order with its items and their inventory item names
+ORDER_WITH_ITEMS_SELECT = "*, order_items(id, item_id, quantity, inventory_items(name))"
+
+# Postgres error codes surfaced by PostgREST
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+CHECK_VIOLATION = "23514"
+
+
+def _translate_api_error(error: APIError) -> Exception:
+    """Map a PostgREST error to the repository exception contract."""
+    details = {"code": error.code, "details": error.details}
+    if error.code == UNIQUE_VIOLATION:
+        return ResourceConflictError(error.message or "Unique constraint violated", details)
+    if error.code in (FOREIGN_KEY_VIOLATION, CHECK_VIOLATION):
+        return DatabaseError(error.message or "Constraint violated", details)
+    return error
+
+
+async def _execute(query):
+    """Execute a PostgREST query, translating constraint violations."""
+    try:
+        return await query.execute()
+    except APIError as e:
+        raise _translate_api_error(e)
+
+
+def _normalize_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten an orders row with embedded order_items into the repository shape."""
+    order = dict(order)
+    if "order_items" not in order:
+        return order
+    order["items"] = [
+        {
+            "id": order_item["id"],
+            "item_id": order_item["item_id"],
+            "item_name": order_item["inventory_items"]["name"],
+            "quantity": order_item["quantity"]
+        }
+        for order_item in order.pop("order_items", None) or []
+    ]
+    return order
+
+
+class SupabaseUserRepository(UserRepository):
+    """Users stored in Supabase."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        result = await _execute(self.db.table("users").select("*").eq("id", user_id))
+        return result.data[0] if result.data else None
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        result = await _execute(self.db.table("users").select("*").eq("email", email))
+        return result.data[0] if result.data else None
+
+    async def list_by_status(self, statuses: Sequence[str]) -> List[Dict[str, Any]]:
+        result = await _execute(self.db.table("users").select("*").in_("status", list(statuses)))
+        return result.data
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        result = await _execute(self.db.table("users").insert(data))
+        return result.data[0]
+
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        result = await _execute(self.db.table("users").update(data).eq("id", user_id))
+        return result.data[0] if result.data else None
+
+    async def delete(self, user_id: str) -> bool:
+        result = await _execute(self.db.table("users").delete().eq("id", user_id))
+        return bool(result.data)
+
+
+class SupabaseInventoryRepository(InventoryRepository):
+    """Inventory items stored in Supabase."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    async def list_page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        # The range filter on the last seen (name, id) lets the database walk
+        # idx_inventory_items_name instead of scanning and skipping rows
+        query = self.db.table("inventory_items").select("*")
+        if after is not None:
+            name, item_id = (quote_filter_value(value) for value in after)
+            query = query.or_(f"name.gt.{name},and(name.eq.{name},id.gt.{item_id})")
+        result = await _execute(query.order("name").order("id").limit(limit))
+        return result.data
+
+    async def list_low_stock(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        result = await _execute(self.db.rpc("low_stock_items", {"p_limit": limit}))
+        return result.data
+
+    async def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        # search_inventory_items (migration 018) looks terms up through the trigram indexes
+        result = await _execute(self.db.rpc("search_inventory_items", {"p_query": query, "p_limit": limit}))
+        return result.data
+
+    async def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        result = await _execute(self.db.table("inventory_items").select("*").eq("id", item_id))
+        return result.data[0] if result.data else None
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        result = await _execute(self.db.table("inventory_items").insert(data))
+        return result.data[0]
+
+    async def update(self, item_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        result = await _execute(self.db.table("inventory_items").update(data).eq("id", item_id))
+        return result.data[0] if result.data else None
+
+    async def upsert_many(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # upsert_inventory_items (migration 017) writes the chunk with one insert ... on conflict
+        result = await _execute(self.db.rpc("upsert_inventory_items", {"p_items": list(items)}))
+        return [{"item_id": row["item_id"], "created": row["created"]} for row in result.data]
+
+    async def adjust_stock(self, item_id: str, delta: int, reason: Optional[str] = None) -> Dict[str, Any]:
+        [result] = await self.adjust_stock_batch([{"item_id": item_id, "delta": delta, "reason": reason}])
+        return adjusted_item(result, delta)
+
+    async def adjust_stock_batch(self, adjustments: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # apply_stock_adjustments (migration 015) applies every delta with one guarded update
+        result = await _execute(self.db.rpc("apply_stock_adjustments", {"p_adjustments": list(adjustments)}))
+        return stock_adjustment_results(adjustments, result.data)
+
+    async def list_movements(
+        self,
+        item_id: str,
+        limit: int,
+        after: Optional[Tuple[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        # Served by idx_inventory_movements_item_id_created_at (migration 014)
+        query = self.db.table("inventory_movements").select("*").eq("item_id", item_id)
+        if after is not None:
+            created_at, movement_id = (quote_filter_value(value) for value in after)
+            query = query.or_(f"created_at.lt.{created_at},and(created_at.eq.{created_at},id.lt.{movement_id})")
+        result = await _execute(
+            query.order("created_at", desc=True).order("id", desc=True).limit(limit)
+        )
+        return result.data
+
+    async def reconcile_balances(
+        self,
+        after: Optional[str],
+        limit: int,
+        apply: bool = False
+    ) -> Dict[str, Any]:
+        # reconcile_inventory_balances (migration 014) compares one batch in SQL
+        result = await _execute(self.db.rpc("reconcile_inventory_balances", {
+            "p_after": after,
+            "p_limit": limit,
+            "p_apply": apply
+        }))
+        return result.data
+
+
+class SupabaseOrderRepository(OrderRepository):
+    """Orders and order items stored in Supabase."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    async def place_order(
+        self,
+        customer_name: str,
+        created_by: str,
+        items: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        # Validation, inserts and stock decrements all run inside the
+        # place_order database function (migrations 003/004)
+        try:
+            result = await self.db.rpc("place_order", {
+                "p_customer_name": customer_name,
+                "p_created_by": created_by,
+                "p_items": [{"item_id": line["item_id"], "quantity": line["quantity"]} for line in items]
+            }).execute()
+        except APIError as e:
+            if e.hint == "insufficient_stock":
+                raise InsufficientStockError(
+                    "Order cannot be fulfilled due to insufficient inventory",
+                    {"errors": json.loads(e.details) if e.details else []}
+                )
+            raise _translate_api_error(e)
+        return result.data
+
+    async def import_orders(self, created_by: str, orders: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Snapshot, validation and batched writes run inside the import_orders
+        # database function (migrations 008 and 011), one round trip per batch
+        result = await _execute(self.db.rpc("import_orders", {
+            "p_created_by": created_by,
+            "p_orders": [
+                {
+                    "id": order.get("id"),
+                    "customer_name": order["customer_name"],
+                    "items": [{"item_id": line["item_id"], "quantity": line["quantity"]} for line in order["items"]]
+                }
+                for order in orders
+            ]
+        }))
+        return result.data
+
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        include_items: bool = False
+    ) -> List[Dict[str, Any]]:
+        # Each filter maps onto idx_orders_status, idx_orders_created_by or
+        # idx_orders_created_at; embedding keeps items in the same request
+        query = self.db.table("orders").select(ORDER_WITH_ITEMS_SELECT if include_items else "*")
+        if status is not None:
+            query = query.eq("status", status)
+        if created_by is not None:
+            query = query.eq("created_by", created_by)
+        if created_from is not None:
+            query = query.gte("created_at", created_from)
+        if created_to is not None:
+            query = query.lt("created_at", created_to)
+        if after is not None:
+            created_at, order_id = (quote_filter_value(value) for value in after)
+            query = query.or_(f"created_at.lt.{created_at},and(created_at.eq.{created_at},id.lt.{order_id})")
+        result = await _execute(
+            query.order("created_at", desc=True).order("id", desc=True).limit(limit)
+        )
+        return [_normalize_order(order) for order in result.data]
+
+    async def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        result = await _execute(
+            self.db.table("orders").select(ORDER_WITH_ITEMS_SELECT).eq("id", order_id)
+        )
+        return _normalize_order(result.data[0]) if result.data else None
+
+    async def set_status(
+        self,
+        order_id: str,
+        status: str,
+        from_statuses: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        # set_order_status (migrations 006/009) returns the orders row type, so
+        # the items are embedded into the update's representation
+        params = {"p_order_id": order_id, "p_status": status}
+        if from_statuses is not None:
+            params["p_from_statuses"] = list(from_statuses)
+        result = await _execute(
+            self.db.rpc("set_order_status", params).select(ORDER_WITH_ITEMS_SELECT)
+        )
+        return _normalize_order(result.data[0]) if result.data else None
+
+    async def transition_statuses(
+        self,
+        order_ids: Sequence[str],
+        status: str,
+        from_statuses: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        # One set-based update inside transition_order_statuses (migration 009)
+        order_ids = list(dict.fromkeys(order_ids))
+        result = await _execute(self.db.rpc("transition_order_statuses", {
+            "p_order_ids": order_ids,
+            "p_status": status,
+            "p_from_statuses": list(from_statuses)
+        }))
+        outcomes = {row["order_id"]: row for row in result.data}
+        return [outcomes[order_id] for order_id in order_ids]
+
+    async def cancel_orders(self, order_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        order_ids = list(dict.fromkeys(order_ids))
+        # cancel_orders (migration 013) cancels and restocks in one transaction
+        result = await _execute(self.db.rpc("cancel_orders", {"p_order_ids": order_ids}))
+        outcomes = {row["order_id"]: row for row in result.data}
+        return [outcomes[order_id] for order_id in order_ids]
+
+    async def picking_list(
+        self,
+        order_ids: Optional[Sequence[str]] = None,
+        status: str = "pending"
+    ) -> List[Dict[str, Any]]:
+        # order_picking_list (migration 012) groups the lines in one query
+        result = await _execute(self.db.rpc("order_picking_list", {
+            "p_status": status,
+            "p_order_ids": list(order_ids) if order_ids is not None else None
+        }))
+        return result.data
+
+    async def status_timeline(self, order_id: str) -> List[Dict[str, Any]]:
+        # Periods and durations are computed by order_status_timeline (migration 010)
+        result = await _execute(self.db.rpc("order_status_timeline", {"p_order_id": order_id}))
+        return result.data
+
+    async def status_durations(
+        self,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        result = await _execute(self.db.rpc("order_status_durations", {
+            "p_from": created_from,
+            "p_to": created_to
+        }))
+        return result.data
+
+
+class SupabaseIdempotencyRepository(IdempotencyRepository):
+    """Idempotency keys stored in Supabase."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    async def claim(self, scope: str, key: str, request_hash: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+        # claim_idempotency_key (migration 007) inserts or takes over an expired key atomically
+        result = await _execute(self.db.rpc("claim_idempotency_key", {
+            "p_scope": scope,
+            "p_key": key,
+            "p_request_hash": request_hash,
+            "p_ttl_seconds": ttl_seconds
+        }))
+        return result.data[0] if result.data else None
+
+    async def complete(self, scope: str, key: str, response: str):
+        await _execute(
+            self.db.table("idempotency_keys").update({"response": response}, returning=ReturnMethod.minimal)
+            .eq("scope", scope).eq("key", key)
+        )
+
+    async def release(self, scope: str, key: str):
+        await _execute(
+            self.db.table("idempotency_keys").delete(returning=ReturnMethod.minimal)
+            .eq("scope", scope).eq("key", key).is_("response", "null")
+        )
+
+    async def purge_expired(self) -> int:
+        result = await _execute(
+            self.db.table("idempotency_keys")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .lte("expires_at", utc_now())
+        )
+        return result.count or 0
+
+
+class SupabaseOrderIntakeRepository(OrderIntakeRepository):
+    """Order intake queue stored in Supabase, claimed with the migration 011 functions."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    async def enqueue(self, created_by: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        result = await _execute(
+            self.db.table("order_intake").insert({"created_by": created_by, "payload": payload})
+        )
+        return result.data[0]
+
+    async def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        result = await _execute(self.db.table("order_intake").select("*").eq("id", entry_id))
+        return result.data[0] if result.data else None
+
+    async def claim(self, limit: int) -> List[Dict[str, Any]]:
+        result = await _execute(
+            self.db.rpc("claim_order_intake", {"p_limit": limit}).order("created_at").order("id")
+        )
+        return result.data
+
+    async def complete(self, results: Sequence[Dict[str, Any]]):
+        await _execute(self.db.rpc("complete_order_intake", {"p_results": list(results)}))
+
+    async def release(self, entry_ids: Sequence[str], max_attempts: int):
+        await _execute(self.db.rpc("release_order_intake", {
+            "p_ids": list(entry_ids),
+            "p_max_attempts": max_attempts
+        }))
+
+    async def recover_stale(self, claim_timeout_seconds: int) -> int:
+        result = await _execute(self.db.rpc("recover_order_intake", {
+            "p_claim_timeout_seconds": claim_timeout_seconds
+        }))
+        return result.data or 0
+
+    async def purge_processed(self, older_than_seconds: int) -> int:
+        result = await _execute(
+            self.db.table("order_intake")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .lt("processed_at", utc_after(-older_than_seconds))
+        )
+        return result.count or 0
+
+
+class SupabaseDataStore(DataStore):
+    """Data backend backed by Supabase through PostgREST."""
+
+    backend_name = "supabase"
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.users = SupabaseUserRepository(db)
+        self.inventory = SupabaseInventoryRepository(db)
+        self.orders = SupabaseOrderRepository(db)
+        self.idempotency = SupabaseIdempotencyRepository(db)
+        self.intake = SupabaseOrderIntakeRepository(db)
+
+    async def health_check(self) -> Dict[str, Any]:
+        return await self.db.health_check()
+
+    async def close(self):
+        await self.db.close()
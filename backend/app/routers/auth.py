@@ -4,9 +4,9 @@ Authentication API endpoints for login and user registration.
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.responses import JSONResponse
 from ..models.user import LoginRequest, LoginResponse, UserRegister, UserResponse
-from ..auth.password import verify_password, hash_password
+from ..auth.password import verify_password_async, hash_password_async
 from ..auth.jwt_handler import create_access_token
-from ..database import get_database, DatabaseManager
+from ..repositories import DataStore, get_data_store
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 @router.post("/login", response_model=LoginResponse)
 async def login(
     login_data: LoginRequest,
-    db: DatabaseManager = Depends(get_database)
+    store: DataStore = Depends(get_data_store)
 ):
     """
     Authenticate user with email and password credentials.
@@ -28,16 +28,14 @@ async def login(
     """
     try:
         # Query user by email
-        result = db.client.table("users").select("*").eq("email", login_data.email).execute()
+        user_data = await store.users.get_by_email(login_data.email)
         
-        if not result.data:
+        if not user_data:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
-        user_data = result.data[0]
-        
         # Check if user is active
         if user_data.get("status") != "active":
             raise HTTPException(
@@ -45,14 +43,14 @@ async def login(
                 detail="Account is not active. Please complete registration first."
             )
         
-        # Verify password
+        # Verify password off the event loop
         if not user_data.get("password_hash"):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
-        if not verify_password(login_data.password, user_data["password_hash"]):
+        if not await verify_password_async(login_data.password, user_data["password_hash"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -96,7 +94,7 @@ async def login(
 @router.post("/register", response_model=UserResponse)
 async def register(
     registration_data: UserRegister,
-    db: DatabaseManager = Depends(get_database)
+    store: DataStore = Depends(get_data_store)
 ):
     """
     Complete user registration for invited users.
@@ -107,16 +105,14 @@ async def register(
     """
     try:
         # Check if user exists with invited status
-        result = db.client.table("users").select("*").eq("email", registration_data.email).execute()
+        user_data = await store.users.get_by_email(registration_data.email)
         
-        if not result.data:
+        if not user_data:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="This email is not authorized to register"
             )
         
-        user_data = result.data[0]
-        
         # Verify user has invited status
         if user_data.get("status") != "invited":
             if user_data.get("status") == "active":
@@ -130,8 +126,8 @@ async def register(
                     detail="This email is not authorized to register"
                 )
         
-        # Hash the password
-        password_hash = hash_password(registration_data.password)
+        # Hash the password off the event loop
+        password_hash = await hash_password_async(registration_data.password)
         
         # Update user record with registration details
         update_data = {
@@ -140,20 +136,17 @@ async def register(
             "phone_number": registration_data.phone_number,
             "emergency_contact_number": registration_data.emergency_contact_number,
             "password_hash": password_hash,
-            "status": "active",
-            "updated_at": "now()"
+            "status": "active"
         }
         
-        update_result = db.client.table("users").update(update_data).eq("id", user_data["id"]).execute()
+        updated_user = await store.users.update(user_data["id"], update_data)
         
-        if not update_result.data:
+        if not updated_user:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to complete registration"
             )
         
-        updated_user = update_result.data[0]
-        
         # Return user response
         return UserResponse(
             id=updated_user["id"],
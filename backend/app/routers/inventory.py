@@ -1,11 +1,39 @@
 """
 Inventory management API endpoints.
 """
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
-from ..models.inventory import InventoryItemCreate, InventoryItemUpdate, InventoryItemResponse
+from typing import List, Dict, Any, Optional, AsyncIterator, Type
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from ..models.inventory import (
+    InventoryItemCreate,
+    InventoryItemUpdate,
+    InventoryItemResponse,
+    LowStockItemResponse,
+    InventoryMovementResponse,
+    InventoryReconcileReport,
+    InventoryAdjustment,
+    InventoryBatchAdjustment,
+    InventoryAdjustmentOutcome,
+    InventoryAdjustmentResult,
+    InventoryAdjustmentReport,
+    InventoryImportStatus,
+    InventoryImportResult
+)
 from ..auth.dependencies import require_authenticated_user, require_warehouse_manager_or_admin
-from ..database import get_database, DatabaseManager
+from ..repositories import DataStore, get_data_store
+from ..config import settings
+from ..cache import inventory_cache
+from ..reconcile import inventory_reconciler
+from ..utils.exceptions import InsufficientStockError, ResourceConflictError, ResourceNotFoundError, ValidationError
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.inventory_import import (
+    ItemImportRow,
+    parse_csv_items,
+    parse_ndjson_items,
+    write_csv_results,
+    write_ndjson_results
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,36 +41,138 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
+INVENTORY_CURSOR_KEYS = ("name", "id")
+MOVEMENT_CURSOR_KEYS = ("created_at", "id")
+
+_inventory_list_adapter = TypeAdapter(List[InventoryItemResponse])
+_low_stock_list_adapter = TypeAdapter(List[LowStockItemResponse])
+_movement_list_adapter = TypeAdapter(List[InventoryMovementResponse])
+
+# Bulk import body parsers and outcome writers by Content-Type
+IMPORT_FORMATS = {
+    "text/csv": (parse_csv_items, write_csv_results),
+    "application/x-ndjson": (parse_ndjson_items, write_ndjson_results),
+    "application/jsonl": (parse_ndjson_items, write_ndjson_results)
+}
+
+
+def _build_item_response(
+    item_data: Dict[str, Any],
+    response_model: Type[InventoryItemResponse] = InventoryItemResponse
+) -> InventoryItemResponse:
+    """Build an inventory item response from a database row."""
+    return response_model(
+        id=item_data["id"],
+        name=item_data["name"],
+        description=item_data.get("description"),
+        stock_level=item_data["stock_level"],
+        low_stock_threshold=item_data["low_stock_threshold"],
+        created_at=item_data["created_at"],
+        updated_at=item_data["updated_at"]
+    )
+
+
+async def _stream_inventory_items(store: DataStore, after: Optional[List[Any]]) -> AsyncIterator[bytes]:
+    """
+    Yield inventory items as NDJSON lines, one keyset batch at a time.
+    
+    Only a single batch is held in memory, so memory use stays constant
+    regardless of catalog size.
+    """
+    batch_size = settings.inventory_stream_batch_size
+    while True:
+        rows = await store.inventory.list_page(batch_size, after)
+        if not rows:
+            break
+        yield b"".join(
+            _build_item_response(row).model_dump_json().encode("utf-8") + b"\n"
+            for row in rows
+        )
+        if len(rows) < batch_size:
+            break
+        after = [rows[-1][key] for key in INVENTORY_CURSOR_KEYS]
+
+
 @router.get("", response_model=List[InventoryItemResponse])
 async def list_inventory_items(
-    db: DatabaseManager = Depends(get_database),
+    limit: int = Query(
+        settings.inventory_page_size_default,
+        ge=1,
+        le=settings.inventory_page_size_max,
+        description="Maximum number of items to return"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    stream: bool = Query(False, description="Stream all remaining items as NDJSON instead of returning one page"),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_authenticated_user)
 ):
     """
-    List all inventory items with stock levels and threshold information.
+    List inventory items with stock levels and threshold information.
+    
+    Items are ordered by name and paginated with a keyset cursor: when more
+    items exist, the cursor for the next page is returned in the
+    ``X-Next-Cursor`` response header. With ``stream=true`` every item after
+    the cursor is streamed as newline-delimited JSON instead.
+    
+    Pages are served from the in-process inventory snapshot cache, which
+    holds serialized response bodies and is invalidated by every inventory
+    write and order placement.
     
     Available to all authenticated users regardless of role.
     
     Requirements: 4.1
     """
     try:
-        # Get all inventory items
-        result = db.client.table("inventory_items").select("*").execute()
-        
-        items = []
-        for item_data in result.data:
-            items.append(InventoryItemResponse(
-                id=item_data["id"],
-                name=item_data["name"],
-                description=item_data.get("description"),
-                stock_level=item_data["stock_level"],
-                low_stock_threshold=item_data["low_stock_threshold"],
-                created_at=item_data["created_at"],
-                updated_at=item_data["updated_at"]
-            ))
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, len(INVENTORY_CURSOR_KEYS))
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
         
-        return items
+        if stream:
+            return StreamingResponse(
+                _stream_inventory_items(store, after),
+                media_type="application/x-ndjson"
+            )
+        
+        # Serve the pre-serialized page from the snapshot cache when possible
+        cache_key = ("page", limit, cursor)
+        cached = inventory_cache.get(cache_key)
+        if cached is not None:
+            return Response(
+                content=cached.body,
+                media_type="application/json",
+                headers={**cached.headers, "X-Cache": "HIT"}
+            )
+        generation = inventory_cache.generation
         
+        # Fetch one extra row to know whether another page exists
+        rows = await store.inventory.list_page(limit + 1, after)
+        
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(
+                [rows[-1][key] for key in INVENTORY_CURSOR_KEYS]
+            )
+        
+        body = _inventory_list_adapter.dump_json(
+            [_build_item_response(item_data) for item_data in rows]
+        )
+        inventory_cache.put(cache_key, body, headers, generation)
+        
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, "X-Cache": "MISS"}
+        )
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"List inventory items error: {str(e)}")
         raise HTTPException(
@@ -51,29 +181,450 @@ async def list_inventory_items(
         )
 
 
+@router.get("/low-stock", response_model=List[LowStockItemResponse])
+async def list_low_stock_items(
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.inventory_page_size_max,
+        description="Maximum number of alerts to return"
+    ),
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    List inventory items at or below their low stock threshold.
+    
+    Items are sorted by how far below threshold they are, largest shortfall
+    first. The filter and ordering run against the partial
+    idx_inventory_items_low_stock index (migration 005), so the cost grows
+    with the number of alerts rather than the size of the catalog.
+    
+    Available to all authenticated users regardless of role.
+    """
+    try:
+        cache_key = ("low_stock", limit)
+        cached = inventory_cache.get(cache_key)
+        if cached is not None:
+            return Response(
+                content=cached.body,
+                media_type="application/json",
+                headers={"X-Cache": "HIT"}
+            )
+        generation = inventory_cache.generation
+        
+        rows = await store.inventory.list_low_stock(limit)
+        
+        body = _low_stock_list_adapter.dump_json([
+            _build_item_response(item_data, LowStockItemResponse)
+            for item_data in rows
+        ])
+        inventory_cache.put(cache_key, body, {}, generation)
+        
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"X-Cache": "MISS"}
+        )
+        
+    except Exception as e:
+        logger.error(f"List low stock items error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while retrieving low stock items"
+        )
+
+
+@router.get("/search", response_model=List[InventoryItemResponse])
+async def search_inventory_items(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(
+        settings.inventory_search_limit_default,
+        ge=1,
+        le=settings.inventory_search_limit_max,
+        description="Maximum number of items to return"
+    ),
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    Search inventory items by name and description, best match first.
+    
+    The query is split on whitespace and an item matches when every term
+    appears in its name or description, ignoring case, so typeahead can
+    query as the user types instead of downloading the catalog. Exact name
+    matches rank first, then names starting with the query, then items
+    matching on name alone, then shorter names. Terms are looked up through
+    the trigram indexes of migration 018, or an in-process trigram index on
+    the local backends.
+    
+    Results are not cached: every distinct keystroke would otherwise take an
+    entry from the inventory snapshot cache that serves the hot listing pages.
+    
+    Available to all authenticated users regardless of role.
+    """
+    try:
+        rows = await store.inventory.search(q, limit)
+        
+        body = _inventory_list_adapter.dump_json(
+            [_build_item_response(item_data) for item_data in rows]
+        )
+        return Response(content=body, media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Search inventory items error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while searching inventory items"
+        )
+
+
+@router.post("/reconcile", response_model=InventoryReconcileReport)
+async def reconcile_inventory(
+    apply: bool = Query(False, description="Set drifted stock levels back to their ledger balance"),
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Compare every stock level with its stock ledger (admin and warehouse manager only).
+    
+    Each item's stock level is the materialized balance of its
+    inventory_movements. This recomputes the balances from the ledger in
+    batches of ``INVENTORY_RECONCILE_BATCH_SIZE`` items and reports every item
+    whose stock level has drifted. With ``apply=true`` drifted stock levels are
+    set back to their ledger balance; a negative ledger balance is only
+    reported.
+    """
+    try:
+        report = InventoryReconcileReport(**await inventory_reconciler.run(store, apply))
+        return Response(content=report.model_dump_json(), media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Reconcile inventory error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during inventory reconciliation"
+        )
+
+
+async def _import_batch(store: DataStore, batch: List[ItemImportRow]) -> List[InventoryImportResult]:
+    """Upsert one batch of parsed items and build their results."""
+    outcomes = await store.inventory.upsert_many([
+        {
+            "name": row.item.name,
+            "description": row.item.description,
+            "stock_level": row.item.stock_level,
+            "low_stock_threshold": row.item.low_stock_threshold
+        }
+        for row in batch
+    ])
+    return [
+        InventoryImportResult(
+            row=row.row,
+            name=row.name,
+            status=InventoryImportStatus.CREATED if outcome["created"] else InventoryImportStatus.UPDATED,
+            item_id=outcome["item_id"]
+        )
+        for row, outcome in zip(batch, outcomes)
+    ]
+
+
+@router.post("/import")
+async def import_inventory_items(
+    request: Request,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Bulk create or update inventory items from a CSV or NDJSON body (admin and warehouse manager only).
+    
+    The body is parsed as it streams in (``Content-Type: text/csv`` or
+    ``application/x-ndjson``; see ``app.utils.inventory_import`` for both
+    formats) and every row is validated like a ``POST /inventory`` body.
+    Valid rows are upserted on name in batches of
+    ``INVENTORY_IMPORT_BATCH_SIZE``, each written with multi-row statements
+    in a single transaction. A row naming an item that already exists,
+    regardless of case, updates it and keeps its name, so rows are applied
+    in order and re-importing a catalog is safe. Invalid rows are rejected
+    individually and never block the rest of the import.
+    
+    Returns an outcome file in the format of the upload with one record per
+    row (row, name, status, item_id, errors), ordered by source row; the
+    ``X-Import-Created``, ``X-Import-Updated`` and ``X-Import-Rejected``
+    headers carry the totals.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    import_format = IMPORT_FORMATS.get(content_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Bulk import requires a text/csv or application/x-ndjson body"
+        )
+    parser, writer = import_format
+    
+    batch_size = settings.inventory_import_batch_size
+    results: List[InventoryImportResult] = []
+    batch: List[ItemImportRow] = []
+    batch_names = set()
+    try:
+        try:
+            async for row in parser(request.stream()):
+                if row.item is None:
+                    results.append(InventoryImportResult(
+                        row=row.row,
+                        name=row.name,
+                        status=InventoryImportStatus.REJECTED,
+                        errors=row.errors
+                    ))
+                    continue
+                # A repeated name must see the write of the earlier row
+                name_key = row.item.name.lower()
+                if name_key in batch_names:
+                    results.extend(await _import_batch(store, batch))
+                    batch, batch_names = [], set()
+                batch.append(row)
+                batch_names.add(name_key)
+                if len(batch) >= batch_size:
+                    results.extend(await _import_batch(store, batch))
+                    batch, batch_names = [], set()
+            if batch:
+                results.extend(await _import_batch(store, batch))
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=e.message
+            )
+        
+        results.sort(key=lambda result: result.row)
+        totals = {import_status.value: 0 for import_status in InventoryImportStatus}
+        for result in results:
+            totals[result.status] += 1
+        return Response(
+            content=writer(results),
+            media_type=content_type,
+            headers={
+                "X-Import-Created": str(totals[InventoryImportStatus.CREATED.value]),
+                "X-Import-Updated": str(totals[InventoryImportStatus.UPDATED.value]),
+                "X-Import-Rejected": str(totals[InventoryImportStatus.REJECTED.value])
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Import inventory items error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during inventory import"
+        )
+    finally:
+        # Items may have been written, so cached inventory snapshots are stale
+        inventory_cache.invalidate()
+
+
+@router.post("/adjust", response_model=InventoryAdjustmentReport)
+async def adjust_inventory_stock_batch(
+    batch: InventoryBatchAdjustment,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Add signed deltas to the stock levels of many items (admin and warehouse manager only).
+    
+    Every delta is applied with one guarded set-based update in a single
+    transaction, so concurrent orders and adjustments never lose an update.
+    A delta that would make an item's stock negative is skipped and reported
+    as ``insufficient_stock`` with the item's current stock level; the others
+    are applied and recorded in the stock ledger with their reason. Each item
+    may appear once per request.
+    """
+    try:
+        if len(batch.adjustments) > settings.inventory_adjust_max_items:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.inventory_adjust_max_items} items can be adjusted per request"
+            )
+        
+        seen = set()
+        for adjustment in batch.adjustments:
+            if adjustment.item_id in seen:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Inventory item {adjustment.item_id} is adjusted more than once"
+                )
+            seen.add(adjustment.item_id)
+        
+        outcomes = await store.inventory.adjust_stock_batch([
+            {"item_id": adjustment.item_id, "delta": adjustment.delta, "reason": adjustment.reason}
+            for adjustment in batch.adjustments
+        ])
+        
+        results = []
+        for outcome in outcomes:
+            if outcome["applied"]:
+                result_outcome = InventoryAdjustmentOutcome.ADJUSTED
+            elif outcome["item"] is None:
+                result_outcome = InventoryAdjustmentOutcome.NOT_FOUND
+            else:
+                result_outcome = InventoryAdjustmentOutcome.INSUFFICIENT_STOCK
+            results.append(InventoryAdjustmentResult(
+                item_id=outcome["item_id"],
+                outcome=result_outcome,
+                stock_level=outcome["item"]["stock_level"] if outcome["item"] else None
+            ))
+        
+        adjusted = sum(1 for outcome in outcomes if outcome["applied"])
+        if adjusted:
+            inventory_cache.invalidate()
+        
+        report = InventoryAdjustmentReport(
+            adjusted=adjusted,
+            rejected=len(results) - adjusted,
+            results=results
+        )
+        return Response(content=report.model_dump_json(), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch adjust inventory stock error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during stock adjustment"
+        )
+
+
+@router.post("/{item_id}/adjust", response_model=InventoryItemResponse)
+async def adjust_inventory_stock(
+    item_id: str,
+    adjustment: InventoryAdjustment,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Add a signed delta to an item's stock level (admin and warehouse manager only).
+    
+    Unlike ``PUT /inventory/{item_id}`` with an absolute ``stock_level``, the
+    delta is applied by a single guarded update, so there is no
+    read-modify-write and concurrent changes are never lost. A delta that
+    would make the stock negative is rejected. The change is recorded in the
+    item's stock ledger as an adjustment with the given reason.
+    """
+    try:
+        try:
+            item = await store.inventory.adjust_stock(item_id, adjustment.delta, adjustment.reason)
+        except ResourceNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Inventory item not found"
+            )
+        except InsufficientStockError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": "Insufficient stock",
+                    "message": e.message,
+                    "details": [e.message]
+                }
+            )
+        inventory_cache.invalidate()
+        
+        return Response(content=_build_item_response(item).model_dump_json(), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Adjust inventory stock error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during stock adjustment"
+        )
+
+
+@router.get("/{item_id}/movements", response_model=List[InventoryMovementResponse])
+async def list_inventory_movements(
+    item_id: str,
+    limit: int = Query(
+        settings.inventory_page_size_default,
+        ge=1,
+        le=settings.inventory_page_size_max,
+        description="Maximum number of movements to return"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    List an item's stock ledger, newest first (admin and warehouse manager only).
+    
+    Every receipt, sale, adjustment and cancellation that changed the item's
+    stock level is listed with its signed quantity and the balance after it;
+    adjustments made through the adjust endpoints carry their reason.
+    Movements are paginated with a keyset cursor over
+    idx_inventory_movements_item_id_created_at; when more exist, the cursor
+    for the next page is returned in the ``X-Next-Cursor`` response header.
+    """
+    try:
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, len(MOVEMENT_CURSOR_KEYS))
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+        
+        if not await store.inventory.get(item_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Inventory item not found"
+            )
+        
+        # Fetch one extra row to know whether another page exists
+        rows = await store.inventory.list_movements(item_id, limit + 1, after)
+        
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(
+                [rows[-1][key] for key in MOVEMENT_CURSOR_KEYS]
+            )
+        
+        return Response(
+            content=_movement_list_adapter.dump_json(
+                [InventoryMovementResponse(**row) for row in rows]
+            ),
+            media_type="application/json",
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"List inventory movements error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while retrieving inventory movements"
+        )
+
+
 @router.post("", response_model=InventoryItemResponse)
 async def create_inventory_item(
     item_data: InventoryItemCreate,
-    db: DatabaseManager = Depends(get_database),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_warehouse_manager_or_admin)
 ):
     """
     Create new inventory item (admin and warehouse manager only).
     
-    Creates a new inventory item with the provided details.
+    Creates a new inventory item with the provided details. Names are
+    unique regardless of case; the database enforces this, so a duplicate
+    name is rejected with 409 even when created concurrently.
     
     Requirements: 4.2
     """
     try:
-        # Check if item with this name already exists
-        existing_item_result = db.client.table("inventory_items").select("*").eq("name", item_data.name).execute()
-        
-        if existing_item_result.data:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Inventory item with this name already exists"
-            )
-        
         # Create inventory item record
         insert_data = {
             "name": item_data.name,
@@ -82,15 +633,14 @@ async def create_inventory_item(
             "low_stock_threshold": item_data.low_stock_threshold
         }
         
-        result = db.client.table("inventory_items").insert(insert_data).execute()
-        
-        if not result.data:
+        try:
+            created_item = await store.inventory.create(insert_data)
+        except ResourceConflictError:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create inventory item"
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Inventory item with this name already exists"
             )
-        
-        created_item = result.data[0]
+        inventory_cache.invalidate()
         
         # Return inventory item response
         return InventoryItemResponse(
@@ -117,21 +667,22 @@ async def create_inventory_item(
 async def update_inventory_item(
     item_id: str,
     item_data: InventoryItemUpdate,
-    db: DatabaseManager = Depends(get_database),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_warehouse_manager_or_admin)
 ):
     """
     Update inventory item details and stock levels (admin and warehouse manager only).
     
     Updates existing inventory item with provided data. Only non-null fields are updated.
+    Renaming to the name of another item, regardless of case, is rejected with 409.
     
     Requirements: 4.3, 4.4
     """
     try:
         # Check if item exists
-        existing_item_result = db.client.table("inventory_items").select("*").eq("id", item_id).execute()
+        existing_item = await store.inventory.get(item_id)
         
-        if not existing_item_result.data:
+        if not existing_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Inventory item not found"
@@ -140,13 +691,6 @@ async def update_inventory_item(
         # Build update data with only provided fields
         update_data = {}
         if item_data.name is not None:
-            # Check if another item with this name already exists
-            name_check_result = db.client.table("inventory_items").select("*").eq("name", item_data.name).neq("id", item_id).execute()
-            if name_check_result.data:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Another inventory item with this name already exists"
-                )
             update_data["name"] = item_data.name
         
         if item_data.description is not None:
@@ -160,7 +704,6 @@ async def update_inventory_item(
         
         # If no fields to update, return current item
         if not update_data:
-            existing_item = existing_item_result.data[0]
             return InventoryItemResponse(
                 id=existing_item["id"],
                 name=existing_item["name"],
@@ -171,16 +714,21 @@ async def update_inventory_item(
                 updated_at=existing_item["updated_at"]
             )
         
-        # Update the item
-        update_result = db.client.table("inventory_items").update(update_data).eq("id", item_id).execute()
-        
-        if not update_result.data:
+        # Update the item; the unique name index rejects a taken name
+        try:
+            updated_item = await store.inventory.update(item_id, update_data)
+        except ResourceConflictError:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update inventory item"
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Another inventory item with this name already exists"
             )
         
-        updated_item = update_result.data[0]
+        if not updated_item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Inventory item not found"
+            )
+        inventory_cache.invalidate()
         
         return InventoryItemResponse(
             id=updated_item["id"],
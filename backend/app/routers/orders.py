@@ -1,11 +1,48 @@
 """
 Order management API endpoints.
 """
-from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends
-from ..models.order import OrderCreate, OrderResponse, OrderItemResponse, OrderStatusUpdate, OrderStatus
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Request, Response
+from pydantic import TypeAdapter
+from ..models.order import (
+    OrderCreate,
+    OrderResponse,
+    OrderItemResponse,
+    OrderStatusUpdate,
+    OrderStatus,
+    OrderStatusEvent,
+    OrderTimelineResponse,
+    OrderStatusDurationStats,
+    OrderBulkStatusUpdate,
+    OrderBulkCancel,
+    OrderStatusOutcome,
+    OrderBulkStatusResult,
+    OrderBulkStatusReport,
+    OrderImportResult,
+    OrderImportReport,
+    OrderImportStatus,
+    OrderIntakeStatus,
+    OrderIntakeResponse,
+    PickingListLine,
+    PickingListResponse
+)
 from ..auth.dependencies import require_salesperson, require_authenticated_user, require_warehouse_manager_or_admin
-from ..database import get_database, DatabaseManager
+from ..repositories import DataStore, get_data_store
+from ..repositories.base import ORDER_STATUSES, ORDER_STATUS_TRANSITIONS, format_timestamp
+from ..config import settings
+from ..utils.exceptions import (
+    InsufficientStockError,
+    IdempotencyKeyReuseError,
+    IdempotencyKeyInProgressError,
+    ValidationError
+)
+from ..cache import inventory_cache
+from ..idempotency import order_idempotency, request_fingerprint
+from ..intake import order_intake
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.order_import import ImportRow, parse_csv_orders, parse_ndjson_orders
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,188 +50,546 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
+ORDER_CURSOR_KEYS = ("created_at", "id")
+
+_order_list_adapter = TypeAdapter(List[OrderResponse])
+_status_stats_adapter = TypeAdapter(List[OrderStatusDurationStats])
+
+# Bulk import body parsers by Content-Type
+IMPORT_PARSERS = {
+    "text/csv": parse_csv_orders,
+    "application/x-ndjson": parse_ndjson_orders,
+    "application/jsonl": parse_ndjson_orders
+}
+
+
+def _build_order_response(order: Dict[str, Any]) -> OrderResponse:
+    """Build an order response from an order returned by the order repository (items are optional)."""
+    order_items_data = []
+    for order_item in order.get("items") or []:
+        order_items_data.append(OrderItemResponse(
+            id=order_item["id"],
+            item_id=order_item["item_id"],
+            item_name=order_item["item_name"],
+            quantity=order_item["quantity"]
+        ))
+    
+    return OrderResponse(
+        id=order["id"],
+        customer_name=order["customer_name"],
+        status=OrderStatus(order["status"]),
+        items=order_items_data,
+        created_by=order["created_by"],
+        created_at=order["created_at"],
+        updated_at=order["updated_at"]
+    )
+
+
 @router.post("", response_model=OrderResponse)
 async def create_order(
     order_data: OrderCreate,
-    db: DatabaseManager = Depends(get_database),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_salesperson)
 ):
     """
     Create new customer order (salesperson only).
     
     Validates stock availability and atomically creates order with inventory stock reduction.
+    On Supabase the whole operation runs inside the place_order database function
+    (migration 003), so it costs one round trip regardless of the number of line items.
+    
+    With an ``Idempotency-Key`` header, a retry of a successful request replays
+    the original order (marked with ``Idempotent-Replayed: true``) instead of
+    creating a duplicate, and a duplicate sent while the original is still
+    running waits for it. Reusing a key with a different payload is rejected.
     
     Requirements: 5.1, 5.2, 5.3, 5.4
     """
+    user_id = current_user.get("user_id")
+    owns_key = False
+    completed = False
     try:
-        user_id = current_user.get("user_id")
-        
-        # Validate stock availability for all items first
-        stock_validation_errors = []
-        inventory_items = {}
-        
-        for order_item in order_data.items:
-            # Get current inventory item
-            inventory_result = db.client.table("inventory_items").select("*").eq("id", order_item.item_id).execute()
-            
-            if not inventory_result.data:
-                stock_validation_errors.append(f"Inventory item {order_item.item_id} not found")
-                continue
-            
-            inventory_item = inventory_result.data[0]
-            inventory_items[order_item.item_id] = inventory_item
-            
-            # Check if sufficient stock is available
-            if inventory_item["stock_level"] < order_item.quantity:
-                stock_validation_errors.append(
-                    f"Insufficient stock for item '{inventory_item['name']}'. "
-                    f"Requested: {order_item.quantity}, Available: {inventory_item['stock_level']}"
+        if idempotency_key:
+            request_hash = request_fingerprint(order_data.model_dump())
+            try:
+                replay = await order_idempotency.begin(store, user_id, idempotency_key, request_hash)
+            except IdempotencyKeyReuseError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=e.message
+                )
+            except IdempotencyKeyInProgressError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=e.message
+                )
+            if replay is not None:
+                return Response(
+                    content=replay,
+                    media_type="application/json",
+                    headers={"Idempotent-Replayed": "true"}
                 )
+            owns_key = True
         
-        # If any stock validation errors, reject the order
-        if stock_validation_errors:
+        # Validate stock, create the order and its items, and reduce inventory
+        # stock in a single transaction
+        try:
+            created_order = await store.orders.place_order(
+                customer_name=order_data.customer_name,
+                created_by=user_id,
+                items=[
+                    {"item_id": order_item.item_id, "quantity": order_item.quantity}
+                    for order_item in order_data.items
+                ]
+            )
+        except InsufficientStockError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
                     "error": "Insufficient stock",
-                    "message": "Order cannot be fulfilled due to insufficient inventory",
-                    "details": stock_validation_errors
+                    "message": e.message,
+                    "details": e.details.get("errors", [])
                 }
             )
         
-        # Begin atomic transaction: create order and reduce inventory stock
-        # Create the order record first
-        order_insert_data = {
-            "customer_name": order_data.customer_name,
-            "status": OrderStatus.PENDING.value,
-            "created_by": user_id
-        }
+        # The order exists now, so the key must never be released from here on
+        completed = True
+        
+        # Stock levels changed, so cached inventory snapshots are stale
+        inventory_cache.invalidate()
+        
+        body = _build_order_response(created_order).model_dump_json().encode("utf-8")
+        if owns_key:
+            try:
+                await order_idempotency.complete(store, user_id, idempotency_key, request_hash, body)
+            except Exception as e:
+                logger.error(f"Failed to store idempotent response for order {created_order['id']}: {str(e)}")
         
-        order_result = db.client.table("orders").insert(order_insert_data).execute()
+        return Response(content=body, media_type="application/json")
         
-        if not order_result.data:
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Create order error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during order creation"
+        )
+    finally:
+        if owns_key:
+            if not completed:
+                try:
+                    await order_idempotency.abandon(store, user_id, idempotency_key)
+                except Exception as e:
+                    logger.error(f"Failed to release idempotency key: {str(e)}")
+            order_idempotency.finish(user_id, idempotency_key)
+
+
+async def _import_batch(store: DataStore, user_id: str, batch: List[ImportRow]) -> List[OrderImportResult]:
+    """
+    Place one batch of parsed orders and report the outcome of each.
+    
+    A batch is written in a single transaction, so if it fails every order in
+    it is reported as rejected and the import continues with the next batch.
+    """
+    try:
+        outcomes = await store.orders.import_orders(user_id, [
+            {
+                "customer_name": row.order.customer_name,
+                "items": [
+                    {"item_id": order_item.item_id, "quantity": order_item.quantity}
+                    for order_item in row.order.items
+                ]
+            }
+            for row in batch
+        ])
+    except Exception as e:
+        logger.error(f"Import orders batch error: {str(e)}")
+        return [
+            OrderImportResult(
+                row=row.row,
+                reference=row.reference,
+                status=OrderImportStatus.REJECTED,
+                errors=["Internal error while writing this batch; the order was not created"]
+            )
+            for row in batch
+        ]
+    
+    return [
+        OrderImportResult(
+            row=row.row,
+            reference=row.reference,
+            status=OrderImportStatus(outcome["status"]),
+            order_id=outcome.get("order_id"),
+            errors=outcome.get("errors") or []
+        )
+        for row, outcome in zip(batch, outcomes)
+    ]
+
+
+@router.post("/import", response_model=OrderImportReport)
+async def import_orders(
+    request: Request,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_salesperson)
+):
+    """
+    Bulk import customer orders from a CSV or NDJSON body (salesperson only).
+    
+    The body is parsed as it streams in (``Content-Type: text/csv`` or
+    ``application/x-ndjson``; see ``app.utils.order_import`` for both
+    formats). Valid orders are collected into batches of
+    ``ORDER_IMPORT_BATCH_SIZE``; each batch is validated against one snapshot
+    of the stock it references, in row order, and its accepted orders are
+    written with batched inserts in a single transaction. Rows that fail
+    parsing or stock validation are rejected individually and never block
+    the rest of the import.
+    
+    Returns a report with one result per order, ordered by source row.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    parser = IMPORT_PARSERS.get(content_type)
+    if parser is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Bulk import requires a text/csv or application/x-ndjson body"
+        )
+    
+    user_id = current_user.get("user_id")
+    batch_size = settings.order_import_batch_size
+    results: List[OrderImportResult] = []
+    batch: List[ImportRow] = []
+    try:
+        try:
+            async for row in parser(request.stream()):
+                if row.order is None:
+                    results.append(OrderImportResult(
+                        row=row.row,
+                        reference=row.reference,
+                        status=OrderImportStatus.REJECTED,
+                        errors=row.errors
+                    ))
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    results.extend(await _import_batch(store, user_id, batch))
+                    batch = []
+            if batch:
+                results.extend(await _import_batch(store, user_id, batch))
+        except ValidationError as e:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create order"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=e.message
             )
         
-        created_order = order_result.data[0]
-        order_id = created_order["id"]
+        results.sort(key=lambda result: result.row)
+        created = sum(1 for result in results if result.status == OrderImportStatus.CREATED.value)
+        report = OrderImportReport(
+            total=len(results),
+            created=created,
+            rejected=len(results) - created,
+            results=results
+        )
+        return Response(content=report.model_dump_json(), media_type="application/json")
         
-        # Create order items and reduce inventory stock
-        order_items_data = []
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Import orders error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during order import"
+        )
+    finally:
+        # Stock levels may have changed, so cached inventory snapshots are stale
+        inventory_cache.invalidate()
+
+
+def _build_intake_response(entry: Dict[str, Any]) -> OrderIntakeResponse:
+    """Build an intake response from an entry returned by the intake repository."""
+    return OrderIntakeResponse(
+        tracking_id=entry["id"],
+        status=OrderIntakeStatus(entry["status"]),
+        order_id=entry.get("order_id"),
+        errors=entry.get("errors") or [],
+        attempts=entry["attempts"],
+        created_at=entry["created_at"],
+        processed_at=entry.get("processed_at")
+    )
+
+
+@router.post("/intake", response_model=OrderIntakeResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_order_intake(
+    order_data: OrderCreate,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_salesperson)
+):
+    """
+    Submit a customer order for asynchronous placement (salesperson only).
+    
+    The order is validated and appended to the order_intake queue, then
+    ``202 Accepted`` is returned with a tracking ID and a ``Location`` header
+    to poll, without waiting for stock to be reserved. Background workers
+    (``ORDER_INTAKE_WORKERS``) claim queued orders in batches and place each
+    batch against one stock snapshot in a single transaction; an order that
+    cannot be fulfilled ends up rejected with the same messages ``POST /orders``
+    would return. The tracking ID becomes the ID of the created order.
+    
+    Returns 503 when no intake workers are configured.
+    """
+    if not order_intake.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Asynchronous order intake is disabled"
+        )
+    
+    try:
+        entry = await store.intake.enqueue(current_user.get("user_id"), {
+            "customer_name": order_data.customer_name,
+            "items": [
+                {"item_id": order_item.item_id, "quantity": order_item.quantity}
+                for order_item in order_data.items
+            ]
+        })
+        order_intake.notify()
         
-        for order_item in order_data.items:
-            # Create order item record
-            order_item_insert_data = {
-                "order_id": order_id,
-                "item_id": order_item.item_id,
-                "quantity": order_item.quantity
-            }
-            
-            order_item_result = db.client.table("order_items").insert(order_item_insert_data).execute()
-            
-            if not order_item_result.data:
-                # Rollback: delete the order if order item creation fails
-                db.client.table("orders").delete().eq("id", order_id).execute()
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create order items"
-                )
-            
-            # Reduce inventory stock level
-            inventory_item = inventory_items[order_item.item_id]
-            new_stock_level = inventory_item["stock_level"] - order_item.quantity
-            
-            stock_update_result = db.client.table("inventory_items").update({
-                "stock_level": new_stock_level
-            }).eq("id", order_item.item_id).execute()
-            
-            if not stock_update_result.data:
-                # Rollback: delete the order and order items if stock update fails
-                db.client.table("orders").delete().eq("id", order_id).execute()
+        return Response(
+            content=_build_intake_response(entry).model_dump_json(),
+            status_code=status.HTTP_202_ACCEPTED,
+            media_type="application/json",
+            headers={"Location": f"{router.prefix}/intake/{entry['id']}"}
+        )
+        
+    except Exception as e:
+        logger.error(f"Submit order intake error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during order submission"
+        )
+
+
+@router.get("/intake/{tracking_id}", response_model=OrderIntakeResponse)
+async def get_order_intake(
+    tracking_id: str,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    Get the state of an order submitted for asynchronous placement (all authenticated users).
+    
+    The status moves from queued to processing to either created, with the
+    order_id of the new order, or rejected, with the reasons. Processed
+    entries can be polled for ``ORDER_INTAKE_RETENTION_SECONDS``.
+    """
+    try:
+        entry = await store.intake.get(tracking_id)
+        
+        if not entry:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order submission not found"
+            )
+        
+        return _build_intake_response(entry)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get order intake error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while retrieving order submission"
+        )
+
+
+@router.get("", response_model=List[OrderResponse])
+async def list_orders(
+    limit: int = Query(
+        settings.order_page_size_default,
+        ge=1,
+        le=settings.order_page_size_max,
+        description="Maximum number of orders to return"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    order_status: Optional[OrderStatus] = Query(None, alias="status", description="Only orders with this status"),
+    created_by: Optional[str] = Query(None, description="Only orders created by this user ID"),
+    created_from: Optional[datetime] = Query(None, description="Only orders created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only orders created before this time"),
+    include_items: bool = Query(False, description="Embed each order's items; otherwise items is empty"),
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    List orders, newest first (all authenticated users).
+    
+    Orders can be filtered by status, creator and a created_at range, and are
+    paginated with a keyset cursor on (created_at, id): when more orders
+    exist, the cursor for the next page is returned in the ``X-Next-Cursor``
+    response header. With ``include_items=true`` each order's items are
+    embedded by the same query, so a page costs one database round trip.
+    """
+    try:
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, len(ORDER_CURSOR_KEYS))
+            except ValueError as e:
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to update inventory stock levels"
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
                 )
-            
-            # Prepare order item response data
-            order_items_data.append(OrderItemResponse(
-                id=order_item_result.data[0]["id"],
-                item_id=order_item.item_id,
-                item_name=inventory_item["name"],
-                quantity=order_item.quantity
-            ))
-        
-        # Return complete order response
-        return OrderResponse(
-            id=created_order["id"],
-            customer_name=created_order["customer_name"],
-            status=OrderStatus(created_order["status"]),
-            items=order_items_data,
-            created_by=created_order["created_by"],
-            created_at=created_order["created_at"],
-            updated_at=created_order["updated_at"]
+        
+        # Fetch one extra row to know whether another page exists
+        rows = await store.orders.list_page(
+            limit + 1,
+            after,
+            status=order_status.value if order_status else None,
+            created_by=created_by,
+            created_from=format_timestamp(created_from) if created_from else None,
+            created_to=format_timestamp(created_to) if created_to else None,
+            include_items=include_items
         )
         
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(
+                [rows[-1][key] for key in ORDER_CURSOR_KEYS]
+            )
+        
+        body = _order_list_adapter.dump_json([_build_order_response(order) for order in rows])
+        return Response(content=body, media_type="application/json", headers=headers)
+        
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Create order error: {str(e)}")
+        logger.error(f"List orders error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error during order creation"
+            detail="Internal server error while retrieving orders"
+        )
+
+
+@router.get("/picking-list", response_model=PickingListResponse)
+async def get_picking_list(
+    order_ids: Optional[List[UUID]] = Query(
+        None,
+        alias="order_id",
+        description="Orders to pick (repeatable); defaults to every order with the given status"
+    ),
+    order_status: OrderStatus = Query(
+        OrderStatus.PENDING,
+        alias="status",
+        description="Status of the orders to pick when no order_id is given"
+    ),
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    Get the combined picking list for many orders (all authenticated users).
+    
+    Sums the quantity of every inventory item over the selected orders, so
+    the warehouse can walk the aisles once instead of order by order. The
+    orders are either the ones given as ``order_id`` parameters or, by
+    default, every pending order. Each line carries the item name, its
+    current stock level and the IDs of the orders that contain it. The lines
+    are aggregated by the database in one grouped query over order_items,
+    ordered by item name.
+    """
+    if order_ids is not None and len(order_ids) > settings.order_picking_list_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.order_picking_list_max_ids} order IDs can be picked per request"
+        )
+    
+    try:
+        lines = await store.orders.picking_list(
+            order_ids=[str(order_id) for order_id in order_ids] if order_ids is not None else None,
+            status=OrderStatus(order_status).value
+        )
+        
+        picking_list = PickingListResponse(
+            order_count=len({order_id for line in lines for order_id in line["order_ids"]}),
+            lines=[PickingListLine(**line) for line in lines]
+        )
+        return Response(content=picking_list.model_dump_json(), media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Get picking list error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while retrieving picking list"
+        )
+
+
+@router.get("/status-stats", response_model=List[OrderStatusDurationStats])
+async def get_order_status_stats(
+    created_from: Optional[datetime] = Query(None, description="Only status periods entered at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only status periods entered before this time"),
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_authenticated_user)
+):
+    """
+    Get time-in-status statistics for orders (all authenticated users).
+    
+    For every order status, reports how many status periods were completed
+    (the order moved on), how many orders are currently in it, and the
+    average, median, 90th percentile and maximum seconds spent in it. The
+    periods come from the order_status_events history (migration 010) and
+    are aggregated by the database in a single query.
+    """
+    try:
+        rows = await store.orders.status_durations(
+            created_from=format_timestamp(created_from) if created_from else None,
+            created_to=format_timestamp(created_to) if created_to else None
+        )
+        
+        # Report every status in state machine order, even without data
+        by_status = {row["status"]: row for row in rows}
+        body = _status_stats_adapter.dump_json([
+            OrderStatusDurationStats(**by_status.get(order_status, {
+                "status": order_status,
+                "completed": 0,
+                "current": 0
+            }))
+            for order_status in ORDER_STATUSES
+        ])
+        return Response(content=body, media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Get order status stats error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while retrieving order status statistics"
         )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order_details(
     order_id: str,
-    db: DatabaseManager = Depends(get_database),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_authenticated_user)
 ):
     """
     Get order details by ID (all authenticated users).
     
     Returns complete order information including items for any authenticated user.
+    The order, its items and the item names are fetched in one query.
     
     Requirements: 6.1, 6.3
     """
     try:
-        # Get order details
-        order_result = db.client.table("orders").select("*").eq("id", order_id).execute()
+        # Get order details with items and inventory item names
+        order = await store.orders.get(order_id)
         
-        if not order_result.data:
+        if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
         
-        order = order_result.data[0]
-        
-        # Get order items with inventory item details
-        order_items_result = db.client.table("order_items").select(
-            "*, inventory_items(name)"
-        ).eq("order_id", order_id).execute()
-        
-        order_items_data = []
-        for order_item in order_items_result.data:
-            order_items_data.append(OrderItemResponse(
-                id=order_item["id"],
-                item_id=order_item["item_id"],
-                item_name=order_item["inventory_items"]["name"],
-                quantity=order_item["quantity"]
-            ))
-        
-        return OrderResponse(
-            id=order["id"],
-            customer_name=order["customer_name"],
-            status=OrderStatus(order["status"]),
-            items=order_items_data,
-            created_by=order["created_by"],
-            created_at=order["created_at"],
-            updated_at=order["updated_at"]
-        )
+        return _build_order_response(order)
         
     except HTTPException:
         raise
@@ -206,73 +601,267 @@ async def get_order_details(
         )
 
 
-@router.put("/{order_id}/status", response_model=OrderResponse)
-async def update_order_status(
+@router.get("/{order_id}/timeline", response_model=OrderTimelineResponse)
+async def get_order_timeline(
     order_id: str,
-    status_update: OrderStatusUpdate,
-    db: DatabaseManager = Depends(get_database),
-    current_user: dict = Depends(require_warehouse_manager_or_admin)
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_authenticated_user)
 ):
     """
-    Update order status (warehouse manager and admin only).
+    Get an order's status history (all authenticated users).
     
-    Updates order status and maintains order history with timestamps.
-    
-    Requirements: 6.1, 6.2, 6.4, 6.5
+    Returns every status the order has been in, oldest first, with when it
+    entered and left each status and the seconds spent there. The history
+    is recorded in order_status_events whenever an order is created or its
+    status changes, and is read with one indexed query.
     """
     try:
-        # Check if order exists
-        order_result = db.client.table("orders").select("*").eq("id", order_id).execute()
+        events = await store.orders.status_timeline(order_id)
         
-        if not order_result.data:
+        # Every order has at least its creation event
+        if not events:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
         
-        current_order = order_result.data[0]
+        return OrderTimelineResponse(
+            order_id=order_id,
+            events=[OrderStatusEvent(**event) for event in events]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get order timeline error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while retrieving order timeline"
+        )
+
+
+def _build_bulk_status_report(new_status: OrderStatus, outcomes: List[Dict[str, Any]]) -> OrderBulkStatusReport:
+    """Classify the per-order results of a bulk status change into a report."""
+    results = []
+    for outcome in outcomes:
+        previous_status = outcome["previous_status"]
+        if outcome["updated"]:
+            result = OrderStatusOutcome.UPDATED
+        elif previous_status is None:
+            result = OrderStatusOutcome.NOT_FOUND
+        elif previous_status == new_status.value:
+            result = OrderStatusOutcome.UNCHANGED
+        else:
+            result = OrderStatusOutcome.INVALID_TRANSITION
+        results.append(OrderBulkStatusResult(
+            order_id=outcome["order_id"],
+            outcome=result,
+            previous_status=previous_status
+        ))
+    
+    updated = sum(1 for result in results if result.outcome == OrderStatusOutcome.UPDATED.value)
+    unchanged = sum(1 for result in results if result.outcome == OrderStatusOutcome.UNCHANGED.value)
+    return OrderBulkStatusReport(
+        status=new_status,
+        updated=updated,
+        unchanged=unchanged,
+        rejected=len(results) - updated - unchanged,
+        results=results
+    )
+
+
+async def _cancel_order(store: DataStore, order_id: str) -> Dict[str, Any]:
+    """
+    Cancel one order, restoring its stock, and return it with its items.
+    
+    An order that is already cancelled is returned unchanged.
+    
+    Raises:
+        HTTPException: 404 if the order does not exist, 409 if it can no
+            longer be cancelled
+    """
+    outcome = (await store.orders.cancel_orders([order_id]))[0]
+    if outcome["previous_status"] is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    if not outcome["updated"] and outcome["previous_status"] != OrderStatus.CANCELLED.value:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot change order status from {outcome['previous_status']} to {OrderStatus.CANCELLED.value}"
+        )
+    if outcome["updated"]:
+        # Stock levels changed, so cached inventory snapshots are stale
+        inventory_cache.invalidate()
+    return await store.orders.get(order_id)
+
+
+@router.post("/cancel", response_model=OrderBulkStatusReport)
+async def cancel_orders(
+    cancel_request: OrderBulkCancel,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Cancel many orders at once (warehouse manager and admin only).
+    
+    Pending and processing orders are cancelled and the quantities of all
+    their lines are added back to inventory with one set-based update, in
+    the same transaction. Fulfilled orders cannot be cancelled. The report
+    has the same shape as ``PUT /orders/status``.
+    """
+    try:
+        if len(cancel_request.order_ids) > settings.order_bulk_status_max_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.order_bulk_status_max_ids} order IDs can be updated per request"
+            )
         
-        # Validate status transition (optional business logic)
-        current_status = OrderStatus(current_order["status"])
-        new_status = status_update.status
+        outcomes = await store.orders.cancel_orders(cancel_request.order_ids)
+        if any(outcome["updated"] for outcome in outcomes):
+            # Stock levels changed, so cached inventory snapshots are stale
+            inventory_cache.invalidate()
         
-        # Update order status
-        update_result = db.client.table("orders").update({
-            "status": new_status.value
-        }).eq("id", order_id).execute()
+        report = _build_bulk_status_report(OrderStatus.CANCELLED, outcomes)
+        return Response(content=report.model_dump_json(), media_type="application/json")
         
-        if not update_result.data:
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk cancel orders error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during bulk order cancellation"
+        )
+
+
+@router.post("/{order_id}/cancel", response_model=OrderResponse)
+async def cancel_order(
+    order_id: str,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Cancel an order and put its stock back (warehouse manager and admin only).
+    
+    A pending or processing order is cancelled and the quantities of its
+    lines are added back to inventory in the same transaction. Cancelling an
+    already cancelled order returns it unchanged; a fulfilled order cannot be
+    cancelled (409).
+    """
+    try:
+        return _build_order_response(await _cancel_order(store, order_id))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Cancel order error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during order cancellation"
+        )
+
+
+@router.put("/status", response_model=OrderBulkStatusReport)
+async def update_order_statuses(
+    status_update: OrderBulkStatusUpdate,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Move many orders to a new status at once (warehouse manager and admin only).
+    
+    Orders follow the pending -> processing -> fulfilled state machine: only
+    orders in the status directly before the target are updated, all with a
+    single set-based update. Moving orders to cancelled works like
+    ``POST /orders/cancel`` and restores their stock. Every requested order gets an outcome:
+    ``updated``, ``unchanged`` (already in the target status),
+    ``invalid_transition`` or ``not_found``, along with the status it had
+    before the request.
+    """
+    try:
+        if len(status_update.order_ids) > settings.order_bulk_status_max_ids:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update order status"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.order_bulk_status_max_ids} order IDs can be updated per request"
+            )
+        
+        new_status = OrderStatus(status_update.status)
+        if new_status == OrderStatus.CANCELLED:
+            outcomes = await store.orders.cancel_orders(status_update.order_ids)
+            if any(outcome["updated"] for outcome in outcomes):
+                inventory_cache.invalidate()
+        else:
+            outcomes = await store.orders.transition_statuses(
+                status_update.order_ids,
+                new_status.value,
+                ORDER_STATUS_TRANSITIONS.get(new_status.value, ())
             )
         
-        updated_order = update_result.data[0]
-        
-        # Get order items with inventory item details for response
-        order_items_result = db.client.table("order_items").select(
-            "*, inventory_items(name)"
-        ).eq("order_id", order_id).execute()
-        
-        order_items_data = []
-        for order_item in order_items_result.data:
-            order_items_data.append(OrderItemResponse(
-                id=order_item["id"],
-                item_id=order_item["item_id"],
-                item_name=order_item["inventory_items"]["name"],
-                quantity=order_item["quantity"]
-            ))
-        
-        return OrderResponse(
-            id=updated_order["id"],
-            customer_name=updated_order["customer_name"],
-            status=OrderStatus(updated_order["status"]),
-            items=order_items_data,
-            created_by=updated_order["created_by"],
-            created_at=updated_order["created_at"],
-            updated_at=updated_order["updated_at"]
+        report = _build_bulk_status_report(new_status, outcomes)
+        return Response(content=report.model_dump_json(), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk update order status error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during bulk order status update"
+        )
+
+
+@router.put("/{order_id}/status", response_model=OrderResponse)
+async def update_order_status(
+    order_id: str,
+    status_update: OrderStatusUpdate,
+    store: DataStore = Depends(get_data_store),
+    current_user: dict = Depends(require_warehouse_manager_or_admin)
+):
+    """
+    Update order status (warehouse manager and admin only).
+    
+    Updates order status and maintains order history with timestamps.
+    Orders follow the pending -> processing -> fulfilled state machine; the
+    update is guarded by the allowed source status and returns its
+    representation with items embedded, so a valid transition is a single
+    round trip. Setting the status an order already has returns it
+    unchanged, and any other transition is rejected with 409. Setting
+    cancelled works like ``POST /orders/{order_id}/cancel`` and restores the
+    order's stock.
+    
+    Requirements: 6.1, 6.2, 6.4, 6.5
+    """
+    try:
+        new_status = OrderStatus(status_update.status)
+        if new_status == OrderStatus.CANCELLED:
+            return _build_order_response(await _cancel_order(store, order_id))
+        
+        # Update order status and return the updated order with its items
+        updated_order = await store.orders.set_status(
+            order_id,
+            new_status.value,
+            ORDER_STATUS_TRANSITIONS.get(new_status.value, ())
         )
         
+        if not updated_order:
+            # Either the order does not exist or the transition is not allowed
+            order = await store.orders.get(order_id)
+            if not order:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Order not found"
+                )
+            if order["status"] != new_status.value:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Cannot change order status from {order['status']} to {new_status.value}"
+                )
+            updated_order = order
+        
+        return _build_order_response(updated_order)
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -280,4 +869,4 @@ async def update_order_status(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during order status update"
-        )
\ No newline at end of file
+        )
@@ -5,7 +5,8 @@ from typing import List
 from fastapi import APIRouter, HTTPException, status, Depends
 from ..models.user import UserCreate, UserResponse
 from ..auth.dependencies import require_admin
-from ..database import get_database, DatabaseManager
+from ..repositories import DataStore, get_data_store
+from ..utils.exceptions import ResourceConflictError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ router = APIRouter(prefix="/users", tags=["user_management"])
 @router.post("/invite", response_model=UserResponse)
 async def invite_user(
     user_data: UserCreate,
-    db: DatabaseManager = Depends(get_database),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -28,9 +29,9 @@ async def invite_user(
     """
     try:
         # Check if user with this email already exists
-        existing_user_result = db.client.table("users").select("*").eq("email", user_data.email).execute()
+        existing_user = await store.users.get_by_email(user_data.email)
         
-        if existing_user_result.data:
+        if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="User with this email already exists"
@@ -51,16 +52,15 @@ async def invite_user(
             "status": "invited"
         }
         
-        result = db.client.table("users").insert(insert_data).execute()
-        
-        if not result.data:
+        try:
+            created_user = await store.users.create(insert_data)
+        except ResourceConflictError:
+            # Invited concurrently between the check above and the insert
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create user invitation"
+                status_code=status.HTTP_409_CONFLICT,
+                detail="User with this email already exists"
             )
         
-        created_user = result.data[0]
-        
         # Return user response
         return UserResponse(
             id=created_user["id"],
@@ -86,7 +86,7 @@ async def invite_user(
 
 @router.get("", response_model=List[UserResponse])
 async def list_users(
-    db: DatabaseManager = Depends(get_database),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -98,10 +98,10 @@ async def list_users(
     """
     try:
         # Get all users with invited and active status
-        result = db.client.table("users").select("*").in_("status", ["invited", "active"]).execute()
+        user_rows = await store.users.list_by_status(["invited", "active"])
         
         users = []
-        for user_data in result.data:
+        for user_data in user_rows:
             users.append(UserResponse(
                 id=user_data["id"],
                 email=user_data["email"],
@@ -127,7 +127,7 @@ async def list_users(
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: str,
-    db: DatabaseManager = Depends(get_database),
+    store: DataStore = Depends(get_data_store),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -139,9 +139,9 @@ async def delete_user(
     """
     try:
         # Check if user exists
-        existing_user_result = db.client.table("users").select("*").eq("id", user_id).execute()
+        existing_user = await store.users.get_by_id(user_id)
         
-        if not existing_user_result.data:
+        if not existing_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
@@ -155,9 +155,9 @@ async def delete_user(
             )
         
         # Delete the user
-        delete_result = db.client.table("users").delete().eq("id", user_id).execute()
+        deleted = await store.users.delete(user_id)
         
-        if not delete_result.data:
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to delete user"
@@ -28,7 +28,29 @@ from .exceptions import (
     UnauthorizedRoleError,
     UserNotActiveError,
     EmailNotInvitedError,
-    DuplicateEmailError
+    DuplicateEmailError,
+    IdempotencyKeyReuseError,
+    IdempotencyKeyInProgressError
+)
+
+from .pagination import (
+    encode_cursor,
+    decode_cursor,
+    quote_filter_value
+)
+
+from .order_import import (
+    ImportRow,
+    parse_csv_orders,
+    parse_ndjson_orders
+)
+
+from .inventory_import import (
+    ItemImportRow,
+    parse_csv_items,
+    parse_ndjson_items,
+    write_csv_results,
+    write_ndjson_results
 )
 
 from .error_handlers import (
@@ -67,6 +89,25 @@ __all__ = [
     "UserNotActiveError",
     "EmailNotInvitedError",
     "DuplicateEmailError",
+    "IdempotencyKeyReuseError",
+    "IdempotencyKeyInProgressError",
+    
+    # Pagination
+    "encode_cursor",
+    "decode_cursor",
+    "quote_filter_value",
+    
+    # Bulk order import
+    "ImportRow",
+    "parse_csv_orders",
+    "parse_ndjson_orders",
+    
+    # Bulk inventory import
+    "ItemImportRow",
+    "parse_csv_items",
+    "parse_ndjson_items",
+    "write_csv_results",
+    "write_ndjson_results",
     
     # Error handlers
     "ErrorResponse",
@@ -85,4 +85,13 @@ class EmailNotInvitedError(AuthorizationError):
 
 class DuplicateEmailError(ResourceConflictError):
     """Raised when attempting to create user with existing email."""
-    pass
\ No newline at end of file
+    pass
+
+class IdempotencyKeyReuseError(ValidationError):
+    """Raised when an idempotency key is reused with a different request payload."""
+    pass
+
+
+class IdempotencyKeyInProgressError(ResourceConflictError):
+    """Raised when the original request for an idempotency key is still being processed."""
+    pass
@@ -0,0 +1,127 @@
+"""
+Streaming parsers and outcome writers for bulk inventory import.
+
+Both formats are decoded incrementally from the request stream, so only the
+current line is held in memory while parsing.
+
+NDJSON: one item per line, shaped like the ``POST /inventory`` body::
+
+    {"name": "Plywood 18mm 2440x1220", "description": "Birch", "stock_level": 40, "low_stock_threshold": 10}
+
+CSV: a header row followed by one item per row, with columns ``name``,
+``stock_level``, ``low_stock_threshold`` and an optional ``description``; an
+empty description counts as none. Quoted fields must not contain line
+breaks.
+
+The outcome file has one record per imported row in the format of the
+upload: ``row``, ``name``, ``status``, ``item_id`` and ``errors``.
+"""
+from typing import Any, AsyncIterator, Iterable, List, NamedTuple, Optional
+import csv
+import io
+import json
+
+from pydantic import ValidationError as PydanticValidationError
+
+from ..models.inventory import InventoryItemCreate, InventoryImportResult
+from .exceptions import ValidationError
+from .order_import import error_messages, iter_lines
+
+CSV_REQUIRED_COLUMNS = ("name", "stock_level", "low_stock_threshold")
+CSV_RESULT_COLUMNS = ("row", "name", "status", "item_id", "errors")
+
+
+class ItemImportRow(NamedTuple):
+    """One parsed item: ``item`` is None and ``errors`` is set when it is invalid."""
+    row: int
+    name: Optional[str]
+    item: Optional[InventoryItemCreate]
+    errors: List[str]
+
+
+def _validate(row: int, data: Any) -> ItemImportRow:
+    name = data.get("name") if isinstance(data, dict) else None
+    if name is not None:
+        name = str(name)
+    try:
+        item = InventoryItemCreate.model_validate(data)
+    except PydanticValidationError as e:
+        return ItemImportRow(row, name, None, error_messages(e))
+    return ItemImportRow(row, item.name, item, [])
+
+
+async def parse_ndjson_items(chunks: AsyncIterator[bytes]) -> AsyncIterator[ItemImportRow]:
+    """
+    Parse an NDJSON import body, one item per non-blank line.
+
+    Args:
+        chunks: Request body stream
+
+    Yields:
+        ItemImportRow per item, numbered by line
+    """
+    async for line_number, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ItemImportRow(line_number, None, None, [f"Invalid JSON: {e.msg}"])
+            continue
+        yield _validate(line_number, data)
+
+
+async def parse_csv_items(chunks: AsyncIterator[bytes]) -> AsyncIterator[ItemImportRow]:
+    """
+    Parse a CSV import body, one item per row.
+
+    Args:
+        chunks: Request body stream
+
+    Yields:
+        ItemImportRow per item, numbered by line (the header is line 1)
+
+    Raises:
+        ValidationError: If the header lacks a required column
+    """
+    header: Optional[List[str]] = None
+
+    async for line_number, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        record = next(csv.reader([line]))
+        if header is None:
+            header = [column.strip().lower() for column in record]
+            missing = [column for column in CSV_REQUIRED_COLUMNS if column not in header]
+            if missing:
+                raise ValidationError(f"CSV header is missing required columns: {', '.join(missing)}")
+            continue
+
+        values = dict(zip(header, (value.strip() for value in record)))
+        yield _validate(line_number, {
+            "name": values.get("name", ""),
+            "description": values.get("description") or None,
+            "stock_level": values.get("stock_level", ""),
+            "low_stock_threshold": values.get("low_stock_threshold", "")
+        })
+
+
+def write_ndjson_results(results: Iterable[InventoryImportResult]) -> bytes:
+    """Serialize import outcomes as NDJSON, one result per line."""
+    return b"".join(result.model_dump_json().encode("utf-8") + b"\n" for result in results)
+
+
+def write_csv_results(results: Iterable[InventoryImportResult]) -> bytes:
+    """Serialize import outcomes as CSV with a header row; errors are joined with '; '."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_RESULT_COLUMNS)
+    for result in results:
+        writer.writerow([
+            result.row,
+            result.name or "",
+            result.status,
+            result.item_id or "",
+            "; ".join(result.errors)
+        ])
+    return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,150 @@
+"""
+Streaming parsers for bulk order import bodies.
+
+Both formats are decoded incrementally from the request stream, so only the
+current line (and, for CSV, the order being assembled) is held in memory.
+
+NDJSON: one order per line, shaped like the ``POST /orders`` body plus an
+optional ``reference``::
+
+    {"reference": "PO-1", "customer_name": "Acme", "items": [{"item_id": "...", "quantity": 2}]}
+
+CSV: a header row followed by one order line per row, with columns
+``customer_name``, ``item_id``, ``quantity`` and an optional ``reference``.
+Consecutive rows sharing a non-empty reference form one order; rows without
+a reference are orders of their own. Quoted fields must not contain line
+breaks.
+"""
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+import codecs
+import csv
+import json
+
+from pydantic import ValidationError as PydanticValidationError
+
+from ..models.order import OrderImportRow
+from .exceptions import ValidationError
+
+CSV_REQUIRED_COLUMNS = ("customer_name", "item_id", "quantity")
+
+
+class ImportRow(NamedTuple):
+    """One parsed order: ``order`` is None and ``errors`` is set when it is invalid."""
+    row: int
+    reference: Optional[str]
+    order: Optional[OrderImportRow]
+    errors: List[str]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Split a byte stream into decoded lines.
+
+    Args:
+        chunks: UTF-8 encoded body chunks; a leading byte order mark is dropped
+
+    Yields:
+        Tuple of the 1-based line number and the line without its line break
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        if "\n" not in buffer:
+            continue
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip("\r")
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield line_number + 1, buffer.rstrip("\r")
+
+
+def error_messages(error: PydanticValidationError) -> List[str]:
+    """Flatten a pydantic validation error into one message per field."""
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return messages
+
+
+def _validate(row: int, data: Any) -> ImportRow:
+    reference = data.get("reference") if isinstance(data, dict) else None
+    if reference is not None:
+        reference = str(reference)
+    try:
+        order = OrderImportRow.model_validate(data)
+    except PydanticValidationError as e:
+        return ImportRow(row, reference, None, error_messages(e))
+    return ImportRow(row, order.reference, order, [])
+
+
+async def parse_ndjson_orders(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRow]:
+    """
+    Parse an NDJSON import body, one order per non-blank line.
+
+    Args:
+        chunks: Request body stream
+
+    Yields:
+        ImportRow per order, numbered by line
+    """
+    async for line_number, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ImportRow(line_number, None, None, [f"Invalid JSON: {e.msg}"])
+            continue
+        yield _validate(line_number, data)
+
+
+async def parse_csv_orders(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRow]:
+    """
+    Parse a CSV import body, grouping consecutive rows with the same reference into one order.
+
+    Args:
+        chunks: Request body stream
+
+    Yields:
+        ImportRow per order, numbered by the line of its first row (the header is line 1)
+
+    Raises:
+        ValidationError: If the header lacks a required column
+    """
+    header: Optional[List[str]] = None
+    group: Optional[Dict[str, Any]] = None
+
+    async for line_number, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        record = next(csv.reader([line]))
+        if header is None:
+            header = [column.strip().lower() for column in record]
+            missing = [column for column in CSV_REQUIRED_COLUMNS if column not in header]
+            if missing:
+                raise ValidationError(f"CSV header is missing required columns: {', '.join(missing)}")
+            continue
+
+        values = dict(zip(header, (value.strip() for value in record)))
+        reference = values.get("reference") or None
+        if group is not None and (reference is None or reference != group["reference"]):
+            yield _validate(group.pop("row"), group)
+            group = None
+        if group is None:
+            group = {
+                "row": line_number,
+                "reference": reference,
+                "customer_name": values.get("customer_name", ""),
+                "items": []
+            }
+        group["items"].append({"item_id": values.get("item_id", ""), "quantity": values.get("quantity", "")})
+
+    if group is not None:
+        yield _validate(group.pop("row"), group)
@@ -0,0 +1,67 @@
+"""
+Keyset pagination helpers.
+
+Cursors are opaque, URL-safe tokens that encode the sort key values of the
+last row returned, so the next page can resume with a range filter on an
+index instead of an OFFSET scan.
+"""
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key values of the last returned row as a cursor.
+
+    Args:
+        values: Sort key values in ORDER BY order
+
+    Returns:
+        str: Opaque URL-safe cursor
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Opaque cursor string
+        expected_length: Number of sort key values the cursor must contain
+
+    Returns:
+        list: Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise ValueError("Invalid cursor: unexpected format")
+
+    return values
+
+
+def quote_filter_value(value: Any) -> str:
+    """
+    Quote a value for use inside a PostgREST logical filter such as ``or=(...)``.
+
+    Values containing reserved characters (commas, parentheses, dots, quotes)
+    must be double-quoted with embedded quotes and backslashes escaped.
+
+    Args:
+        value: Filter value
+
+    Returns:
+        str: Quoted value safe to embed in the filter expression
+    """
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
@@ -0,0 +1,103 @@
+-- Migration 003: Atomic order placement
+-- Creates the place_order function used by POST /orders
+-- Validates stock, inserts the order and its items, and decrements stock in a single transaction
+
+CREATE OR REPLACE FUNCTION place_order(
+    p_customer_name VARCHAR,
+    p_created_by UUID,
+    p_items JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_order orders%ROWTYPE;
+    v_errors TEXT[];
+    v_items JSONB;
+BEGIN
+    IF p_items IS NULL OR jsonb_array_length(p_items) = 0 THEN
+        RAISE EXCEPTION 'Order must contain at least one item'
+            USING HINT = 'invalid_order';
+    END IF;
+
+    -- Lock every referenced inventory row in a stable order so concurrent
+    -- orders for the same items serialize instead of deadlocking
+    PERFORM 1
+    FROM inventory_items
+    WHERE id IN (SELECT DISTINCT (line->>'item_id')::UUID FROM jsonb_array_elements(p_items) AS line)
+    ORDER BY id
+    FOR UPDATE;
+
+    -- Validate availability against the total quantity requested per item
+    SELECT array_agg(
+        CASE
+            WHEN inv.id IS NULL THEN format('Inventory item %s not found', requested.item_id)
+            ELSE format(
+                'Insufficient stock for item ''%s''. Requested: %s, Available: %s',
+                inv.name, requested.quantity, inv.stock_level
+            )
+        END
+        ORDER BY requested.first_line
+    )
+    INTO v_errors
+    FROM (
+        SELECT
+            (line->>'item_id')::UUID AS item_id,
+            SUM((line->>'quantity')::INTEGER) AS quantity,
+            MIN(position) AS first_line
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS lines(line, position)
+        GROUP BY 1
+    ) AS requested
+    LEFT JOIN inventory_items inv ON inv.id = requested.item_id
+    WHERE inv.id IS NULL OR inv.stock_level < requested.quantity;
+
+    IF v_errors IS NOT NULL THEN
+        RAISE EXCEPTION 'Insufficient stock'
+            USING DETAIL = array_to_json(v_errors)::TEXT,
+                  HINT = 'insufficient_stock';
+    END IF;
+
+    INSERT INTO orders (customer_name, status, created_by)
+    VALUES (p_customer_name, 'pending', p_created_by)
+    RETURNING * INTO v_order;
+
+    WITH inserted AS (
+        INSERT INTO order_items (order_id, item_id, quantity)
+        SELECT v_order.id, (line->>'item_id')::UUID, (line->>'quantity')::INTEGER
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS lines(line, position)
+        ORDER BY position
+        RETURNING id, item_id, quantity
+    )
+    SELECT jsonb_agg(jsonb_build_object(
+        'id', inserted.id,
+        'item_id', inserted.item_id,
+        'item_name', inv.name,
+        'quantity', inserted.quantity
+    ))
+    INTO v_items
+    FROM inserted
+    JOIN inventory_items inv ON inv.id = inserted.item_id;
+
+    UPDATE inventory_items inv
+    SET stock_level = inv.stock_level - requested.quantity
+    FROM (
+        SELECT (line->>'item_id')::UUID AS item_id, SUM((line->>'quantity')::INTEGER) AS quantity
+        FROM jsonb_array_elements(p_items) AS line
+        GROUP BY 1
+    ) AS requested
+    WHERE inv.id = requested.item_id;
+
+    RETURN jsonb_build_object(
+        'id', v_order.id,
+        'customer_name', v_order.customer_name,
+        'status', v_order.status,
+        'created_by', v_order.created_by,
+        'created_at', v_order.created_at,
+        'updated_at', v_order.updated_at,
+        'items', COALESCE(v_items, '[]'::JSONB)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION place_order(VARCHAR, UUID, JSONB) IS 'Atomically validates stock, creates an order with its items and decrements inventory';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,106 @@
+-- Migration 004: Guarded stock adjustment
+-- Creates the adjust_stock function, a race-free conditional stock update
+-- Rebuilds place_order on top of it so orders never read-modify-write stock levels
+
+-- Apply a signed delta to an item's stock level in one statement.
+-- Returns the updated row, or no rows when the item does not exist or the
+-- adjustment would take stock below zero.
+CREATE OR REPLACE FUNCTION adjust_stock(
+    p_item_id UUID,
+    p_delta INTEGER
+)
+RETURNS SETOF inventory_items AS $$
+    UPDATE inventory_items
+    SET stock_level = stock_level + p_delta
+    WHERE id = p_item_id
+      AND stock_level + p_delta >= 0
+    RETURNING *;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION place_order(
+    p_customer_name VARCHAR,
+    p_created_by UUID,
+    p_items JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_order orders%ROWTYPE;
+    v_errors TEXT[] := ARRAY[]::TEXT[];
+    v_requested RECORD;
+    v_item inventory_items%ROWTYPE;
+    v_items JSONB;
+BEGIN
+    IF p_items IS NULL OR jsonb_array_length(p_items) = 0 THEN
+        RAISE EXCEPTION 'Order must contain at least one item'
+            USING HINT = 'invalid_order';
+    END IF;
+
+    -- Decrement stock per item with the guarded update, in id order so that
+    -- concurrent orders touching the same items cannot deadlock
+    FOR v_requested IN
+        SELECT
+            (line->>'item_id')::UUID AS item_id,
+            SUM((line->>'quantity')::INTEGER)::INTEGER AS quantity
+        FROM jsonb_array_elements(p_items) AS line
+        GROUP BY 1
+        ORDER BY 1
+    LOOP
+        PERFORM 1 FROM adjust_stock(v_requested.item_id, -v_requested.quantity);
+
+        IF NOT FOUND THEN
+            SELECT * INTO v_item FROM inventory_items WHERE id = v_requested.item_id;
+            IF NOT FOUND THEN
+                v_errors := v_errors || format('Inventory item %s not found', v_requested.item_id);
+            ELSE
+                v_errors := v_errors || format(
+                    'Insufficient stock for item ''%s''. Requested: %s, Available: %s',
+                    v_item.name, v_requested.quantity, v_item.stock_level
+                );
+            END IF;
+        END IF;
+    END LOOP;
+
+    -- Raising rolls back every decrement applied above
+    IF array_length(v_errors, 1) > 0 THEN
+        RAISE EXCEPTION 'Insufficient stock'
+            USING DETAIL = array_to_json(v_errors)::TEXT,
+                  HINT = 'insufficient_stock';
+    END IF;
+
+    INSERT INTO orders (customer_name, status, created_by)
+    VALUES (p_customer_name, 'pending', p_created_by)
+    RETURNING * INTO v_order;
+
+    WITH inserted AS (
+        INSERT INTO order_items (order_id, item_id, quantity)
+        SELECT v_order.id, (line->>'item_id')::UUID, (line->>'quantity')::INTEGER
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS lines(line, position)
+        ORDER BY position
+        RETURNING id, item_id, quantity
+    )
+    SELECT jsonb_agg(jsonb_build_object(
+        'id', inserted.id,
+        'item_id', inserted.item_id,
+        'item_name', inv.name,
+        'quantity', inserted.quantity
+    ))
+    INTO v_items
+    FROM inserted
+    JOIN inventory_items inv ON inv.id = inserted.item_id;
+
+    RETURN jsonb_build_object(
+        'id', v_order.id,
+        'customer_name', v_order.customer_name,
+        'status', v_order.status,
+        'created_by', v_order.created_by,
+        'created_at', v_order.created_at,
+        'updated_at', v_order.updated_at,
+        'items', COALESCE(v_items, '[]'::JSONB)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION adjust_stock(UUID, INTEGER) IS 'Applies a signed stock delta only if the result stays non-negative; returns the updated row';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,25 @@
+-- Migration 005: Low stock lookups
+-- Adds a partial expression index over items at or below their low stock threshold
+-- Creates the low_stock_items function used by GET /inventory/low-stock
+
+-- Only low stock rows are indexed, so the index stays proportional to the
+-- number of alerts rather than the size of the catalog. Rows are keyed by how
+-- far they are below threshold so the endpoint's ORDER BY is an index scan.
+CREATE INDEX IF NOT EXISTS idx_inventory_items_low_stock
+    ON inventory_items ((stock_level - low_stock_threshold), name)
+    WHERE stock_level <= low_stock_threshold;
+
+-- Return items at or below their low stock threshold, furthest below first
+CREATE OR REPLACE FUNCTION low_stock_items(p_limit INTEGER DEFAULT NULL)
+RETURNS SETOF inventory_items AS $$
+    SELECT *
+    FROM inventory_items
+    WHERE stock_level <= low_stock_threshold
+    ORDER BY stock_level - low_stock_threshold, name
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION low_stock_items(INTEGER) IS 'Items at or below their low stock threshold, ordered by shortfall (largest first)';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
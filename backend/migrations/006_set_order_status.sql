@@ -0,0 +1,20 @@
+-- Migration 006: Order status updates with representation
+-- Creates the set_order_status function used by PUT /orders/{order_id}/status
+-- Returning the orders row type lets PostgREST embed order_items in the same response
+
+-- Update an order's status and return the updated row (no rows if the order does not exist)
+CREATE OR REPLACE FUNCTION set_order_status(
+    p_order_id UUID,
+    p_status VARCHAR
+)
+RETURNS SETOF orders AS $$
+    UPDATE orders
+    SET status = p_status
+    WHERE id = p_order_id
+    RETURNING *;
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION set_order_status(UUID, VARCHAR) IS 'Sets an order status and returns the updated order row';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,53 @@
+-- Migration 007: Idempotency keys for order creation
+-- Stores the response of each POST /orders made with an Idempotency-Key header
+-- so retries replay the original order instead of creating a duplicate
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope VARCHAR(64) NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    response TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+
+-- Expired keys are purged with a range scan on expires_at
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+
+-- Claim a key for a new request. Returns no rows when the caller now owns the
+-- key (it was unused or expired); otherwise returns the existing record, whose
+-- response is NULL while the original request is still in progress.
+CREATE OR REPLACE FUNCTION claim_idempotency_key(
+    p_scope VARCHAR,
+    p_key VARCHAR,
+    p_request_hash VARCHAR,
+    p_ttl_seconds INTEGER
+)
+RETURNS SETOF idempotency_keys AS $$
+BEGIN
+    INSERT INTO idempotency_keys (scope, key, request_hash, expires_at)
+    VALUES (p_scope, p_key, p_request_hash, NOW() + make_interval(secs => p_ttl_seconds))
+    ON CONFLICT (scope, key) DO UPDATE
+        SET request_hash = EXCLUDED.request_hash,
+            response = NULL,
+            created_at = NOW(),
+            expires_at = EXCLUDED.expires_at
+        WHERE idempotency_keys.expires_at <= NOW();
+
+    IF FOUND THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT * FROM idempotency_keys WHERE scope = p_scope AND key = p_key;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE idempotency_keys IS 'Stored responses for requests made with an Idempotency-Key header';
+COMMENT ON COLUMN idempotency_keys.scope IS 'Owner of the key (the authenticated user ID)';
+COMMENT ON COLUMN idempotency_keys.response IS 'Serialized response body, NULL while the request is in progress';
+COMMENT ON FUNCTION claim_idempotency_key(VARCHAR, VARCHAR, VARCHAR, INTEGER) IS 'Claims an idempotency key or returns the existing record';
+
+-- Make the new table and function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,113 @@
+-- Migration 008: Bulk order import
+-- Creates the import_orders function used by POST /orders/import to place a
+-- whole batch of orders in one round trip and one transaction
+
+-- Validate a batch of orders in sequence against one locked stock snapshot,
+-- then write the accepted ones with one stock update and two multi-row inserts.
+-- Every order is checked against the stock left by the orders accepted before
+-- it; rejected orders write nothing. Returns one result per order, in input
+-- order: {"status": "created", "order_id": ...} or {"status": "rejected", "errors": [...]}.
+CREATE OR REPLACE FUNCTION import_orders(
+    p_created_by UUID,
+    p_orders JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_stock JSONB;
+    v_names JSONB;
+    v_order JSONB;
+    v_line RECORD;
+    v_errors JSONB;
+    v_order_id UUID;
+    v_accepted JSONB := '[]'::JSONB;
+    v_results JSONB := '[]'::JSONB;
+BEGIN
+    -- Lock every item the batch references once, in id order so concurrent
+    -- imports and orders cannot deadlock, and snapshot its stock level.
+    -- Item IDs that are not valid UUIDs are simply reported as not found.
+    SELECT COALESCE(jsonb_object_agg(id, stock_level), '{}'::JSONB),
+           COALESCE(jsonb_object_agg(id, name), '{}'::JSONB)
+    INTO v_stock, v_names
+    FROM (
+        SELECT id, name, stock_level
+        FROM inventory_items
+        WHERE id IN (
+            SELECT (line->>'item_id')::UUID
+            FROM jsonb_array_elements(p_orders) AS orders(entry),
+                 jsonb_array_elements(entry->'items') AS lines(line)
+            WHERE line->>'item_id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        )
+        ORDER BY id
+        FOR UPDATE
+    ) AS locked;
+
+    FOR v_order IN SELECT entry FROM jsonb_array_elements(p_orders) AS orders(entry)
+    LOOP
+        v_errors := '[]'::JSONB;
+        FOR v_line IN
+            SELECT lower(line->>'item_id') AS item_id, SUM((line->>'quantity')::INTEGER)::INTEGER AS quantity
+            FROM jsonb_array_elements(v_order->'items') AS lines(line)
+            GROUP BY 1
+            ORDER BY 1
+        LOOP
+            IF NOT v_stock ? v_line.item_id THEN
+                v_errors := v_errors || to_jsonb(format('Inventory item %s not found', v_line.item_id));
+            ELSIF (v_stock->>v_line.item_id)::INTEGER < v_line.quantity THEN
+                v_errors := v_errors || to_jsonb(format(
+                    'Insufficient stock for item ''%s''. Requested: %s, Available: %s',
+                    v_names->>v_line.item_id, v_line.quantity, v_stock->>v_line.item_id
+                ));
+            END IF;
+        END LOOP;
+
+        IF jsonb_array_length(v_errors) > 0 THEN
+            v_results := v_results || jsonb_build_array(jsonb_build_object('status', 'rejected', 'errors', v_errors));
+            CONTINUE;
+        END IF;
+
+        -- Take the stock from the snapshot so later orders in the batch see it
+        FOR v_line IN
+            SELECT lower(line->>'item_id') AS item_id, SUM((line->>'quantity')::INTEGER)::INTEGER AS quantity
+            FROM jsonb_array_elements(v_order->'items') AS lines(line)
+            GROUP BY 1
+        LOOP
+            v_stock := jsonb_set(
+                v_stock,
+                ARRAY[v_line.item_id],
+                to_jsonb((v_stock->>v_line.item_id)::INTEGER - v_line.quantity)
+            );
+        END LOOP;
+
+        v_order_id := uuid_generate_v4();
+        v_accepted := v_accepted || jsonb_build_array(jsonb_build_object(
+            'id', v_order_id,
+            'customer_name', v_order->>'customer_name',
+            'items', v_order->'items'
+        ));
+        v_results := v_results || jsonb_build_array(jsonb_build_object('status', 'created', 'order_id', v_order_id));
+    END LOOP;
+
+    -- Write the accepted orders: one stock update and two multi-row inserts
+    UPDATE inventory_items AS i
+    SET stock_level = s.stock_level::INTEGER
+    FROM jsonb_each_text(v_stock) AS s(item_id, stock_level)
+    WHERE i.id = s.item_id::UUID
+      AND i.stock_level <> s.stock_level::INTEGER;
+
+    INSERT INTO orders (id, customer_name, status, created_by)
+    SELECT (entry->>'id')::UUID, entry->>'customer_name', 'pending', p_created_by
+    FROM jsonb_array_elements(v_accepted) AS accepted(entry);
+
+    INSERT INTO order_items (order_id, item_id, quantity)
+    SELECT (entry->>'id')::UUID, (line->>'item_id')::UUID, (line->>'quantity')::INTEGER
+    FROM jsonb_array_elements(v_accepted) AS accepted(entry),
+         jsonb_array_elements(entry->'items') AS lines(line);
+
+    RETURN v_results;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION import_orders(UUID, JSONB) IS 'Places a batch of orders against one locked stock snapshot, returning one result per order';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
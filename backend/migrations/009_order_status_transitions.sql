@@ -0,0 +1,60 @@
+-- Migration 009: Guarded order status transitions
+-- Adds an optional from-status guard to set_order_status and creates
+-- transition_order_statuses for bulk updates with per-order outcomes
+
+-- The signature changes, so drop the two-argument version from migration 006
+DROP FUNCTION IF EXISTS set_order_status(UUID, VARCHAR);
+
+-- Update an order's status and return the updated row. When p_from_statuses
+-- is given, the order is only updated if its current status is one of them;
+-- no rows are returned if the order does not exist or the guard fails.
+CREATE OR REPLACE FUNCTION set_order_status(
+    p_order_id UUID,
+    p_status VARCHAR,
+    p_from_statuses VARCHAR[] DEFAULT NULL
+)
+RETURNS SETOF orders AS $$
+    UPDATE orders
+    SET status = p_status
+    WHERE id = p_order_id
+      AND (p_from_statuses IS NULL OR status = ANY(p_from_statuses))
+    RETURNING *;
+$$ LANGUAGE sql;
+
+-- Move many orders to p_status in one set-based update. Only orders whose
+-- current status is in p_from_statuses change. Returns one row per distinct
+-- requested ID with the status it had before the update (NULL if the order
+-- does not exist or the ID is not a UUID) and whether it was updated.
+CREATE OR REPLACE FUNCTION transition_order_statuses(
+    p_order_ids TEXT[],
+    p_status VARCHAR,
+    p_from_statuses VARCHAR[]
+)
+RETURNS TABLE (order_id TEXT, previous_status VARCHAR, updated BOOLEAN) AS $$
+    WITH requested AS (
+        SELECT DISTINCT
+            r.id,
+            CASE
+                WHEN r.id ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN r.id::UUID
+            END AS order_uuid
+        FROM unnest(p_order_ids) AS r(id)
+    ), changed AS (
+        UPDATE orders AS o
+        SET status = p_status
+        FROM requested AS r
+        WHERE o.id = r.order_uuid
+          AND o.status = ANY(p_from_statuses)
+        RETURNING o.id
+    )
+    -- The outer query sees the orders table as it was before the update
+    SELECT r.id, o.status, c.id IS NOT NULL
+    FROM requested AS r
+    LEFT JOIN orders AS o ON o.id = r.order_uuid
+    LEFT JOIN changed AS c ON c.id = r.order_uuid;
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION set_order_status(UUID, VARCHAR, VARCHAR[]) IS 'Sets an order status, optionally only from the given statuses, and returns the updated order row';
+COMMENT ON FUNCTION transition_order_statuses(TEXT[], VARCHAR, VARCHAR[]) IS 'Moves many orders to a status in one update, returning the outcome per order';
+
+-- Make the new functions visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,121 @@
+-- Migration 010: Order status history
+-- Creates the append-only order_status_events table, filled by triggers on
+-- orders, plus functions for an order's timeline and time-in-status statistics
+
+CREATE TABLE IF NOT EXISTS order_status_events (
+    id BIGSERIAL PRIMARY KEY,
+    order_id UUID NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Timelines read one order's events in time order
+CREATE INDEX IF NOT EXISTS idx_order_status_events_order_id_created_at ON order_status_events(order_id, created_at);
+-- Statistics select the events that fall in a time range
+CREATE INDEX IF NOT EXISTS idx_order_status_events_created_at ON order_status_events(created_at);
+
+-- Record the initial status of new orders and every status change
+CREATE OR REPLACE FUNCTION record_order_status_event()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO order_status_events (order_id, status)
+    VALUES (NEW.id, NEW.status);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_order_created_event ON orders;
+CREATE TRIGGER record_order_created_event
+    AFTER INSERT ON orders
+    FOR EACH ROW EXECUTE FUNCTION record_order_status_event();
+
+DROP TRIGGER IF EXISTS record_order_status_change_event ON orders;
+CREATE TRIGGER record_order_status_change_event
+    AFTER UPDATE OF status ON orders
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION record_order_status_event();
+
+-- Backfill orders created before this migration: creation as pending, and
+-- the current status as of the last update when it differs
+INSERT INTO order_status_events (order_id, status, created_at)
+SELECT o.id, 'pending', o.created_at
+FROM orders o
+WHERE NOT EXISTS (SELECT 1 FROM order_status_events e WHERE e.order_id = o.id);
+
+INSERT INTO order_status_events (order_id, status, created_at)
+SELECT o.id, o.status, o.updated_at
+FROM orders o
+WHERE o.status <> 'pending'
+  AND NOT EXISTS (SELECT 1 FROM order_status_events e WHERE e.order_id = o.id AND e.status = o.status);
+
+-- An order's status events in time order, with when each status was left
+-- (NULL for the current status) and how many seconds the order spent in it
+CREATE OR REPLACE FUNCTION order_status_timeline(p_order_id UUID)
+RETURNS TABLE (
+    status VARCHAR,
+    entered_at TIMESTAMP WITH TIME ZONE,
+    left_at TIMESTAMP WITH TIME ZONE,
+    duration_seconds DOUBLE PRECISION
+) AS $$
+    SELECT
+        e.status,
+        e.created_at,
+        LEAD(e.created_at) OVER w,
+        EXTRACT(EPOCH FROM LEAD(e.created_at) OVER w - e.created_at)::DOUBLE PRECISION
+    FROM order_status_events e
+    WHERE e.order_id = p_order_id
+    WINDOW w AS (ORDER BY e.created_at, e.id)
+    ORDER BY e.created_at, e.id;
+$$ LANGUAGE sql STABLE;
+
+-- Time spent in each status, over status periods entered in [p_from, p_to)
+-- (either bound may be NULL). completed counts periods the order has left;
+-- current counts orders still in the status. Percentiles are nearest-rank.
+CREATE OR REPLACE FUNCTION order_status_durations(
+    p_from TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_to TIMESTAMP WITH TIME ZONE DEFAULT NULL
+)
+RETURNS TABLE (
+    status VARCHAR,
+    completed BIGINT,
+    current BIGINT,
+    avg_seconds DOUBLE PRECISION,
+    p50_seconds DOUBLE PRECISION,
+    p90_seconds DOUBLE PRECISION,
+    max_seconds DOUBLE PRECISION
+) AS $$
+    WITH scoped AS (
+        SELECT DISTINCT order_id
+        FROM order_status_events
+        WHERE (p_from IS NULL OR created_at >= p_from)
+          AND (p_to IS NULL OR created_at < p_to)
+    ), periods AS (
+        SELECT
+            e.status,
+            e.created_at,
+            EXTRACT(EPOCH FROM LEAD(e.created_at) OVER w - e.created_at)::DOUBLE PRECISION AS seconds
+        FROM order_status_events e
+        JOIN scoped s ON s.order_id = e.order_id
+        WINDOW w AS (PARTITION BY e.order_id ORDER BY e.created_at, e.id)
+    )
+    SELECT
+        p.status,
+        COUNT(p.seconds),
+        COUNT(*) - COUNT(p.seconds),
+        AVG(p.seconds),
+        percentile_disc(0.5) WITHIN GROUP (ORDER BY p.seconds),
+        percentile_disc(0.9) WITHIN GROUP (ORDER BY p.seconds),
+        MAX(p.seconds)
+    FROM periods p
+    WHERE (p_from IS NULL OR p.created_at >= p_from)
+      AND (p_to IS NULL OR p.created_at < p_to)
+    GROUP BY p.status;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON TABLE order_status_events IS 'Append-only history of order status changes, written by triggers on orders';
+COMMENT ON FUNCTION order_status_timeline(UUID) IS 'Returns an order''s status history with time spent in each status';
+COMMENT ON FUNCTION order_status_durations(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE) IS 'Aggregates time spent in each order status';
+
+-- Make the new table and functions visible to PostgREST
+NOTIFY pgrst, 'reload schema';
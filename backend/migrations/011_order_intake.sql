@@ -0,0 +1,213 @@
+-- Migration 011: Asynchronous order intake
+-- Creates the order_intake queue drained by the background intake workers,
+-- the functions that claim, complete, release and recover its entries, and
+-- lets import_orders create orders with caller-supplied IDs
+
+CREATE TABLE IF NOT EXISTS order_intake (
+    -- Also the ID of the order the entry creates
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    created_by UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    payload JSONB NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'processing', 'created', 'rejected')),
+    order_id UUID,
+    errors JSONB,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    claimed_at TIMESTAMP WITH TIME ZONE,
+    processed_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Workers claim the oldest queued entries
+CREATE INDEX IF NOT EXISTS idx_order_intake_queued ON order_intake(created_at, id) WHERE status = 'queued';
+-- Recovery finds entries whose claim timed out
+CREATE INDEX IF NOT EXISTS idx_order_intake_processing ON order_intake(claimed_at) WHERE status = 'processing';
+-- Purging finds processed entries past their retention
+CREATE INDEX IF NOT EXISTS idx_order_intake_processed_at ON order_intake(processed_at) WHERE processed_at IS NOT NULL;
+-- Supports ON DELETE CASCADE from users
+CREATE INDEX IF NOT EXISTS idx_order_intake_created_by ON order_intake(created_by);
+
+-- Mark up to p_limit of the oldest queued entries as processing and return
+-- them. SKIP LOCKED lets concurrent workers, in any number of processes,
+-- claim disjoint entries without waiting on each other.
+CREATE OR REPLACE FUNCTION claim_order_intake(p_limit INTEGER)
+RETURNS SETOF order_intake AS $$
+    UPDATE order_intake
+    SET status = 'processing', claimed_at = NOW(), attempts = attempts + 1
+    WHERE id IN (
+        SELECT id
+        FROM order_intake
+        WHERE status = 'queued'
+        ORDER BY created_at, id
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+$$ LANGUAGE sql;
+
+-- Record the outcome of claimed entries in one update. p_results is an array
+-- of {"id": ..., "status": "created" | "rejected", "errors": [...] | null}.
+CREATE OR REPLACE FUNCTION complete_order_intake(p_results JSONB)
+RETURNS VOID AS $$
+    UPDATE order_intake AS q
+    SET status = r.status,
+        order_id = CASE WHEN r.status = 'created' THEN q.id END,
+        errors = NULLIF(r.errors, 'null'::JSONB),
+        processed_at = NOW()
+    FROM jsonb_to_recordset(p_results) AS r(id UUID, status VARCHAR, errors JSONB)
+    WHERE q.id = r.id
+      AND q.status = 'processing';
+$$ LANGUAGE sql;
+
+-- Return claimed entries to the queue after a failed attempt, rejecting the
+-- ones that have already been attempted p_max_attempts times
+CREATE OR REPLACE FUNCTION release_order_intake(p_ids UUID[], p_max_attempts INTEGER)
+RETURNS VOID AS $$
+    UPDATE order_intake
+    SET status = CASE WHEN attempts >= p_max_attempts THEN 'rejected' ELSE 'queued' END,
+        errors = CASE WHEN attempts >= p_max_attempts
+            THEN jsonb_build_array(format('Order could not be processed after %s attempts', attempts))
+        END,
+        claimed_at = CASE WHEN attempts >= p_max_attempts THEN claimed_at END,
+        processed_at = CASE WHEN attempts >= p_max_attempts THEN NOW() END
+    WHERE id = ANY(p_ids)
+      AND status = 'processing';
+$$ LANGUAGE sql;
+
+-- Resolve entries claimed more than p_claim_timeout_seconds ago by a worker
+-- that has since died. A worker that died after placing the order but before
+-- completing the entry left an order with the entry's ID, so those entries
+-- are marked created; any other entry is queued again. Returns the number
+-- resolved.
+CREATE OR REPLACE FUNCTION recover_order_intake(p_claim_timeout_seconds INTEGER)
+RETURNS INTEGER AS $$
+    WITH stale AS (
+        SELECT q.id, EXISTS (SELECT 1 FROM orders o WHERE o.id = q.id) AS created
+        FROM order_intake q
+        WHERE q.status = 'processing'
+          AND q.claimed_at < NOW() - make_interval(secs => p_claim_timeout_seconds)
+        FOR UPDATE SKIP LOCKED
+    ), resolved AS (
+        UPDATE order_intake AS q
+        SET status = CASE WHEN s.created THEN 'created' ELSE 'queued' END,
+            order_id = CASE WHEN s.created THEN q.id END,
+            claimed_at = CASE WHEN s.created THEN q.claimed_at END,
+            processed_at = CASE WHEN s.created THEN NOW() END
+        FROM stale AS s
+        WHERE q.id = s.id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM resolved;
+$$ LANGUAGE sql;
+
+-- Same as migration 008, except that an order may carry the "id" to create
+-- it with (the intake workers pass the entry ID), so that an intake entry
+-- processed twice fails on the primary key instead of creating a second order
+CREATE OR REPLACE FUNCTION import_orders(
+    p_created_by UUID,
+    p_orders JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_stock JSONB;
+    v_names JSONB;
+    v_order JSONB;
+    v_line RECORD;
+    v_errors JSONB;
+    v_order_id UUID;
+    v_accepted JSONB := '[]'::JSONB;
+    v_results JSONB := '[]'::JSONB;
+BEGIN
+    -- Lock every item the batch references once, in id order so concurrent
+    -- imports and orders cannot deadlock, and snapshot its stock level.
+    -- Item IDs that are not valid UUIDs are simply reported as not found.
+    SELECT COALESCE(jsonb_object_agg(id, stock_level), '{}'::JSONB),
+           COALESCE(jsonb_object_agg(id, name), '{}'::JSONB)
+    INTO v_stock, v_names
+    FROM (
+        SELECT id, name, stock_level
+        FROM inventory_items
+        WHERE id IN (
+            SELECT (line->>'item_id')::UUID
+            FROM jsonb_array_elements(p_orders) AS orders(entry),
+                 jsonb_array_elements(entry->'items') AS lines(line)
+            WHERE line->>'item_id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        )
+        ORDER BY id
+        FOR UPDATE
+    ) AS locked;
+
+    FOR v_order IN SELECT entry FROM jsonb_array_elements(p_orders) AS orders(entry)
+    LOOP
+        v_errors := '[]'::JSONB;
+        FOR v_line IN
+            SELECT lower(line->>'item_id') AS item_id, SUM((line->>'quantity')::INTEGER)::INTEGER AS quantity
+            FROM jsonb_array_elements(v_order->'items') AS lines(line)
+            GROUP BY 1
+            ORDER BY 1
+        LOOP
+            IF NOT v_stock ? v_line.item_id THEN
+                v_errors := v_errors || to_jsonb(format('Inventory item %s not found', v_line.item_id));
+            ELSIF (v_stock->>v_line.item_id)::INTEGER < v_line.quantity THEN
+                v_errors := v_errors || to_jsonb(format(
+                    'Insufficient stock for item ''%s''. Requested: %s, Available: %s',
+                    v_names->>v_line.item_id, v_line.quantity, v_stock->>v_line.item_id
+                ));
+            END IF;
+        END LOOP;
+
+        IF jsonb_array_length(v_errors) > 0 THEN
+            v_results := v_results || jsonb_build_array(jsonb_build_object('status', 'rejected', 'errors', v_errors));
+            CONTINUE;
+        END IF;
+
+        -- Take the stock from the snapshot so later orders in the batch see it
+        FOR v_line IN
+            SELECT lower(line->>'item_id') AS item_id, SUM((line->>'quantity')::INTEGER)::INTEGER AS quantity
+            FROM jsonb_array_elements(v_order->'items') AS lines(line)
+            GROUP BY 1
+        LOOP
+            v_stock := jsonb_set(
+                v_stock,
+                ARRAY[v_line.item_id],
+                to_jsonb((v_stock->>v_line.item_id)::INTEGER - v_line.quantity)
+            );
+        END LOOP;
+
+        v_order_id := COALESCE((v_order->>'id')::UUID, uuid_generate_v4());
+        v_accepted := v_accepted || jsonb_build_array(jsonb_build_object(
+            'id', v_order_id,
+            'customer_name', v_order->>'customer_name',
+            'items', v_order->'items'
+        ));
+        v_results := v_results || jsonb_build_array(jsonb_build_object('status', 'created', 'order_id', v_order_id));
+    END LOOP;
+
+    -- Write the accepted orders: one stock update and two multi-row inserts
+    UPDATE inventory_items AS i
+    SET stock_level = s.stock_level::INTEGER
+    FROM jsonb_each_text(v_stock) AS s(item_id, stock_level)
+    WHERE i.id = s.item_id::UUID
+      AND i.stock_level <> s.stock_level::INTEGER;
+
+    INSERT INTO orders (id, customer_name, status, created_by)
+    SELECT (entry->>'id')::UUID, entry->>'customer_name', 'pending', p_created_by
+    FROM jsonb_array_elements(v_accepted) AS accepted(entry);
+
+    INSERT INTO order_items (order_id, item_id, quantity)
+    SELECT (entry->>'id')::UUID, (line->>'item_id')::UUID, (line->>'quantity')::INTEGER
+    FROM jsonb_array_elements(v_accepted) AS accepted(entry),
+         jsonb_array_elements(entry->'items') AS lines(line);
+
+    RETURN v_results;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE order_intake IS 'Queue of orders accepted by POST /orders/intake and placed by the background intake workers';
+COMMENT ON FUNCTION claim_order_intake(INTEGER) IS 'Claims the oldest queued intake entries for processing';
+COMMENT ON FUNCTION complete_order_intake(JSONB) IS 'Records the outcome of claimed intake entries';
+COMMENT ON FUNCTION release_order_intake(UUID[], INTEGER) IS 'Requeues claimed intake entries after a failed attempt, rejecting those out of attempts';
+COMMENT ON FUNCTION recover_order_intake(INTEGER) IS 'Resolves intake entries whose claim timed out';
+COMMENT ON FUNCTION import_orders(UUID, JSONB) IS 'Places a batch of orders against one locked stock snapshot, returning one result per order';
+
+-- Make the new table and functions visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,37 @@
+-- Migration 012: Picking list
+-- Creates the order_picking_list function used by GET /orders/picking-list
+-- to aggregate the lines of many orders per inventory item in one query
+
+-- Sum the quantity of every item over the selected orders: the orders in
+-- p_order_ids when given (whatever their status), otherwise every order with
+-- status p_status. Each row lists the orders that contain the item.
+CREATE OR REPLACE FUNCTION order_picking_list(
+    p_status VARCHAR DEFAULT 'pending',
+    p_order_ids UUID[] DEFAULT NULL
+)
+RETURNS TABLE (
+    item_id UUID,
+    item_name VARCHAR,
+    stock_level INTEGER,
+    quantity BIGINT,
+    order_ids UUID[]
+) AS $$
+    SELECT
+        oi.item_id,
+        i.name,
+        i.stock_level,
+        SUM(oi.quantity),
+        array_agg(DISTINCT oi.order_id ORDER BY oi.order_id)
+    FROM order_items oi
+    JOIN orders o ON o.id = oi.order_id
+    JOIN inventory_items i ON i.id = oi.item_id
+    WHERE (p_order_ids IS NULL AND o.status = p_status)
+       OR o.id = ANY(p_order_ids)
+    GROUP BY oi.item_id, i.name, i.stock_level
+    ORDER BY i.name, oi.item_id;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION order_picking_list(VARCHAR, UUID[]) IS 'Aggregates order lines per inventory item over orders with a status or a list of orders';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,70 @@
+-- Migration 013: Order cancellation
+-- Adds the cancelled order status and creates cancel_orders, which cancels
+-- many orders and puts their stock back in one transaction
+
+ALTER TABLE orders DROP CONSTRAINT IF EXISTS orders_status_check;
+ALTER TABLE orders ADD CONSTRAINT orders_status_check
+    CHECK (status IN ('pending', 'processing', 'fulfilled', 'cancelled'));
+
+COMMENT ON COLUMN orders.status IS 'Order status: pending, processing, fulfilled, or cancelled';
+
+-- Cancel every requested order that is pending or processing and add the
+-- quantities of all their lines back to inventory_items with one set-based
+-- update. Orders are locked before items, and both in id order, so
+-- concurrent cancellations and orders cannot deadlock. Returns one row per
+-- distinct requested ID with the status it had before (NULL if the order
+-- does not exist or the ID is not a UUID) and whether it was cancelled.
+CREATE OR REPLACE FUNCTION cancel_orders(p_order_ids TEXT[])
+RETURNS TABLE (order_id TEXT, previous_status VARCHAR, updated BOOLEAN) AS $$
+DECLARE
+    v_previous JSONB;
+    v_cancelled UUID[];
+BEGIN
+    SELECT COALESCE(jsonb_object_agg(id, status), '{}'::JSONB),
+           COALESCE(array_agg(id) FILTER (WHERE status IN ('pending', 'processing')), '{}')
+    INTO v_previous, v_cancelled
+    FROM (
+        SELECT o.id, o.status
+        FROM orders o
+        WHERE o.id IN (
+            SELECT r.id::UUID
+            FROM unnest(p_order_ids) AS r(id)
+            WHERE r.id ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        )
+        ORDER BY o.id
+        FOR UPDATE
+    ) AS locked;
+
+    PERFORM 1
+    FROM inventory_items
+    WHERE id IN (SELECT oi.item_id FROM order_items oi WHERE oi.order_id = ANY(v_cancelled))
+    ORDER BY id
+    FOR UPDATE;
+
+    UPDATE inventory_items AS i
+    SET stock_level = i.stock_level + restock.quantity
+    FROM (
+        SELECT oi.item_id, SUM(oi.quantity)::INTEGER AS quantity
+        FROM order_items oi
+        WHERE oi.order_id = ANY(v_cancelled)
+        GROUP BY oi.item_id
+    ) AS restock
+    WHERE i.id = restock.item_id;
+
+    UPDATE orders
+    SET status = 'cancelled'
+    WHERE id = ANY(v_cancelled);
+
+    RETURN QUERY
+    SELECT DISTINCT
+        r.id,
+        (v_previous->>lower(r.id))::VARCHAR,
+        COALESCE(lower(r.id) IN (SELECT c::TEXT FROM unnest(v_cancelled) AS c), FALSE)
+    FROM unnest(p_order_ids) AS r(id);
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION cancel_orders(TEXT[]) IS 'Cancels pending and processing orders and restores their stock, returning the outcome per order';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,143 @@
+-- Migration 014: Stock movement ledger
+-- Creates the append-only inventory_movements ledger, filled by triggers on
+-- inventory_items so that stock_level is the materialized balance of its
+-- movements, and reconcile_inventory_balances, which reports and corrects
+-- drift between the two
+
+CREATE TABLE IF NOT EXISTS inventory_movements (
+    id BIGSERIAL PRIMARY KEY,
+    item_id UUID NOT NULL REFERENCES inventory_items(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('receipt', 'sale', 'adjustment', 'cancellation')),
+    quantity INTEGER NOT NULL,
+    balance INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- An item's movements in time order, and its ledger balance
+CREATE INDEX IF NOT EXISTS idx_inventory_movements_item_id_created_at ON inventory_movements(item_id, created_at);
+
+-- Append a movement for every change to an item's stock level. The kind comes
+-- from the inventory.movement_kind setting, which the functions that move
+-- stock for orders set for their own duration; any other change is a receipt
+-- (a new item) or an adjustment. Nothing is recorded while
+-- inventory.record_movements is off, which only reconciliation uses.
+CREATE OR REPLACE FUNCTION record_inventory_movement()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF current_setting('inventory.record_movements', true) = 'off' THEN
+        RETURN NEW;
+    END IF;
+
+    INSERT INTO inventory_movements (item_id, kind, quantity, balance)
+    VALUES (
+        NEW.id,
+        COALESCE(
+            NULLIF(current_setting('inventory.movement_kind', true), ''),
+            CASE WHEN TG_OP = 'INSERT' THEN 'receipt' ELSE 'adjustment' END
+        ),
+        NEW.stock_level - CASE WHEN TG_OP = 'INSERT' THEN 0 ELSE OLD.stock_level END,
+        NEW.stock_level
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_inventory_receipt ON inventory_items;
+CREATE TRIGGER record_inventory_receipt
+    AFTER INSERT ON inventory_items
+    FOR EACH ROW
+    WHEN (NEW.stock_level <> 0)
+    EXECUTE FUNCTION record_inventory_movement();
+
+DROP TRIGGER IF EXISTS record_inventory_stock_change ON inventory_items;
+CREATE TRIGGER record_inventory_stock_change
+    AFTER UPDATE OF stock_level ON inventory_items
+    FOR EACH ROW
+    WHEN (OLD.stock_level IS DISTINCT FROM NEW.stock_level)
+    EXECUTE FUNCTION record_inventory_movement();
+
+-- Label the stock changes made by order placement and cancellation. A SET
+-- clause applies only while the function runs, including adjust_stock calls
+-- it makes, and is restored when it returns.
+ALTER FUNCTION place_order(VARCHAR, UUID, JSONB) SET inventory.movement_kind = 'sale';
+ALTER FUNCTION import_orders(UUID, JSONB) SET inventory.movement_kind = 'sale';
+ALTER FUNCTION cancel_orders(TEXT[]) SET inventory.movement_kind = 'cancellation';
+
+-- Backfill an opening balance for items created before the ledger existed
+INSERT INTO inventory_movements (item_id, kind, quantity, balance, created_at)
+SELECT i.id, 'receipt', i.stock_level, i.stock_level, COALESCE(i.updated_at, i.created_at, NOW())
+FROM inventory_items i
+WHERE i.stock_level <> 0
+  AND NOT EXISTS (SELECT 1 FROM inventory_movements m WHERE m.item_id = i.id);
+
+-- Compare the stock level of up to p_limit items after p_after (in id order)
+-- with the balance recomputed from their movements. With p_apply, drifted
+-- stock levels are set to the ledger balance without recording a movement;
+-- a negative ledger balance is only reported. Returns
+-- {"scanned": n, "last_item_id": ..., "drift": [{"item_id", "name",
+-- "stock_level", "ledger_balance", "corrected"}, ...]}.
+CREATE OR REPLACE FUNCTION reconcile_inventory_balances(
+    p_after UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 500,
+    p_apply BOOLEAN DEFAULT FALSE
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_scanned INTEGER;
+    v_last UUID;
+    v_drift JSONB;
+BEGIN
+    -- Corrections lock the batch first, so that the comparison below (a new
+    -- statement, with a new snapshot) cannot see a half-finished writer
+    IF p_apply THEN
+        PERFORM 1
+        FROM inventory_items
+        WHERE p_after IS NULL OR id > p_after
+        ORDER BY id
+        LIMIT p_limit
+        FOR UPDATE;
+    END IF;
+
+    SELECT COUNT(*)::INTEGER,
+           (array_agg(b.id ORDER BY b.id DESC))[1],
+           COALESCE(jsonb_agg(jsonb_build_object(
+               'item_id', b.id,
+               'name', b.name,
+               'stock_level', b.stock_level,
+               'ledger_balance', b.ledger_balance,
+               'corrected', p_apply AND b.ledger_balance >= 0
+           ) ORDER BY b.id) FILTER (WHERE b.stock_level <> b.ledger_balance), '[]'::JSONB)
+    INTO v_scanned, v_last, v_drift
+    FROM (
+        SELECT
+            i.id,
+            i.name,
+            i.stock_level,
+            COALESCE((SELECT SUM(m.quantity) FROM inventory_movements m WHERE m.item_id = i.id), 0)::INTEGER AS ledger_balance
+        FROM inventory_items i
+        WHERE p_after IS NULL OR i.id > p_after
+        ORDER BY i.id
+        LIMIT p_limit
+    ) AS b;
+
+    IF p_apply THEN
+        UPDATE inventory_items AS i
+        SET stock_level = (d->>'ledger_balance')::INTEGER
+        FROM jsonb_array_elements(v_drift) AS d
+        WHERE i.id = (d->>'item_id')::UUID
+          AND (d->>'corrected')::BOOLEAN;
+    END IF;
+
+    RETURN jsonb_build_object('scanned', v_scanned, 'last_item_id', v_last, 'drift', v_drift);
+END;
+$$ LANGUAGE plpgsql
+SET inventory.record_movements = 'off';
+
+COMMENT ON TABLE inventory_movements IS 'Append-only ledger of stock changes, written by triggers on inventory_items';
+COMMENT ON COLUMN inventory_movements.kind IS 'Movement kind: receipt, sale, adjustment, or cancellation';
+COMMENT ON COLUMN inventory_movements.quantity IS 'Signed change to the stock level';
+COMMENT ON COLUMN inventory_movements.balance IS 'Stock level after the movement';
+COMMENT ON FUNCTION reconcile_inventory_balances(UUID, INTEGER, BOOLEAN) IS 'Compares a batch of stock levels with their ledger balances, optionally correcting drift';
+
+-- Make the new table and function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,87 @@
+-- Migration 015: Stock adjustments
+-- Adds a reason to inventory_movements and creates apply_stock_adjustments,
+-- which applies signed stock deltas to many items with one guarded update
+-- and records each with its reason
+
+ALTER TABLE inventory_movements ADD COLUMN IF NOT EXISTS reason VARCHAR(255);
+
+-- Add each requested delta to its item's stock level unless that would make
+-- the stock negative. The guard is the WHERE clause of a single UPDATE, so
+-- concurrent adjustments and orders never lose an update, and the items are
+-- locked in id order first so concurrent batches cannot deadlock. The
+-- movements are inserted here rather than by the ledger trigger, which
+-- cannot see the reasons. p_adjustments is a JSON array of {"item_id",
+-- "delta", "reason"} with each item at most once. Returns one row per
+-- distinct requested ID with whether its delta was applied and the item as
+-- it is afterwards (all NULL if it does not exist or the ID is not a UUID).
+CREATE OR REPLACE FUNCTION apply_stock_adjustments(p_adjustments JSONB)
+RETURNS TABLE (
+    item_id TEXT,
+    applied BOOLEAN,
+    id UUID,
+    name VARCHAR,
+    description TEXT,
+    stock_level INTEGER,
+    low_stock_threshold INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE
+) AS $$
+#variable_conflict use_column
+DECLARE
+    v_applied UUID[];
+BEGIN
+    PERFORM 1
+    FROM inventory_items i
+    WHERE i.id IN (
+        SELECT (a->>'item_id')::UUID
+        FROM jsonb_array_elements(p_adjustments) AS a
+        WHERE a->>'item_id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+    )
+    ORDER BY i.id
+    FOR UPDATE;
+
+    WITH adjusted AS (
+        UPDATE inventory_items AS i
+        SET stock_level = i.stock_level + r.delta
+        FROM jsonb_to_recordset(p_adjustments) AS r(item_id TEXT, delta INTEGER, reason VARCHAR)
+        WHERE i.id = CASE
+                WHEN r.item_id ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+                THEN r.item_id::UUID
+            END
+          AND i.stock_level + r.delta >= 0
+        RETURNING i.id, i.stock_level, r.delta, r.reason
+    ), recorded AS (
+        INSERT INTO inventory_movements (item_id, kind, quantity, balance, reason)
+        SELECT adjusted.id, 'adjustment', adjusted.delta, adjusted.stock_level, adjusted.reason
+        FROM adjusted
+        WHERE adjusted.delta <> 0
+    )
+    SELECT COALESCE(array_agg(adjusted.id), '{}')
+    INTO v_applied
+    FROM adjusted;
+
+    RETURN QUERY
+    SELECT DISTINCT ON (r.item_id)
+        r.item_id,
+        COALESCE(i.id = ANY(v_applied), FALSE),
+        i.id,
+        i.name,
+        i.description,
+        i.stock_level,
+        i.low_stock_threshold,
+        i.created_at,
+        i.updated_at
+    FROM jsonb_to_recordset(p_adjustments) AS r(item_id TEXT)
+    LEFT JOIN inventory_items i ON i.id = CASE
+        WHEN r.item_id ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        THEN r.item_id::UUID
+    END;
+END;
+$$ LANGUAGE plpgsql
+SET inventory.record_movements = 'off';
+
+COMMENT ON COLUMN inventory_movements.reason IS 'Why the stock level was adjusted, for movements made by apply_stock_adjustments';
+COMMENT ON FUNCTION apply_stock_adjustments(JSONB) IS 'Applies guarded signed stock deltas to many items and records them with their reasons, returning the outcome per item';
+
+-- Make the new column and function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,74 @@
+-- Migration 016: Bulk inventory upsert
+-- Creates upsert_inventory_items, which POST /inventory/import uses to
+-- create or update a chunk of catalog items by name in one call
+
+-- Update the item named like each element of p_items (the oldest one, if
+-- several share the name) and insert the others, with one multi-row UPDATE
+-- and one multi-row INSERT. Existing items are locked in id order first so
+-- concurrent imports cannot deadlock. An element without a description
+-- keeps the existing one. p_items is a JSON array of {"name",
+-- "description", "stock_level", "low_stock_threshold"} with distinct names.
+-- Stock changes are recorded in the ledger by the inventory_items triggers:
+-- a receipt for a new item and an adjustment for a changed stock level.
+-- Returns one row per element, in order, with the ID of the item it created
+-- or updated and whether it was created.
+CREATE OR REPLACE FUNCTION upsert_inventory_items(p_items JSONB)
+RETURNS TABLE (item_position BIGINT, item_id UUID, created BOOLEAN) AS $$
+DECLARE
+    -- An array keeps the name lookups on idx_inventory_items_name
+    v_names TEXT[] := ARRAY(SELECT e->>'name' FROM jsonb_array_elements(p_items) AS e);
+BEGIN
+    PERFORM 1
+    FROM inventory_items i
+    WHERE i.name = ANY(v_names)
+    ORDER BY i.id
+    FOR UPDATE;
+
+    RETURN QUERY
+    WITH requested AS (
+        SELECT
+            e.ordinality AS item_position,
+            e.item->>'name' AS name,
+            e.item->>'description' AS description,
+            (e.item->>'stock_level')::INTEGER AS stock_level,
+            (e.item->>'low_stock_threshold')::INTEGER AS low_stock_threshold
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS e(item, ordinality)
+    ), matched AS (
+        SELECT DISTINCT ON (i.name) i.id, i.name
+        FROM inventory_items i
+        WHERE i.name = ANY(v_names)
+        ORDER BY i.name, i.created_at, i.id
+    ), updated AS (
+        UPDATE inventory_items AS i
+        SET description = COALESCE(r.description, i.description),
+            stock_level = r.stock_level,
+            low_stock_threshold = r.low_stock_threshold
+        FROM requested r
+        JOIN matched m ON m.name = r.name
+        WHERE i.id = m.id
+        RETURNING r.item_position, i.id
+    ), inserted AS (
+        INSERT INTO inventory_items (name, description, stock_level, low_stock_threshold)
+        SELECT r.name, r.description, r.stock_level, r.low_stock_threshold
+        FROM requested r
+        WHERE r.name NOT IN (SELECT m.name FROM matched m)
+        ORDER BY r.item_position
+        RETURNING inventory_items.id, inventory_items.name
+    )
+    SELECT u.item_position, u.id, FALSE
+    FROM updated u
+    UNION ALL
+    SELECT r.item_position, n.id, TRUE
+    FROM inserted n
+    JOIN requested r ON r.name = n.name
+    ORDER BY 1;
+END;
+$$ LANGUAGE plpgsql
+-- Plan every call for its own chunk: a generic plan cached while the table
+-- was small keeps scanning it sequentially as a catalog load grows it
+SET plan_cache_mode = force_custom_plan;
+
+COMMENT ON FUNCTION upsert_inventory_items(JSONB) IS 'Creates or updates a chunk of inventory items by name with one multi-row update and insert';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
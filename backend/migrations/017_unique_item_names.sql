@@ -0,0 +1,78 @@
+-- Migration 017: Case-insensitive unique item names
+-- Replaces the duplicate name checks the API made before every create and
+-- rename with a unique index on lower(name), and rebuilds
+-- upsert_inventory_items on top of it
+
+-- Existing duplicates would make the index fail to build; report them all
+-- instead of picking which items to rename
+DO $$
+DECLARE
+    v_duplicates TEXT;
+BEGIN
+    SELECT string_agg(d.name_key, ', ' ORDER BY d.name_key)
+    INTO v_duplicates
+    FROM (
+        SELECT lower(name) AS name_key
+        FROM inventory_items
+        GROUP BY lower(name)
+        HAVING COUNT(*) > 1
+    ) d;
+
+    IF v_duplicates IS NOT NULL THEN
+        RAISE EXCEPTION 'inventory_items has names that differ only in case: %', v_duplicates
+            USING HINT = 'Rename the duplicate items, then run this migration again';
+    END IF;
+END;
+$$;
+
+-- idx_inventory_items_name stays for listing items in name order
+CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_items_name_lower ON inventory_items (lower(name));
+
+-- Insert every element of p_items with one multi-row INSERT, updating the
+-- item whose name matches regardless of case instead. The unique index
+-- arbitrates, so a concurrent import or create of the same name updates
+-- the row it inserted rather than failing or duplicating it, and rows are
+-- written in name order so concurrent imports cannot deadlock. A matched
+-- item keeps its name, and its description when the element has none.
+-- p_items is a JSON array of {"name", "description", "stock_level",
+-- "low_stock_threshold"} whose names are distinct regardless of case.
+-- Stock changes are recorded in the ledger by the inventory_items
+-- triggers: a receipt for a new item and an adjustment for a changed stock
+-- level. Returns one row per element, in order, with the ID of the item it
+-- created or updated and whether it was created.
+CREATE OR REPLACE FUNCTION upsert_inventory_items(p_items JSONB)
+RETURNS TABLE (item_position BIGINT, item_id UUID, created BOOLEAN) AS $$
+BEGIN
+    RETURN QUERY
+    WITH requested AS (
+        SELECT
+            e.ordinality AS item_position,
+            e.item->>'name' AS name,
+            e.item->>'description' AS description,
+            (e.item->>'stock_level')::INTEGER AS stock_level,
+            (e.item->>'low_stock_threshold')::INTEGER AS low_stock_threshold
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS e(item, ordinality)
+    ), upserted AS (
+        INSERT INTO inventory_items AS i (name, description, stock_level, low_stock_threshold)
+        SELECT r.name, r.description, r.stock_level, r.low_stock_threshold
+        FROM requested r
+        ORDER BY lower(r.name)
+        ON CONFLICT ((lower(name))) DO UPDATE
+        SET description = COALESCE(EXCLUDED.description, i.description),
+            stock_level = EXCLUDED.stock_level,
+            low_stock_threshold = EXCLUDED.low_stock_threshold
+        -- xmax is zero only on a row version this statement inserted
+        RETURNING i.id, lower(i.name) AS name_key, i.xmax = 0 AS created
+    )
+    SELECT r.item_position, u.id, u.created
+    FROM upserted u
+    JOIN requested r ON lower(r.name) = u.name_key
+    ORDER BY r.item_position;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON INDEX idx_inventory_items_name_lower IS 'Item names are unique regardless of case';
+COMMENT ON FUNCTION upsert_inventory_items(JSONB) IS 'Creates or updates a chunk of inventory items by case-insensitive name with one multi-row insert';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,67 @@
+-- Migration 018: Inventory search
+-- Adds trigram indexes over item names and descriptions
+-- Creates the search_inventory_items function used by GET /inventory/search
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Trigram GIN indexes serve ILIKE '%term%', so a search only reads the items
+-- containing the trigrams of a term instead of scanning the catalog
+CREATE INDEX IF NOT EXISTS idx_inventory_items_name_trgm
+    ON inventory_items USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_inventory_items_description_trgm
+    ON inventory_items USING GIN (description gin_trgm_ops);
+
+-- Search items by name and description, best match first. The query is
+-- lowercased and split on whitespace, and an item matches when every term
+-- is a substring of its name or its description. The longest term is looked
+-- up through the trigram indexes and the others are checked on the items
+-- found. Matches are ranked by name equal to the query, name starting with
+-- the query, every term found in the name, then shorter names first, and
+-- finally by name and ID. The local backends rank the same way.
+CREATE OR REPLACE FUNCTION search_inventory_items(p_query TEXT, p_limit INTEGER)
+RETURNS SETOF inventory_items AS $$
+DECLARE
+    v_terms TEXT[] := regexp_split_to_array(lower(btrim(p_query)), '\s+');
+    v_query TEXT := array_to_string(v_terms, ' ');
+    v_pattern TEXT;
+BEGIN
+    IF v_query = '' THEN
+        RETURN;
+    END IF;
+
+    SELECT '%' || replace(replace(replace(t.term, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+    INTO v_pattern
+    FROM unnest(v_terms) AS t(term)
+    ORDER BY length(t.term) DESC
+    LIMIT 1;
+
+    RETURN QUERY
+    SELECT i.*
+    FROM inventory_items i
+    WHERE (i.name ILIKE v_pattern OR i.description ILIKE v_pattern)
+      AND NOT EXISTS (
+          SELECT 1
+          FROM unnest(v_terms) AS t(term)
+          WHERE strpos(lower(i.name), t.term) = 0
+            AND strpos(lower(COALESCE(i.description, '')), t.term) = 0
+      )
+    ORDER BY
+        lower(i.name) = v_query DESC,
+        starts_with(lower(i.name), v_query) DESC,
+        NOT EXISTS (
+            SELECT 1 FROM unnest(v_terms) AS t(term) WHERE strpos(lower(i.name), t.term) = 0
+        ) DESC,
+        length(i.name),
+        i.name,
+        i.id
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql STABLE
+-- Plan every call for its pattern: only a plan that sees it can weigh the
+-- trigram indexes against a scan for a short, unselective term
+SET plan_cache_mode = force_custom_plan;
+
+COMMENT ON FUNCTION search_inventory_items(TEXT, INTEGER) IS 'Items whose name or description contains every query term, best match first';
+
+-- Make the new function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -66,7 +66,23 @@ def run_migrations():
         # List of migration files in order
         migration_files = [
             "001_create_tables.sql",
-            "002_seed_data.sql"
+            "002_seed_data.sql",
+            "003_place_order_function.sql",
+            "004_guarded_stock_adjustment.sql",
+            "005_low_stock_index.sql",
+            "006_set_order_status.sql",
+            "007_idempotency_keys.sql",
+            "008_import_orders.sql",
+            "009_order_status_transitions.sql",
+            "010_order_status_events.sql",
+            "011_order_intake.sql",
+            "012_order_picking_list.sql",
+            "013_cancel_orders.sql",
+            "014_inventory_movements.sql",
+            "015_stock_adjustments.sql",
+            "016_upsert_inventory_items.sql",
+            "017_unique_item_names.sql",
+            "018_inventory_search.sql"
         ]
         
         # Execute each migration file
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark for the password hashing pool.
+
+Starts the API with the in-memory data backend once per executor type and
+worker count, drives ``POST /auth/login`` with concurrent requests for the
+default admin account, and reports throughput and latency. Each login runs
+one bcrypt verification on the pool, so throughput should grow with
+``PASSWORD_HASH_WORKERS`` up to the number of cores.
+
+A probe keeps calling a cheap authenticated endpoint (``GET
+/inventory?limit=1``) on its own connection, first with the server idle and
+then during the login burst. Its latency under load should stay close to the
+idle baseline, showing that bcrypt work does not stall the event loop.
+
+Usage:
+    python scripts/benchmark_login.py --max-workers 8 --requests 400
+"""
+
+import argparse
+import asyncio
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Created by the in-memory backend on startup
+ADMIN_EMAIL = "admin@admin.com"
+ADMIN_PASSWORD = "admin123!"
+
+# Cheap authenticated endpoint sampled while logins run
+PROBE_PATH = "/inventory?limit=1"
+# Pause between probe requests, in seconds
+PROBE_INTERVAL = 0.05
+# Probe requests sent to measure the idle baseline
+IDLE_PROBES = 20
+
+
+def free_port() -> int:
+    """Get a free local TCP port for the API server."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, executor: str, workers: int, log: IO[bytes]) -> subprocess.Popen:
+    """
+    Start the API on the in-memory backend with the given password pool.
+
+    Args:
+        port: Port to listen on
+        executor: Password hashing executor, "thread" or "process"
+        workers: Password hashing workers
+        log: File receiving the server's output
+
+    Returns:
+        The uvicorn server process
+    """
+    env = dict(
+        os.environ,
+        DATA_BACKEND="memory",
+        PASSWORD_HASH_EXECUTOR=executor,
+        PASSWORD_HASH_WORKERS=str(workers),
+        PASSWORD_HASH_MAX_CONCURRENCY=str(workers),
+        JWT_SECRET_KEY=os.environ.get("JWT_SECRET_KEY") or secrets.token_hex(32)
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT
+    )
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30.0):
+    """Wait for the server to answer /health, failing if it exits or times out."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with code {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API server did not become healthy in time")
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    """Get the p50 and p95 of latencies in milliseconds."""
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    }
+
+
+async def probe(client: httpx.AsyncClient, token: str, stop: asyncio.Event, samples: int = 0) -> List[float]:
+    """
+    Call the probe endpoint repeatedly and measure each call.
+
+    Args:
+        client: HTTP client for the API, not shared with the login workers
+        token: Access token for the probe endpoint
+        stop: Event that ends probing once set
+        samples: Stop after this many calls if positive
+
+    Returns:
+        Latency of each call in ms
+    """
+    latencies: List[float] = []
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set() and (samples <= 0 or len(latencies) < samples):
+        started = time.perf_counter()
+        response = await client.get(PROBE_PATH, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"Probe failed with {response.status_code}: {response.text}")
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(PROBE_INTERVAL)
+    return latencies
+
+
+async def run_logins(client: httpx.AsyncClient, requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Send logins from concurrent clients and measure them.
+
+    Args:
+        client: HTTP client for the API
+        requests: Total number of logins
+        concurrency: Logins in flight at once
+
+    Returns:
+        Dict with throughput in requests per second and p50/p95 latency in ms
+    """
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+    credentials = {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.post("/auth/login", json=credentials)
+            if response.status_code != 200:
+                raise RuntimeError(f"Login failed with {response.status_code}: {response.text}")
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {"throughput": requests / elapsed, **percentiles(latencies)}
+
+
+async def benchmark(executor: str, workers: int, requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Start a server for one pool configuration and benchmark logins against it.
+
+    Returns:
+        Dict with the login throughput and latency, and the probe latency
+        percentiles when idle (``probe_idle``) and during logins (``probe_load``)
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryFile() as log:
+        server = start_server(port, executor, workers, log)
+        try:
+            limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client, \
+                    httpx.AsyncClient(base_url=base_url, timeout=120) as probe_client:
+                await wait_until_healthy(client, server)
+                # Warm up the pool (process workers start on first use) and the connections
+                await run_logins(client, concurrency, concurrency)
+
+                response = await client.post("/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+                token = response.json()["access_token"]
+                idle = await probe(probe_client, token, asyncio.Event(), IDLE_PROBES)
+
+                stop = asyncio.Event()
+                probe_task = asyncio.create_task(probe(probe_client, token, stop))
+                try:
+                    result = await run_logins(client, requests, concurrency)
+                finally:
+                    stop.set()
+                loaded = await probe_task
+                return {**result, "probe_idle": percentiles(idle), "probe_load": percentiles(loaded)}
+        except Exception:
+            log.seek(0)
+            sys.stderr.write(log.read().decode(errors="replace"))
+            raise
+        finally:
+            server.terminate()
+            server.wait()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark /auth/login throughput by password pool size")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="Benchmark 1..N hashing workers (default: CPU count)")
+    parser.add_argument("--executors", default="thread,process",
+                        help="Comma-separated executor types (default: thread,process)")
+    parser.add_argument("--requests", type=int, default=200, help="Logins per configuration (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Logins in flight at once (default: twice the worker count)")
+    args = parser.parse_args()
+
+    print(f"CPU count: {os.cpu_count()}, logins per run: {args.requests}, probe: GET {PROBE_PATH}")
+    print(
+        f"{'':<18}{'login':>37}{'probe idle':>20}{'probe under load':>20}\n"
+        f"{'executor':<10}{'workers':>8}{'req/s':>10}{'speedup':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    )
+    for executor in args.executors.split(","):
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            concurrency = args.concurrency or workers * 2
+            result = await benchmark(executor, workers, args.requests, concurrency)
+            baseline = baseline or result["throughput"]
+            print(
+                f"{executor:<10}{workers:>8}{result['throughput']:>10.1f}"
+                f"{result['throughput'] / baseline:>8.2f}x"
+                f"{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+                f"{result['probe_idle']['p50_ms']:>10.1f}{result['probe_idle']['p95_ms']:>10.1f}"
+                f"{result['probe_load']['p50_ms']:>10.1f}{result['probe_load']['p95_ms']:>10.1f}",
+                flush=True
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
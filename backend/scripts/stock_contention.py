@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Lost-update check for concurrent stock changes on one hot item.
+
+Creates an item and fires concurrent order placements, cancellations and
+stock adjustments at it through the configured data backend
+(``DATA_BACKEND``), then checks that:
+
+- the final stock level equals the initial stock plus the sum of the deltas
+  that were reported as applied
+- the final stock level is not negative
+- the item's stock ledger sums to the final stock level
+
+Operations that the guards reject (insufficient stock) are expected and not
+counted. Exits with status 1 if any check fails, so it can be re-run after
+migrations that rebuild the stock paths.
+
+Usage:
+    DATA_BACKEND=postgres DATABASE_URL=... python scripts/stock_contention.py --operations 1000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add the backend directory to the path to import app modules
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.repositories import data_store
+from app.repositories.base import DEFAULT_ADMIN, DataStore
+from app.utils.exceptions import InsufficientStockError
+
+# Rows per page when summing the item's ledger
+MOVEMENT_PAGE_SIZE = 500
+
+
+class ContentionRun:
+    """Concurrent stock operations against one item, with the deltas they applied."""
+
+    def __init__(self, store: DataStore, item_id: str, created_by: str, max_quantity: int):
+        self.store = store
+        self.item_id = item_id
+        self.created_by = created_by
+        self.max_quantity = max_quantity
+        self.applied: List[int] = []
+        self.counts: Dict[str, int] = {}
+
+    def record(self, operation: str, delta: Optional[int]):
+        """Count an operation and remember its delta if it was applied."""
+        outcome = f"{operation} {'applied' if delta is not None else 'rejected'}"
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        if delta is not None:
+            self.applied.append(delta)
+
+    async def order(self, cancel: bool):
+        """Place an order for the item, and cancel it afterwards if asked."""
+        quantity = random.randint(1, self.max_quantity)
+        try:
+            order = await self.store.orders.place_order(
+                "Contention check", self.created_by, [{"item_id": self.item_id, "quantity": quantity}]
+            )
+        except InsufficientStockError:
+            self.record("order", None)
+            return
+        self.record("order", -quantity)
+
+        if cancel:
+            results = await self.store.orders.cancel_orders([order["id"]])
+            self.record("cancel", quantity if results[0]["updated"] else None)
+
+    async def adjust(self):
+        """Apply a signed adjustment to the item."""
+        delta = random.choice([-1, 1]) * random.randint(1, self.max_quantity)
+        try:
+            await self.store.inventory.adjust_stock(self.item_id, delta, "Contention check")
+        except InsufficientStockError:
+            self.record("adjust", None)
+            return
+        self.record("adjust", delta)
+
+    async def adjust_batch(self):
+        """Apply a signed adjustment to the item through the batch path."""
+        delta = random.choice([-1, 1]) * random.randint(1, self.max_quantity)
+        results = await self.store.inventory.adjust_stock_batch(
+            [{"item_id": self.item_id, "delta": delta, "reason": "Contention check"}]
+        )
+        self.record("adjust_batch", delta if results[0]["applied"] else None)
+
+    async def operation(self):
+        """Run one randomly chosen operation."""
+        choice = random.random()
+        if choice < 0.4:
+            await self.order(cancel=False)
+        elif choice < 0.55:
+            await self.order(cancel=True)
+        elif choice < 0.8:
+            await self.adjust()
+        else:
+            await self.adjust_batch()
+
+
+async def ledger_balance(store: DataStore, item_id: str) -> int:
+    """Sum the quantities of every stock movement recorded for an item."""
+    balance = 0
+    after = None
+    while True:
+        movements = await store.inventory.list_movements(item_id, MOVEMENT_PAGE_SIZE, after)
+        balance += sum(movement["quantity"] for movement in movements)
+        if len(movements) < MOVEMENT_PAGE_SIZE:
+            return balance
+        after = (movements[-1]["created_at"], movements[-1]["id"])
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Check concurrent stock changes on one item for lost updates")
+    parser.add_argument("--operations", type=int, default=500, help="Operations to run (default: 500)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Operations in flight at once (default: 50)")
+    parser.add_argument("--initial-stock", type=int, default=100, help="Starting stock level (default: 100)")
+    parser.add_argument("--max-quantity", type=int, default=5, help="Largest order or adjustment (default: 5)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for a repeatable mix")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    store = data_store
+    try:
+        admin = await store.users.get_by_email(DEFAULT_ADMIN["email"])
+        if admin is None:
+            print(f"Default admin {DEFAULT_ADMIN['email']} not found; run the seed migration first")
+            return 1
+
+        item = await store.inventory.create({
+            "name": f"Contention check {uuid.uuid4().hex[:12]}",
+            "description": "Created by scripts/stock_contention.py",
+            "stock_level": args.initial_stock,
+            "low_stock_threshold": 0
+        })
+        run = ContentionRun(store, item["id"], admin["id"], args.max_quantity)
+        print(f"Backend: {store.backend_name}, item: {item['id']}, initial stock: {args.initial_stock}")
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def limited():
+            async with semaphore:
+                await run.operation()
+
+        await asyncio.gather(*(limited() for _ in range(args.operations)))
+
+        final = (await store.inventory.get(item["id"]))["stock_level"]
+        expected = args.initial_stock + sum(run.applied)
+        ledger = await ledger_balance(store, item["id"])
+
+        for outcome, count in sorted(run.counts.items()):
+            print(f"  {outcome:<24}{count:>6}")
+        print(f"Final stock: {final}, expected: {expected}, ledger balance: {ledger}")
+
+        failures = []
+        if final != expected:
+            failures.append(f"final stock {final} != initial stock plus applied deltas {expected}")
+        if final < 0:
+            failures.append(f"final stock {final} is negative")
+        if ledger != final:
+            failures.append(f"ledger balance {ledger} != final stock {final}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("OK: no lost updates")
+        return 1 if failures else 0
+    finally:
+        await store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the backend test suite.
+
+The repositories package reads the settings on import, so the environment
+is prepared first: the global data store is in-memory and a JWT secret is set.
+"""
+import asyncio
+import os
+
+os.environ.setdefault("DATA_BACKEND", "memory")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-with-at-least-32-characters")
+
+import pytest
+
+from app.repositories.memory_store import MemoryDataStore
+from app.repositories.sqlite_store import SQLiteDataStore
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine to completion on a fresh event loop."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path, run):
+    """An empty data store for each local backend."""
+    if request.param == "memory":
+        data_store = MemoryDataStore(seed_admin=False)
+    else:
+        data_store = SQLiteDataStore(str(tmp_path / "inventory.db"), seed_admin=False)
+    yield data_store
+    run(data_store.close())
@@ -0,0 +1,421 @@
+"""
+Contract tests shared by the local data backends.
+
+Every test runs against both ``MemoryDataStore`` and ``SQLiteDataStore``, so
+the two keep enforcing the constraints of ``migrations/001_create_tables.sql``
+and the ordering and ledger rules of ``app.repositories.base`` the same way.
+The search tests pin down the matching and ranking that the in-process
+trigram index shares with ``search_inventory_items`` (migration 018).
+"""
+import pytest
+
+from app.repositories.sqlite_store import SQLiteDataStore
+from app.utils.exceptions import DatabaseError, InsufficientStockError, ResourceConflictError
+
+
+def _item(name, stock_level=10, low_stock_threshold=2, description=None):
+    return {
+        "name": name,
+        "description": description,
+        "stock_level": stock_level,
+        "low_stock_threshold": low_stock_threshold
+    }
+
+
+def _user(email, role="salesperson"):
+    return {
+        "email": email,
+        "first_name": "Test",
+        "last_name": "User",
+        "password_hash": "not-a-real-hash",
+        "role": role,
+        "status": "active"
+    }
+
+
+def _set_stock_behind_ledger(store, item_id, stock_level):
+    """Overwrite a stock level without recording a movement, simulating ledger drift."""
+    if isinstance(store, SQLiteDataStore):
+        store.db.run_sync(
+            lambda conn: conn.execute("UPDATE inventory_items SET stock_level = ? WHERE id = ?", (stock_level, item_id))
+        )
+    else:
+        store.items[item_id]["stock_level"] = stock_level
+
+
+@pytest.fixture
+def salesperson(store, run):
+    return run(store.users.create(_user("sales@example.com")))
+
+
+class TestUniqueConstraints:
+    def test_duplicate_item_name_differing_in_case_conflicts(self, store, run):
+        run(store.inventory.create(_item("Birch Plywood 18mm")))
+
+        with pytest.raises(ResourceConflictError):
+            run(store.inventory.create(_item("birch PLYWOOD 18mm")))
+
+    def test_renaming_onto_another_name_conflicts(self, store, run):
+        run(store.inventory.create(_item("Oak Veneer")))
+        other = run(store.inventory.create(_item("Pine Board")))
+
+        with pytest.raises(ResourceConflictError):
+            run(store.inventory.update(other["id"], {"name": "OAK VENEER"}))
+        assert run(store.inventory.get(other["id"]))["name"] == "Pine Board"
+
+    def test_renaming_an_item_to_a_case_variant_of_itself_is_allowed(self, store, run):
+        item = run(store.inventory.create(_item("Maple Sheet")))
+
+        updated = run(store.inventory.update(item["id"], {"name": "MAPLE SHEET"}))
+
+        assert updated["name"] == "MAPLE SHEET"
+
+    def test_duplicate_user_email_conflicts(self, store, run):
+        run(store.users.create(_user("dup@example.com")))
+
+        with pytest.raises(ResourceConflictError):
+            run(store.users.create(_user("dup@example.com")))
+
+
+class TestCheckConstraints:
+    @pytest.mark.parametrize("column", ["stock_level", "low_stock_threshold"])
+    def test_negative_stock_columns_are_rejected(self, store, run, column):
+        with pytest.raises(DatabaseError):
+            run(store.inventory.create({**_item("Negative"), column: -1}))
+
+    def test_update_to_negative_stock_is_rejected(self, store, run):
+        item = run(store.inventory.create(_item("Hardboard", stock_level=3)))
+
+        with pytest.raises(DatabaseError):
+            run(store.inventory.update(item["id"], {"stock_level": -1}))
+        assert run(store.inventory.get(item["id"]))["stock_level"] == 3
+
+    def test_item_name_longer_than_255_characters_is_rejected(self, store, run):
+        with pytest.raises(DatabaseError):
+            run(store.inventory.create(_item("x" * 256)))
+
+    @pytest.mark.parametrize("column, value", [("role", "owner"), ("status", "suspended")])
+    def test_unknown_user_role_or_status_is_rejected(self, store, run, column, value):
+        with pytest.raises(DatabaseError):
+            run(store.users.create({**_user("check@example.com"), column: value}))
+
+    def test_order_with_unknown_status_is_rejected(self, store, run, salesperson):
+        item = run(store.inventory.create(_item("Chipboard")))
+        order = run(store.orders.place_order("Acme", salesperson["id"], [{"item_id": item["id"], "quantity": 1}]))
+
+        with pytest.raises(DatabaseError):
+            run(store.orders.set_status(order["id"], "shipped"))
+
+    def test_user_owning_orders_cannot_be_deleted(self, store, run, salesperson):
+        item = run(store.inventory.create(_item("MDF Panel")))
+        run(store.orders.place_order("Acme", salesperson["id"], [{"item_id": item["id"], "quantity": 1}]))
+
+        with pytest.raises(DatabaseError):
+            run(store.users.delete(salesperson["id"]))
+
+
+class TestPlaceOrder:
+    def test_order_decrements_stock_and_embeds_lines(self, store, run, salesperson):
+        a = run(store.inventory.create(_item("Item A", stock_level=5)))
+        b = run(store.inventory.create(_item("Item B", stock_level=5)))
+
+        order = run(store.orders.place_order("Acme", salesperson["id"], [
+            {"item_id": a["id"], "quantity": 2},
+            {"item_id": b["id"], "quantity": 1},
+            {"item_id": a["id"], "quantity": 1}
+        ]))
+
+        assert order["status"] == "pending"
+        assert [(line["item_name"], line["quantity"]) for line in order["items"]] == [
+            ("Item A", 2), ("Item B", 1), ("Item A", 1)
+        ]
+        assert run(store.inventory.get(a["id"]))["stock_level"] == 2
+        assert run(store.inventory.get(b["id"]))["stock_level"] == 4
+        assert run(store.orders.get(order["id"]))["items"] == order["items"]
+
+    def test_insufficient_stock_writes_nothing(self, store, run, salesperson):
+        a = run(store.inventory.create(_item("Item A", stock_level=5)))
+        b = run(store.inventory.create(_item("Item B", stock_level=1)))
+
+        with pytest.raises(InsufficientStockError) as raised:
+            run(store.orders.place_order("Acme", salesperson["id"], [
+                {"item_id": a["id"], "quantity": 3},
+                {"item_id": b["id"], "quantity": 1},
+                {"item_id": b["id"], "quantity": 1}
+            ]))
+
+        assert raised.value.details["errors"] == [
+            "Insufficient stock for item 'Item B'. Requested: 2, Available: 1"
+        ]
+        # The line that could be fulfilled was not applied either
+        assert run(store.inventory.get(a["id"]))["stock_level"] == 5
+        assert run(store.inventory.get(b["id"]))["stock_level"] == 1
+        assert run(store.orders.list_page(10)) == []
+        assert [m["kind"] for m in run(store.inventory.list_movements(a["id"], 10))] == ["receipt"]
+
+    def test_unknown_item_is_reported_and_nothing_is_written(self, store, run, salesperson):
+        a = run(store.inventory.create(_item("Item A", stock_level=5)))
+
+        with pytest.raises(InsufficientStockError) as raised:
+            run(store.orders.place_order("Acme", salesperson["id"], [
+                {"item_id": a["id"], "quantity": 1},
+                {"item_id": "missing-item", "quantity": 1}
+            ]))
+
+        assert raised.value.details["errors"] == ["Inventory item missing-item not found"]
+        assert run(store.inventory.get(a["id"]))["stock_level"] == 5
+        assert run(store.orders.list_page(10)) == []
+
+
+class TestCancelOrders:
+    def test_cancel_restocks_every_line(self, store, run, salesperson):
+        a = run(store.inventory.create(_item("Item A", stock_level=5)))
+        b = run(store.inventory.create(_item("Item B", stock_level=5)))
+        first = run(store.orders.place_order("Acme", salesperson["id"], [
+            {"item_id": a["id"], "quantity": 2},
+            {"item_id": a["id"], "quantity": 1}
+        ]))
+        second = run(store.orders.place_order("Acme", salesperson["id"], [
+            {"item_id": a["id"], "quantity": 1},
+            {"item_id": b["id"], "quantity": 4}
+        ]))
+
+        results = run(store.orders.cancel_orders([second["id"], first["id"], second["id"]]))
+
+        assert results == [
+            {"order_id": second["id"], "previous_status": "pending", "updated": True},
+            {"order_id": first["id"], "previous_status": "pending", "updated": True}
+        ]
+        assert run(store.inventory.get(a["id"]))["stock_level"] == 5
+        assert run(store.inventory.get(b["id"]))["stock_level"] == 5
+        assert run(store.orders.get(first["id"]))["status"] == "cancelled"
+        assert run(store.inventory.list_movements(a["id"], 1))[0]["kind"] == "cancellation"
+
+    def test_cancel_skips_orders_that_cannot_be_cancelled(self, store, run, salesperson):
+        a = run(store.inventory.create(_item("Item A", stock_level=5)))
+        order = run(store.orders.place_order("Acme", salesperson["id"], [{"item_id": a["id"], "quantity": 2}]))
+        run(store.orders.cancel_orders([order["id"]]))
+
+        results = run(store.orders.cancel_orders([order["id"], "missing-order"]))
+
+        assert results == [
+            {"order_id": order["id"], "previous_status": "cancelled", "updated": False},
+            {"order_id": "missing-order", "previous_status": None, "updated": False}
+        ]
+        # Stock is restored only once
+        assert run(store.inventory.get(a["id"]))["stock_level"] == 5
+
+
+class TestKeysetPages:
+    def test_inventory_pages_follow_name_then_id(self, store, run):
+        names = ["Walnut", "Ash", "Cedar", "Beech", "Elm"]
+        for name in names:
+            run(store.inventory.create(_item(name)))
+
+        pages, after = [], None
+        while True:
+            page = run(store.inventory.list_page(2, after))
+            if not page:
+                break
+            pages.append([row["name"] for row in page])
+            after = (page[-1]["name"], page[-1]["id"])
+
+        assert pages == [["Ash", "Beech"], ["Cedar", "Elm"], ["Walnut"]]
+
+    def test_page_ending_exactly_on_the_last_row_is_followed_by_an_empty_page(self, store, run):
+        for name in ["A", "B", "C", "D"]:
+            run(store.inventory.create(_item(name)))
+
+        second = run(store.inventory.list_page(2, ("B", run(store.inventory.list_page(2))[-1]["id"])))
+
+        assert [row["name"] for row in second] == ["C", "D"]
+        assert run(store.inventory.list_page(2, ("D", second[-1]["id"]))) == []
+
+    def test_cursor_between_rows_starts_at_the_next_name(self, store, run):
+        for name in ["Alder", "Birch", "Cherry"]:
+            run(store.inventory.create(_item(name)))
+
+        page = run(store.inventory.list_page(10, ("Az", "")))
+
+        assert [row["name"] for row in page] == ["Birch", "Cherry"]
+
+    def test_order_pages_are_newest_first_without_gaps_or_repeats(self, store, run, salesperson):
+        item = run(store.inventory.create(_item("Stock", stock_level=100)))
+        placed = [
+            run(store.orders.place_order(f"Customer {n}", salesperson["id"], [{"item_id": item["id"], "quantity": 1}]))
+            for n in range(5)
+        ]
+
+        seen, after = [], None
+        while True:
+            page = run(store.orders.list_page(2, after))
+            if not page:
+                break
+            seen.extend(row["id"] for row in page)
+            after = (page[-1]["created_at"], page[-1]["id"])
+
+        expected = sorted(placed, key=lambda order: (order["created_at"], order["id"]), reverse=True)
+        assert seen == [order["id"] for order in expected]
+
+
+class TestLedger:
+    def test_every_stock_change_appends_a_movement(self, store, run, salesperson):
+        item = run(store.inventory.create(_item("Ledger Item", stock_level=10)))
+        run(store.inventory.adjust_stock(item["id"], -3, "damaged"))
+        order = run(store.orders.place_order("Acme", salesperson["id"], [{"item_id": item["id"], "quantity": 2}]))
+        run(store.orders.cancel_orders([order["id"]]))
+
+        movements = run(store.inventory.list_movements(item["id"], 10))
+
+        assert [(m["kind"], m["quantity"], m["balance"]) for m in movements] == [
+            ("cancellation", 2, 7),
+            ("sale", -2, 5),
+            ("adjustment", -3, 7),
+            ("receipt", 10, 10)
+        ]
+        assert movements[2]["reason"] == "damaged"
+        assert run(store.inventory.get(item["id"]))["stock_level"] == movements[0]["balance"]
+
+    def test_movement_pages_follow_created_at_then_id(self, store, run):
+        item = run(store.inventory.create(_item("Paged", stock_level=10)))
+        for _ in range(4):
+            run(store.inventory.adjust_stock(item["id"], -1))
+
+        everything = run(store.inventory.list_movements(item["id"], 10))
+        first = run(store.inventory.list_movements(item["id"], 2))
+        second = run(store.inventory.list_movements(item["id"], 10, (first[-1]["created_at"], first[-1]["id"])))
+
+        assert first + second == everything
+        assert len(everything) == 5
+
+    def test_reconcile_reports_then_corrects_drift(self, store, run):
+        items = [run(store.inventory.create(_item(f"Item {n}", stock_level=10))) for n in range(3)]
+        drifted = items[1]
+        _set_stock_behind_ledger(store, drifted["id"], 4)
+
+        report = run(store.inventory.reconcile_balances(None, 10))
+
+        assert report["scanned"] == 3
+        assert report["last_item_id"] == max(item["id"] for item in items)
+        assert report["drift"] == [{
+            "item_id": drifted["id"],
+            "name": drifted["name"],
+            "stock_level": 4,
+            "ledger_balance": 10,
+            "corrected": False
+        }]
+        assert run(store.inventory.get(drifted["id"]))["stock_level"] == 4
+
+        applied = run(store.inventory.reconcile_balances(None, 10, apply=True))
+
+        assert [row["corrected"] for row in applied["drift"]] == [True]
+        assert run(store.inventory.get(drifted["id"]))["stock_level"] == 10
+        assert run(store.inventory.reconcile_balances(None, 10))["drift"] == []
+
+    def test_reconcile_walks_items_in_id_batches(self, store, run):
+        ids = sorted(run(store.inventory.create(_item(f"Batch {n}")))["id"] for n in range(5))
+
+        first = run(store.inventory.reconcile_balances(None, 2))
+        second = run(store.inventory.reconcile_balances(first["last_item_id"], 2))
+        third = run(store.inventory.reconcile_balances(second["last_item_id"], 2))
+        done = run(store.inventory.reconcile_balances(third["last_item_id"], 2))
+
+        assert [first["last_item_id"], second["last_item_id"], third["last_item_id"]] == [ids[1], ids[3], ids[4]]
+        assert [first["scanned"], second["scanned"], third["scanned"], done["scanned"]] == [2, 2, 1, 0]
+        assert done["last_item_id"] is None
+
+
+class TestSearch:
+    @staticmethod
+    def _names(rows):
+        return [row["name"] for row in rows]
+
+    def test_every_term_must_match_name_or_description(self, store, run):
+        run(store.inventory.create(_item("Birch Plywood 18mm")))
+        run(store.inventory.create(_item("Birch Veneer")))
+        run(store.inventory.create(_item("Oak Plywood")))
+        run(store.inventory.create(_item("Marine Board", description="Birch plywood core")))
+
+        rows = run(store.inventory.search("birch plywood", 10))
+
+        assert self._names(rows) == ["Birch Plywood 18mm", "Marine Board"]
+
+    def test_blank_query_matches_nothing(self, store, run):
+        run(store.inventory.create(_item("Birch Plywood")))
+
+        assert run(store.inventory.search("   ", 10)) == []
+
+    def test_ranking_tiers(self, store, run):
+        # Created out of rank order so insertion order cannot produce it
+        for name, description in [
+            ("Board", "birch ply offcut"),
+            ("Premium Birch Plywood", None),
+            ("Birch Plywood 18mm", None),
+            ("Ply Birch", None),
+            ("Birch Plywood", None),
+            ("Birch Ply", None),
+        ]:
+            run(store.inventory.create(_item(name, description=description)))
+
+        rows = run(store.inventory.search("birch ply", 10))
+
+        assert self._names(rows) == [
+            # Name equal to the query
+            "Birch Ply",
+            # Name starting with the query, shorter name first
+            "Birch Plywood",
+            "Birch Plywood 18mm",
+            # Every term in the name, shorter name first
+            "Ply Birch",
+            "Premium Birch Plywood",
+            # Terms found in the description only, even with a shorter name
+            "Board"
+        ]
+
+    def test_query_case_and_spacing_are_normalised(self, store, run):
+        for name in ["Birch Ply", "Birch Plywood", "Ply Birch"]:
+            run(store.inventory.create(_item(name)))
+
+        assert run(store.inventory.search("  BIRCH \t ply ", 10)) == run(store.inventory.search("birch ply", 10))
+
+    @pytest.mark.parametrize("query, expected", [
+        ("50%", ["50% Off Sheet"]),
+        ("a_b", ["Edge a_b"]),
+        ("h\\b", ["Path\\Board"]),
+    ])
+    def test_pattern_characters_match_literally(self, store, run, query, expected):
+        for name in ["50% Off Sheet", "500 Off Sheet", "Edge a_b", "Edge axb", "Path\\Board", "PathBoard"]:
+            run(store.inventory.create(_item(name)))
+
+        assert self._names(run(store.inventory.search(query, 10))) == expected
+
+    def test_limit_keeps_the_best_matches(self, store, run):
+        for name in ["Pine E", "Pine Dowel", "Pine", "Pine Board Long", "Knotty Pine"]:
+            run(store.inventory.create(_item(name)))
+
+        assert self._names(run(store.inventory.search("pine", 2))) == ["Pine", "Pine E"]
+        assert self._names(run(store.inventory.search("pine", 1))) == ["Pine"]
+        assert len(run(store.inventory.search("pine", 10))) == 5
+
+    def test_index_follows_renames_and_description_changes(self, store, run):
+        item = run(store.inventory.create(_item("Spruce Batten", description="rough sawn")))
+
+        run(store.inventory.update(item["id"], {"name": "Larch Batten", "description": "planed"}))
+
+        assert run(store.inventory.search("spruce", 10)) == []
+        assert run(store.inventory.search("rough", 10)) == []
+        assert [row["id"] for row in run(store.inventory.search("larch", 10))] == [item["id"]]
+        assert [row["id"] for row in run(store.inventory.search("planed", 10))] == [item["id"]]
+
+    def test_index_follows_imports(self, store, run):
+        existing = run(store.inventory.create(_item("Cedar Shingle", description="untreated")))
+
+        results = run(store.inventory.upsert_many([
+            _item("Teak Decking", description="oiled"),
+            _item("cedar shingle", description="pressure treated")
+        ]))
+
+        created = results[0]["item_id"]
+        assert [row["id"] for row in run(store.inventory.search("teak oiled", 10))] == [created]
+        assert [row["id"] for row in run(store.inventory.search("pressure", 10))] == [existing["id"]]
+        assert run(store.inventory.search("untreated", 10)) == []